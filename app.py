@@ -1267,24 +1267,35 @@ def display_individual_report(report, content_folder):
                                         </div>
                                         """, unsafe_allow_html=True)
 
-def run_analysis_with_progress(content_text):
+def run_analysis_with_progress(content_text, previous_report=None):
     """
     Run analysis on provided content text with real-time progress updates.
     Yields progress messages, then final result.
+
+    previous_report is the result of analyzing an earlier version of the same
+    draft; agents whose part of the draft is unchanged reuse its scores.
     """
     temp_path = None
+    previous_path = None
     try:
         # Save to temp file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
             f.write(content_text)
             temp_path = f.name
 
+        command = [sys.executable, 'src/main.py', 'analyze', temp_path, '--json', '--no-save', '--stream']
+        if previous_report and 'error' not in previous_report:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+                json.dump(previous_report, f)
+                previous_path = f.name
+            command += ['--previous', previous_path]
+
         # Run analysis with streaming output (unbuffered for real-time progress)
         env = os.environ.copy()
         env['PYTHONUNBUFFERED'] = '1'
 
         process = subprocess.Popen(
-            [sys.executable, 'src/main.py', 'analyze', temp_path, '--json', '--no-save'],
+            command,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
@@ -1322,14 +1333,20 @@ def run_analysis_with_progress(content_text):
                             yield {'type': 'progress', 'message': f'📝 {line_stripped.split("] ")[0].replace("[", "Agent ")}...'}
                 except:
                     yield {'type': 'progress', 'message': f'📝 {line_stripped.split("] ")[0].replace("[", "Agent ")}...'}
+            elif 'Provisional Gate' in line_stripped:
+                # Streamed scores decided a gate before all agents finished
+                yield {'type': 'progress', 'message': line_stripped.replace('⏱ ', '⏱️ ')}
+            elif '[INCREMENTAL]' in line_stripped:
+                yield {'type': 'progress', 'message': '♻️ ' + line_stripped.split('] ', 1)[1].split(' from ')[0]}
             elif '[SCORER]' in line_stripped:
                 yield {'type': 'progress', 'message': '✨ Aggregating scores and generating report...'}
 
         process.wait()
 
-        # Clean up temp file
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
+        # Clean up temp files
+        for path in (temp_path, previous_path):
+            if path and os.path.exists(path):
+                os.unlink(path)
 
         # Parse final result
         if process.returncode == 0:
@@ -1350,8 +1367,9 @@ def run_analysis_with_progress(content_text):
             yield {'type': 'result', 'data': {'error': full_output}}
 
     except Exception as e:
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
+        for path in (temp_path, previous_path):
+            if path and os.path.exists(path):
+                os.unlink(path)
         yield {'type': 'result', 'data': {'error': str(e)}}
 
 
@@ -1438,6 +1456,8 @@ def main():
         st.session_state.current_page = "dashboard"  # Default to dashboard
     if 'selected_file' not in st.session_state:
         st.session_state.selected_file = None
+    if 'live_report' not in st.session_state:
+        st.session_state.live_report = None  # Last live analysis, reused on re-analysis
 
     # Load all reports for sidebar
     all_reports_raw = load_reports("data/reports")
@@ -1650,7 +1670,8 @@ def main():
                 progress_placeholder = st.empty()
 
                 # Stream progress updates in real-time
-                for update in run_analysis_with_progress(content_input):
+                # Re-analyzing an edited draft only re-runs agents whose part changed
+                for update in run_analysis_with_progress(content_input, st.session_state.live_report):
                     if update['type'] == 'progress':
                         progress_placeholder.write(update['message'])
                     elif update['type'] == 'result':
@@ -1660,6 +1681,9 @@ def main():
                         else:
                             status.update(label="❌ Analysis failed", state="error", expanded=True)
 
+            if 'error' not in result:
+                st.session_state.live_report = result
+
             if 'error' in result:
                 st.error(f"⚠️ Oops! Analysis hit a snag: {result['error']}")
                 if 'raw' in result:
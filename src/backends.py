@@ -0,0 +1,388 @@
+"""
+LLM Backends: Transport layer under LLMClient.
+AnthropicBackend calls the Claude API; FakeBackend serves deterministic local responses for benchmarks.
+"""
+
+import abc
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import anthropic
+import httpx
+from anthropic.types import Message, TextBlock, Usage
+
+from config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_WRITE_TIMEOUT,
+    HTTP_POOL_TIMEOUT,
+    LLM_BACKEND,
+    FAKE_BACKEND_SEED,
+    FAKE_LATENCY_MEDIAN_S,
+    FAKE_LATENCY_SIGMA,
+    FAKE_OUTPUT_TOKENS_PER_SECOND,
+    FAKE_RATE_LIMIT_RATE,
+    FAKE_OVERLOADED_RATE,
+)
+
+# Backend names (LLM_BACKEND in config.py / SCORING_LLM_BACKEND env var)
+BACKEND_ANTHROPIC = "anthropic"
+BACKEND_FAKE = "fake"
+
+BACKENDS = (BACKEND_ANTHROPIC, BACKEND_FAKE)
+
+# (headers, message) pair returned by every backend call
+BackendResponse = Tuple[Mapping[str, str], Message]
+
+
+class Backend(abc.ABC):
+    """
+    Interface LLMClient sends prepared requests through.
+
+    Requests are messages.create keyword arguments. Failures are raised as
+    anthropic.APIError subclasses so retry classification is identical for
+    every backend. A backend missing any method fails when it is constructed.
+    """
+
+    name = ""
+    # Isolated backends get in-memory token calibration and output history,
+    # and their results are cached under a separate model key
+    isolated = False
+
+    @abc.abstractmethod
+    def create(self, request: Dict) -> BackendResponse:
+        """Send a request synchronously."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create_async(self, request: Dict) -> BackendResponse:
+        """Send a request on the event loop."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def stream_async(
+        self, request: Dict, on_text: Callable[[str], None]
+    ) -> BackendResponse:
+        """Send a request, calling on_text with each chunk of generated text."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def count_tokens_async(self, request: Dict) -> int:
+        """Input tokens the request will be billed for."""
+        raise NotImplementedError
+
+
+# ============================================================================
+# ANTHROPIC API
+# ============================================================================
+
+
+def _http_limits():
+    """
+    Connection pool limits for the shared HTTP clients.
+
+    Built with the same Limits class as the SDK's defaults, since newer SDK
+    releases bundle their own httpx and reject objects from the public one.
+    """
+    limits_class = type(anthropic.DEFAULT_CONNECTION_LIMITS)
+    return limits_class(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _http_timeout() -> anthropic.Timeout:
+    """Per-phase timeouts for the shared HTTP clients."""
+    return anthropic.Timeout(
+        connect=HTTP_CONNECT_TIMEOUT,
+        read=HTTP_READ_TIMEOUT,
+        write=HTTP_WRITE_TIMEOUT,
+        pool=HTTP_POOL_TIMEOUT,
+    )
+
+
+class AnthropicBackend(Backend):
+    """The Claude API, through pooled sync and async SDK clients."""
+
+    name = BACKEND_ANTHROPIC
+
+    def __init__(self, api_key: Optional[str] = None):
+        api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "ANTHROPIC_API_KEY not found in environment variables. "
+                "Please create a .env file with your API key."
+            )
+        # SDK retries are disabled: RetryPolicy schedules retries through the limiter
+        self.client = anthropic.Anthropic(
+            api_key=api_key,
+            max_retries=0,
+            timeout=_http_timeout(),
+            http_client=anthropic.DefaultHttpxClient(limits=_http_limits()),
+        )
+        self.async_client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            max_retries=0,
+            timeout=_http_timeout(),
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=_http_limits()),
+        )
+
+    def create(self, request: Dict) -> BackendResponse:
+        raw_response = self.client.messages.with_raw_response.create(**request)
+        return raw_response.headers, raw_response.parse()
+
+    async def create_async(self, request: Dict) -> BackendResponse:
+        raw_response = await self.async_client.messages.with_raw_response.create(**request)
+        return raw_response.headers, raw_response.parse()
+
+    async def stream_async(
+        self, request: Dict, on_text: Callable[[str], None]
+    ) -> BackendResponse:
+        async with self.async_client.messages.stream(**request) as stream:
+            async for text in stream.text_stream:
+                on_text(text)
+            response = await stream.get_final_message()
+            return stream.response.headers, response
+
+    async def count_tokens_async(self, request: Dict) -> int:
+        counted = await self.async_client.messages.count_tokens(
+            model=request["model"],
+            system=request["system"],
+            messages=request["messages"],
+        )
+        return counted.input_tokens
+
+
+# ============================================================================
+# FAKE BACKEND (offline benchmarks and load tests)
+# ============================================================================
+
+# Characters per token the fake bills at (slightly off the estimator's 4.0,
+# so the token counter's calibration has something to learn)
+FAKE_CHARS_PER_TOKEN = 3.6
+
+FAKE_FEEDBACK = (
+    "The draft is mostly on-brand; tighten the weaker passages called out below.",
+    "Clear and confident overall, with a few places where the point arrives late.",
+    "Solid structure, but several claims would land harder with specifics.",
+    "Reads well; minor inconsistencies in tone across sections.",
+)
+
+
+def _request_text(request: Dict) -> str:
+    """Concatenate the system prompt and messages of a request."""
+    system = request.get("system", "")
+    if isinstance(system, list):
+        system = "\n".join(block.get("text", "") for block in system)
+    parts = [system]
+    for message in request.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = "\n".join(block.get("text", "") for block in content)
+        parts.append(content)
+    return "\n".join(parts)
+
+
+def _status_error(status: int, headers: Optional[Dict[str, str]] = None) -> anthropic.APIStatusError:
+    """Build the SDK error the API would raise for an HTTP status."""
+    response = httpx.Response(
+        status,
+        headers=headers or {},
+        request=httpx.Request("POST", "http://fake-backend.local/v1/messages"),
+    )
+    if status == 429:
+        return anthropic.RateLimitError("Fake backend: rate limited", response=response, body=None)
+    error_class = getattr(anthropic, "OverloadedError", anthropic.InternalServerError)
+    return error_class("Fake backend: overloaded", response=response, body=None)
+
+
+class FakeBackend(Backend):
+    """
+    Deterministic in-process stand-in for the Claude API.
+
+    Answers are derived from a hash of the request, so the same draft and
+    prompt always get the same {thinking, score, feedback, flags}; grouped
+    requests get one object per <evaluator id="...">. Latency is drawn from
+    a log-normal distribution around latency_median_s plus output time at
+    output_tokens_per_second, and 429 / 529 errors are injected at the
+    configured rates. Timing and errors come from one seeded RNG, so a run
+    is reproducible for a given seed and call order.
+    """
+
+    name = BACKEND_FAKE
+    isolated = True
+
+    def __init__(
+        self,
+        seed: int = FAKE_BACKEND_SEED,
+        latency_median_s: float = FAKE_LATENCY_MEDIAN_S,
+        latency_sigma: float = FAKE_LATENCY_SIGMA,
+        output_tokens_per_second: float = FAKE_OUTPUT_TOKENS_PER_SECOND,
+        rate_limit_rate: float = FAKE_RATE_LIMIT_RATE,
+        overloaded_rate: float = FAKE_OVERLOADED_RATE,
+    ):
+        self.latency_median_s = latency_median_s
+        self.latency_sigma = latency_sigma
+        self.output_tokens_per_second = output_tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.overloaded_rate = overloaded_rate
+        self.calls = 0
+        self.injected_errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> Tuple[float, Optional[int]]:
+        """Draw this call's base latency and injected error status (if any)."""
+        with self._lock:
+            self.calls += 1
+            base = self.latency_median_s * math.exp(self._rng.gauss(0, self.latency_sigma))
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            status = 429
+        elif roll < self.rate_limit_rate + self.overloaded_rate:
+            status = 529
+        else:
+            status = None
+        if status:
+            with self._lock:
+                self.injected_errors += 1
+        return base, status
+
+    def _raise_for(self, status: Optional[int]) -> None:
+        if status == 429:
+            raise _status_error(429, {"retry-after": "1"})
+        if status == 529:
+            raise _status_error(529)
+
+    def _answer(self, request: Dict) -> Dict[str, Any]:
+        """Deterministic JSON answer (one evaluation, or one per evaluator)."""
+        text = _request_text(request)
+        evaluator_ids = re.findall(r'<evaluator id="([^"]+)">', text)
+        if evaluator_ids:
+            return {agent_id: self._evaluation(text, agent_id) for agent_id in evaluator_ids}
+        return self._evaluation(text, "")
+
+    def _evaluation(self, text: str, salt: str) -> Dict[str, Any]:
+        digest = hashlib.sha256(f"{salt}\n{text}".encode("utf-8")).digest()
+        score = 2 + digest[0] % 3  # 2-4: mostly passing drafts
+        flags = []
+        if score == 2:
+            flags.append(
+                {
+                    "quote": "example passage",
+                    "issue": "Generic claim without supporting detail",
+                    "suggestion": "Add a concrete example or number",
+                }
+            )
+        return {
+            "thinking": "Fake backend evaluation.",
+            "score": score,
+            "feedback": FAKE_FEEDBACK[digest[1] % len(FAKE_FEEDBACK)],
+            "flags": flags,
+        }
+
+    def _message(self, request: Dict) -> Message:
+        """Build the Message the API would return for a request."""
+        body = json.dumps(self._answer(request))
+        messages = request.get("messages", [])
+        prefill = ""
+        if messages and messages[-1]["role"] == "assistant":
+            prefill = messages[-1]["content"]
+        if prefill and body.startswith(prefill):
+            body = body[len(prefill):]
+
+        stop_reason = "end_turn"
+        output_tokens = max(1, int(len(body) / FAKE_CHARS_PER_TOKEN))
+        if output_tokens > request["max_tokens"]:
+            body = body[: int(request["max_tokens"] * FAKE_CHARS_PER_TOKEN)]
+            output_tokens = request["max_tokens"]
+            stop_reason = "max_tokens"
+
+        return Message(
+            id=f"msg_fake_{self.calls}",
+            type="message",
+            role="assistant",
+            # Labelled like the result cache's model key, so fake results are
+            # never priced, reused or resumed as the real model's
+            model=f"{self.name}:{request['model']}",
+            content=[TextBlock(type="text", text=body)],
+            stop_reason=stop_reason,
+            stop_sequence=None,
+            usage=Usage(
+                input_tokens=self._input_tokens(request),
+                output_tokens=output_tokens,
+            ),
+        )
+
+    def _input_tokens(self, request: Dict) -> int:
+        return max(1, int(len(_request_text(request)) / FAKE_CHARS_PER_TOKEN))
+
+    def _latency(self, base: float, message: Message) -> float:
+        return base + message.usage.output_tokens / self.output_tokens_per_second
+
+    def create(self, request: Dict) -> BackendResponse:
+        base, status = self._draw()
+        if status:
+            time.sleep(base)
+            self._raise_for(status)
+        message = self._message(request)
+        time.sleep(self._latency(base, message))
+        return {}, message
+
+    async def create_async(self, request: Dict) -> BackendResponse:
+        base, status = self._draw()
+        if status:
+            await asyncio.sleep(base)
+            self._raise_for(status)
+        message = self._message(request)
+        await asyncio.sleep(self._latency(base, message))
+        return {}, message
+
+    async def stream_async(
+        self, request: Dict, on_text: Callable[[str], None]
+    ) -> BackendResponse:
+        base, status = self._draw()
+        await asyncio.sleep(base)
+        self._raise_for(status)
+        message = self._message(request)
+        text = message.content[0].text
+        chunks: List[str] = [text[i : i + 16] for i in range(0, len(text), 16)] or [""]
+        per_chunk = (self._latency(base, message) - base) / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(per_chunk)
+            on_text(chunk)
+        return {}, message
+
+    async def count_tokens_async(self, request: Dict) -> int:
+        return self._input_tokens(request)
+
+
+def create_backend(name: Optional[str] = None) -> Backend:
+    """
+    Instantiate a backend by name.
+
+    Args:
+        name: One of BACKENDS (defaults to $SCORING_LLM_BACKEND, then
+            LLM_BACKEND from config)
+
+    Returns:
+        A ready-to-use backend
+    """
+    name = name or os.getenv("SCORING_LLM_BACKEND") or LLM_BACKEND
+    if name == BACKEND_FAKE:
+        return FakeBackend()
+    if name == BACKEND_ANTHROPIC:
+        return AnthropicBackend()
+    raise ValueError(f"Unknown LLM backend: {name} (expected one of {', '.join(BACKENDS)})")
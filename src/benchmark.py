@@ -0,0 +1,172 @@
+"""
+Benchmark: Layer 2 throughput under different concurrency and limiter settings.
+Runs documents through the full agent pipeline (normally on the fake backend) and reports timings.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backends import BACKEND_FAKE, FakeBackend
+from config import (
+    FAKE_BACKEND_SEED,
+    LAYER_2_MODE_FULL,
+    MAX_CONCURRENT_AGENTS,
+    RPM_LIMIT,
+    ITPM_LIMIT,
+    OTPM_LIMIT,
+)
+from key_pool import ApiKey, KeyPool, create_key_pool
+from llm_client import run_all_agents_concurrent, set_llm_backend
+from output_budget import percentile
+from rate_limiter import RateLimiter
+from result_cache import CACHE_MODE_OFF
+from scorer import call_records
+
+
+def load_documents(path: Path) -> List[str]:
+    """Read one file, or every .md / .txt file in a directory."""
+    if path.is_dir():
+        files = sorted(list(path.glob("*.md")) + list(path.glob("*.txt")))
+    else:
+        files = [path]
+    return [file.read_text(encoding="utf-8") for file in files]
+
+
+def run_benchmark(
+    documents: List[str],
+    runs: int,
+    backend_name: str = BACKEND_FAKE,
+    max_concurrency: int = MAX_CONCURRENT_AGENTS,
+    mode: str = LAYER_2_MODE_FULL,
+    rpm: float = RPM_LIMIT,
+    itpm: float = ITPM_LIMIT,
+    otpm: float = OTPM_LIMIT,
+    hedge: bool = False,
+    fake_options: Optional[Dict] = None,
+    keys: int = 1,
+) -> Dict:
+    """
+    Analyze `runs` documents back to back and measure Layer 2 throughput.
+
+    The result cache is bypassed so every run makes real (or fake) calls,
+    and a fresh limiter with the given budgets is used per API key so runs
+    with different settings are comparable.
+
+    Args:
+        documents: Draft contents, cycled through for the runs
+        runs: Number of documents to analyze
+        backend_name: "fake" (default) or "anthropic"
+        max_concurrency: Maximum in-flight agent calls per document
+        mode: "full" or "grouped"
+        rpm: Requests-per-minute budget for the limiter
+        itpm: Input-tokens-per-minute budget for the limiter
+        otpm: Output-tokens-per-minute budget for the limiter
+        hedge: Hedge calls that outlive their agent's p95 latency
+        fake_options: FakeBackend keyword arguments (latency, error rates, seed)
+        keys: Fake API keys to spread calls over (each with its own budgets;
+            the anthropic backend uses the configured key pool instead)
+
+    Returns:
+        Summary dictionary (also printed)
+    """
+    if backend_name == BACKEND_FAKE:
+        fake_options = fake_options or {}
+        seed = fake_options.get("seed", FAKE_BACKEND_SEED)
+        backends = [
+            (f"fake-{i + 1}", FakeBackend(**dict(fake_options, seed=seed + i)))
+            for i in range(max(1, keys))
+        ]
+    else:
+        backends = [(key.label, key.backend) for key in create_key_pool()]
+    backend = backends[0][1]
+
+    client = set_llm_backend(backend)
+    client.use_keys(
+        KeyPool(
+            [
+                ApiKey(label, key_backend, RateLimiter(rpm=rpm, itpm=itpm, otpm=otpm))
+                for label, key_backend in backends
+            ]
+        )
+    )
+
+    document_seconds = []
+    results: List[Dict] = []
+    started = time.monotonic()
+    for run in range(runs):
+        content = documents[run % len(documents)]
+        run_started = time.monotonic()
+        run_results = run_all_agents_concurrent(
+            content,
+            max_concurrency=max_concurrency,
+            cache_mode=CACHE_MODE_OFF,
+            mode=mode,
+            hedge=hedge,
+        )
+        document_seconds.append(time.monotonic() - run_started)
+        results.extend(run_results.values())
+    elapsed = time.monotonic() - started
+
+    calls = call_records(results)
+    latencies = [c["latency_s"] for c in calls if c.get("latency_s") is not None]
+    summary = {
+        "backend": backend.name,
+        "mode": mode,
+        "documents": runs,
+        "max_concurrency": max_concurrency,
+        "keys": len(backends),
+        "limits": {"rpm": rpm, "itpm": itpm, "otpm": otpm},
+        "elapsed_s": round(elapsed, 2),
+        "documents_per_minute": round(60 * runs / elapsed, 2) if elapsed else None,
+        "api_calls": len(latencies),
+        "calls_per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "document_p50_s": round(percentile(document_seconds, 50), 2),
+        "document_p95_s": round(percentile(document_seconds, 95), 2),
+        "call_p50_s": round(percentile(latencies, 50), 2) if latencies else None,
+        "call_p95_s": round(percentile(latencies, 95), 2) if latencies else None,
+        "queue_wait_s": round(sum(c.get("queue_wait_s") or 0 for c in calls), 2),
+        "retries": sum(c.get("retries", 0) for c in calls),
+        "hedged": sum(1 for r in results if r.get("hedged")),
+        "hedges_won": sum(1 for r in results if r.get("hedge_won")),
+        "failed_agents": sum(1 for r in results if not r.get("success")),
+        "input_tokens": sum((c.get("usage") or {}).get("input_tokens", 0) for c in calls),
+        "output_tokens": sum((c.get("usage") or {}).get("output_tokens", 0) for c in calls),
+    }
+    if isinstance(backend, FakeBackend):
+        summary["injected_errors"] = sum(
+            key_backend.injected_errors for _, key_backend in backends
+        )
+    if len(backends) > 1:
+        summary["key_usage"] = client.keys.summary()
+
+    _print_summary(summary)
+    return summary
+
+
+def _print_summary(summary: Dict) -> None:
+    """Print a benchmark summary table."""
+    limits = summary["limits"]
+    print("\n" + "=" * 70)
+    print("BENCHMARK RESULTS")
+    print("=" * 70)
+    print(f"Backend: {summary['backend']}  Mode: {summary['mode']}  "
+          f"Concurrency: {summary['max_concurrency']}")
+    print(f"Limits: {limits['rpm']} RPM / {limits['itpm']} ITPM / {limits['otpm']} OTPM"
+          + (f" per key, {summary['keys']} keys" if summary["keys"] > 1 else ""))
+    print(f"Documents: {summary['documents']} in {summary['elapsed_s']}s "
+          f"({summary['documents_per_minute']} docs/min)")
+    print(f"API calls: {summary['api_calls']} ({summary['calls_per_second']} calls/s)")
+    print(f"Document time: p50 {summary['document_p50_s']}s, p95 {summary['document_p95_s']}s")
+    print(f"Call latency: p50 {summary['call_p50_s']}s, p95 {summary['call_p95_s']}s")
+    print(f"Limiter wait (summed): {summary['queue_wait_s']}s")
+    retries_line = f"Retries: {summary['retries']}"
+    if "injected_errors" in summary:
+        retries_line += f" ({summary['injected_errors']} injected errors)"
+    print(retries_line)
+    print(f"Hedged calls: {summary['hedged']} ({summary['hedges_won']} answered first by the hedge)")
+    print(f"Failed agents: {summary['failed_agents']}")
+    print(f"Tokens: {summary['input_tokens']} input / {summary['output_tokens']} output")
+    for label, usage in summary.get("key_usage", {}).items():
+        print(f"  {label}: {usage['api_calls']} calls, {usage['input_tokens']} input tokens")
+    print("=" * 70 + "\n")
@@ -0,0 +1,207 @@
+"""
+Circuit Breaker: Stops calling the Claude API while it is failing.
+Opens on a sustained server-side error rate, then probes with a single request before resuming.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from config import (
+    CIRCUIT_WINDOW,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_ERROR_RATE,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_MAX_OPEN_SECONDS,
+    CIRCUIT_PROBE_TIMEOUT,
+)
+from retry_policy import ERROR_CONNECTION, ERROR_OVERLOADED, ERROR_SERVER, ERROR_TIMEOUT
+
+# Breaker states
+CIRCUIT_CLOSED = "closed"  # Calls flow normally
+CIRCUIT_OPEN = "open"  # Calls fail fast until the pause is over
+CIRCUIT_HALF_OPEN = "half_open"  # One probe call decides whether to close or re-open
+
+# Error classes that count against the circuit. 429s are our own pacing
+# problem (the rate limiter handles them) and 4xx are bad requests, not outages.
+CIRCUIT_ERRORS = {ERROR_OVERLOADED, ERROR_SERVER, ERROR_TIMEOUT, ERROR_CONNECTION}
+
+# How often callers waiting on a half-open probe check its outcome (seconds)
+PROBE_POLL_INTERVAL = 0.25
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a document could not be scored because the circuit was open."""
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(
+            f"Claude API circuit breaker is open (sustained API failures); "
+            f"next probe in {retry_in:.0f}s. No report was written."
+        )
+
+
+class CircuitBreaker:
+    """
+    Process-wide circuit breaker for API calls.
+
+    Closed: every call is admitted and its outcome recorded. Once at least
+    CIRCUIT_MIN_CALLS of the last CIRCUIT_WINDOW outcomes are known and
+    CIRCUIT_ERROR_RATE of them are CIRCUIT_ERRORS, the circuit opens.
+
+    Open: calls are refused (the caller fails fast) for the open period,
+    which starts at CIRCUIT_OPEN_SECONDS and doubles after each failed
+    probe up to CIRCUIT_MAX_OPEN_SECONDS.
+
+    Half-open: the first caller is admitted as the probe; the others wait
+    for its outcome. Success closes the circuit, a counted error re-opens it.
+    """
+
+    def __init__(self):
+        self.state = CIRCUIT_CLOSED
+        self.open_seconds = CIRCUIT_OPEN_SECONDS
+        self.opened_until = 0.0
+        self.times_opened = 0
+        self._outcomes: deque = deque(maxlen=CIRCUIT_WINDOW)
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self, now: float) -> None:
+        """Move open -> half-open when the pause is over (caller holds the lock)."""
+        if self.state == CIRCUIT_OPEN and now >= self.opened_until:
+            self.state = CIRCUIT_HALF_OPEN
+            self._probe_started = None
+            print("🔌 Circuit breaker half-open: probing the API with a single call")
+        if (
+            self.state == CIRCUIT_HALF_OPEN
+            and self._probe_started is not None
+            and now - self._probe_started > CIRCUIT_PROBE_TIMEOUT
+        ):
+            # The probe never reported back (e.g. it was cancelled)
+            self._probe_started = None
+
+    def _try_admit(self) -> Optional[bool]:
+        """
+        Returns:
+            True if the call may proceed, False if it must fail fast,
+            None if it should wait for the probe in flight
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._refresh(now)
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN:
+                return False
+            if self._probe_started is None:
+                self._probe_started = now
+                return True
+            return None
+
+    async def admit(self) -> bool:
+        """
+        Wait (without blocking the event loop) for admission.
+
+        Returns:
+            True if the call may be sent, False if the circuit is open
+        """
+        while True:
+            admitted = self._try_admit()
+            if admitted is not None:
+                return admitted
+            await asyncio.sleep(PROBE_POLL_INTERVAL)
+
+    def admit_blocking(self) -> bool:
+        """Synchronous counterpart of admit() for threaded callers."""
+        while True:
+            admitted = self._try_admit()
+            if admitted is not None:
+                return admitted
+            time.sleep(PROBE_POLL_INTERVAL)
+
+    def record_success(self) -> None:
+        """Record a successful call (closes the circuit if it was the probe)."""
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                print("🔌 Circuit breaker closed: probe succeeded, resuming API calls")
+                self.state = CIRCUIT_CLOSED
+                self.open_seconds = CIRCUIT_OPEN_SECONDS
+                self._outcomes.clear()
+                self._probe_started = None
+            self._outcomes.append(False)
+
+    def record_failure(self, error_class: Optional[str]) -> None:
+        """
+        Record a failed call.
+
+        Args:
+            error_class: retry_policy ERROR_* class (None for a non-API failure)
+        """
+        counted = error_class in CIRCUIT_ERRORS
+        now = time.monotonic()
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                if counted:
+                    self.open_seconds = min(CIRCUIT_MAX_OPEN_SECONDS, self.open_seconds * 2)
+                    self._open(now, f"probe failed ({error_class})")
+                else:
+                    # Inconclusive: let the next caller probe
+                    self._probe_started = None
+                return
+
+            if self.state != CIRCUIT_CLOSED:
+                return
+            self._outcomes.append(counted)
+            failures = sum(self._outcomes)
+            if (
+                len(self._outcomes) >= CIRCUIT_MIN_CALLS
+                and failures >= CIRCUIT_ERROR_RATE * len(self._outcomes)
+            ):
+                self._open(
+                    now, f"{failures} of the last {len(self._outcomes)} calls failed"
+                )
+
+    def _open(self, now: float, reason: str) -> None:
+        """Open the circuit for open_seconds (caller holds the lock)."""
+        self.state = CIRCUIT_OPEN
+        self.opened_until = now + self.open_seconds
+        self.times_opened += 1
+        self._probe_started = None
+        self._outcomes.clear()
+        print(
+            f"🔌 Circuit breaker OPEN: {reason}. "
+            f"Pausing API calls for {self.open_seconds:.0f}s"
+        )
+
+    def is_open(self) -> bool:
+        """True while calls are being refused."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self.state == CIRCUIT_OPEN
+
+    def seconds_until_probe(self) -> float:
+        """Seconds until the open circuit admits a probe (0 if not open)."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self.state != CIRCUIT_OPEN:
+                return 0.0
+            return max(0.0, self.opened_until - time.monotonic())
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_breaker: Optional[CircuitBreaker] = None
+_shared_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Return the process-wide circuit breaker, creating it on first use."""
+    global _shared_breaker
+    with _shared_breaker_lock:
+        if _shared_breaker is None:
+            _shared_breaker = CircuitBreaker()
+        return _shared_breaker
@@ -23,6 +23,10 @@ POISON_SET_DIR = CALIBRATION_DIR / "poison_set"
 
 # Prompts directory
 PROMPTS_DIR = ROOT_DIR / "prompts"
+PROMPT_RELOAD_CHECK_INTERVAL = 2.0  # Seconds between mtime checks for edited prompt files
+
+# Persistent caches (not committed)
+CACHE_DIR = DATA_DIR / "cache"
 
 # Ensure directories exist
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,6 +38,21 @@ REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 # Model configuration
 MODEL_NAME = "claude-sonnet-4-5-20250929"  # Claude Sonnet 4.5
 
+# LLM backend (see backends.py)
+# "anthropic" calls the Claude API; "fake" serves deterministic local responses
+# (no API key or network) for benchmarks and load tests. The
+# SCORING_LLM_BACKEND environment variable (or .env entry) overrides it, e.g.
+#   SCORING_LLM_BACKEND=fake python src/main.py analyze draft.md
+LLM_BACKEND = "anthropic"
+
+# Fake backend behaviour (all overridable from the bench command)
+FAKE_BACKEND_SEED = 0                 # Seed for latency and error injection
+FAKE_LATENCY_MEDIAN_S = 1.5           # Median time to first token (log-normal)
+FAKE_LATENCY_SIGMA = 0.4              # Log-normal spread of that latency
+FAKE_OUTPUT_TOKENS_PER_SECOND = 80.0  # Generation speed after the first token
+FAKE_RATE_LIMIT_RATE = 0.0            # Fraction of calls answered with 429
+FAKE_OVERLOADED_RATE = 0.0            # Fraction of calls answered with 529
+
 # Temperature setting (range: 0.0 to 1.0)
 # 0.0 = Maximum determinism (recommended for evaluation tasks)
 # 1.0 = Maximum creativity
@@ -43,12 +62,124 @@ TEMPERATURE = 0.0  # Configurable for testing
 # Generous limit to allow detailed feedback, thinking, and violation lists
 MAX_TOKENS = 2000  # Configurable
 
-# API retry configuration
+# Adaptive per-agent output budgets (see output_budget.py)
+# MAX_TOKENS is the ceiling. Once an agent has enough history, its max_tokens
+# (and its OTPM reservation) is a high percentile of its recorded output
+# tokens plus a margin. Responses that stop on max_tokens are re-issued with
+# MAX_TOKENS, so a tight budget never produces truncated JSON.
+OUTPUT_HISTORY_PATH = CACHE_DIR / "output_history.sqlite3"
+OUTPUT_HISTORY_SIZE = 200         # Recent responses kept per agent and model
+OUTPUT_BUDGET_PERCENTILE = 95     # Percentile of historical output tokens
+OUTPUT_BUDGET_MARGIN = 0.25       # Safety margin on top of the percentile (25%)
+OUTPUT_BUDGET_MIN_SAMPLES = 10    # Use MAX_TOKENS until this many responses are recorded
+OUTPUT_BUDGET_FLOOR = 256         # Never budget fewer output tokens than this
+
+# Pricing per model, in USD per million tokens (used for per-agent cost accounting)
+# cache_write / cache_read are the prompt-caching rates (5-minute cache writes).
+MODEL_PRICING = {
+    "claude-sonnet-4-5-20250929": {
+        "input": 3.00,
+        "output": 15.00,
+        "cache_write": 3.75,
+        "cache_read": 0.30,
+    },
+    "claude-haiku-4-5-20251001": {
+        "input": 1.00,
+        "output": 5.00,
+        "cache_write": 1.25,
+        "cache_read": 0.10,
+    },
+}
+
+# Prompt-cache-friendly request layout (opt-in)
+# When enabled, the draft is sent as a shared system block marked with
+# cache_control ahead of each agent's instructions, so all agents reuse one
+# cached prefix instead of paying for the full draft 16 times.
+PROMPT_CACHE_LAYOUT = False
+
+# Layer 2 execution modes
+LAYER_2_MODE_FULL = "full"        # One call per sub-parameter (gold standard)
+LAYER_2_MODE_GROUPED = "grouped"  # One call per parameter (high-volume pre-screening)
+LAYER_2_MODE_TRIAGE = "triage"    # Gate-critical agents first; stop once the verdict is decided
+LAYER_2_MODE_CASCADE = "cascade"  # Cheap model first; escalate to MODEL_NAME near the gates
+LAYER_2_MODES = (
+    LAYER_2_MODE_FULL,
+    LAYER_2_MODE_GROUPED,
+    LAYER_2_MODE_TRIAGE,
+    LAYER_2_MODE_CASCADE,
+)
+
+# Cascade mode: every agent is scored by CASCADE_MODEL first. Agents are
+# re-run on MODEL_NAME only when the cheap scores put the draft within
+# CASCADE_MARGIN of a gate threshold (all agents near Gate 1, the P1 agents
+# near Gate 2), or when they failed on the cheap model. The binary Gate 3
+# agents are always re-run.
+CASCADE_MODEL = "claude-haiku-4-5-20251001"  # Claude Haiku 4.5
+CASCADE_MARGIN = 0.25
+CASCADE_ALWAYS_ESCALATE = ("2B_Contextual", "2C_Persona")
+
+# Triage mode: agents in flight at once. 6 = the four P1 tone agents plus
+# 2B/2C, so the first wave is exactly the agents Gates 2 and 3 depend on.
+TRIAGE_MAX_CONCURRENCY = 6
+
+# Result cache (see result_cache.py)
+# Successful agent results are cached on disk, keyed by sha256 of the content
+# and prompt plus MODEL_NAME, TEMPERATURE and MAX_TOKENS, so re-runs after
+# weight or threshold changes cost no API calls.
+RESULT_CACHE_PATH = CACHE_DIR / "agent_results.sqlite3"
+RESULT_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Evict least recently used entries above 50MB
+RESULT_CACHE_MAX_AGE_DAYS = 30             # Drop entries older than 30 days
+
+# Checkpoint journal (see journal.py)
+# During a full-mode analysis each successful agent result is appended to
+# JOURNAL_DIR/{content hash}.jsonl as soon as it arrives. An analysis that is
+# interrupted (crash, Ctrl-C, Streamlit rerun) resumes from it when the same
+# draft is analyzed again; the journal is deleted once the report exists.
+JOURNAL_DIR = REPORTS_DIR / ".journal"
+JOURNAL_MAX_AGE_DAYS = 7  # Journals of drafts never re-analyzed are removed after a week
+
+# API retry configuration (see retry_policy.py)
 MAX_RETRIES = 3  # Number of retry attempts for failed API calls
-RETRY_DELAY = 2  # Initial delay in seconds (exponential backoff)
+RETRY_DELAY = 2  # Base delay in seconds (decorrelated jitter backoff)
+RETRY_MAX_DELAY = 60.0  # Cap on a single backoff (retry-after from the server can exceed it)
+
+# Hedged requests (opt-in with --hedge, see latency_history.py)
+# A single-agent call still unanswered after the agent's observed p95 latency
+# gets a duplicate request; whichever answers first is kept and the other is
+# cancelled. Hedges are admitted by the rate limiter like any other call.
+HEDGE_REQUESTS = False                                     # Default for --hedge
+LATENCY_HISTORY_PATH = CACHE_DIR / "latency_history.sqlite3"
+LATENCY_HISTORY_SIZE = 200  # Latencies kept per agent and model
+HEDGE_PERCENTILE = 95       # Latency percentile after which a call is hedged
+HEDGE_MIN_SAMPLES = 10      # Latencies needed before an agent is ever hedged
+HEDGE_MAX_FRACTION = 0.10   # Hedges may be at most 10% of hedgeable calls
+
+# Circuit breaker (see circuit_breaker.py)
+# Shared by every agent call in the process. When too many recent calls fail
+# with server-side errors the circuit opens: calls fail fast, batch files are
+# re-queued instead of producing reports full of errors, and after a pause a
+# single probe call decides whether to resume.
+CIRCUIT_WINDOW = 20               # Recent call outcomes the error rate is computed over
+CIRCUIT_MIN_CALLS = 10            # Outcomes needed before the circuit can open
+CIRCUIT_ERROR_RATE = 0.5          # Open when this fraction of the window failed
+CIRCUIT_OPEN_SECONDS = 30.0       # Pause before the first probe
+CIRCUIT_MAX_OPEN_SECONDS = 600.0  # The pause doubles after each failed probe, up to this
+CIRCUIT_PROBE_TIMEOUT = 180.0     # A probe with no outcome after this long is abandoned
+CIRCUIT_MAX_REQUEUES = 5          # Times a batch file is re-queued before it is given up
+
+# HTTP connection pool (shared by every agent call in the process, see llm_client.py)
+# One client is created lazily per process and reused across documents, so
+# batch runs keep their TLS connections alive instead of reconnecting per file.
+HTTP_MAX_CONNECTIONS = 20            # Upper bound on open connections (>= MAX_CONCURRENT_AGENTS)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept open for reuse
+HTTP_KEEPALIVE_EXPIRY = 60.0         # Seconds an idle connection is kept alive
+HTTP_CONNECT_TIMEOUT = 10.0          # Seconds to establish a connection
+HTTP_READ_TIMEOUT = 120.0            # Seconds between bytes of a response (long agent outputs)
+HTTP_WRITE_TIMEOUT = 30.0            # Seconds to send a request
+HTTP_POOL_TIMEOUT = 30.0             # Seconds to wait for a free pooled connection
 
 # ============================================================================
-# RATE LIMITING CONFIGURATION (Sequential Execution)
+# RATE LIMITING CONFIGURATION
 # ============================================================================
 
 # Tier 1 Rate Limits (as per Claude API docs)
@@ -56,10 +187,45 @@ RPM_LIMIT = 50  # Requests per minute
 ITPM_LIMIT = 30000  # Input tokens per minute
 OTPM_LIMIT = 8000  # Output tokens per minute
 
-# Sequential execution settings (safer for rate limits)
-DELAY_BETWEEN_AGENT_CALLS = 2.0  # 2 seconds between each of 16 agent API calls
-DELAY_BETWEEN_FILES = 5.0        # 5 seconds between each file in batch processing
-RATE_LIMIT_BACKOFF = 60.0        # 60 seconds wait if rate limit error detected
+# Token-bucket limiter settings (see rate_limiter.py)
+# Calls are admitted as soon as all three buckets have budget; bucket state is
+# also corrected from the anthropic-ratelimit-* response headers.
+CHARS_PER_TOKEN = 4.0           # Base input-token estimate (calibrated at runtime)
+OUTPUT_TOKENS_ESTIMATE = 600    # Initial output reservation (refined from observed usage)
+
+# API key pool (see key_pool.py)
+# With several keys (e.g. one per team workspace) each key gets its own
+# limiter with the budgets above, and every call goes to the key with the
+# most headroom. Keys are read from $ANTHROPIC_API_KEYS (comma-separated),
+# else from API_KEYS_FILE (one per line), else $ANTHROPIC_API_KEY alone.
+# Entries may be written "label=key" to name the key in reports.
+API_KEYS_FILE = Path(os.getenv("ANTHROPIC_API_KEYS_FILE", str(ROOT_DIR / ".api_keys")))
+KEY_EJECT_SECONDS = 300       # A key failing auth or out of quota is skipped this long...
+KEY_EJECT_MAX_SECONDS = 3600  # ...doubling each time it fails again after coming back
+
+# Pre-flight token counting (see token_counter.py)
+# Every agent request is counted before the fan-out. Documents whose
+# single-agent input exceeds the ITPM budget are rejected up front, and the
+# counts are used as the limiter's input-token reservations.
+# "estimate": chars / CHARS_PER_TOKEN x a calibration factor learned from API usage
+# "api":      exact counts from the count_tokens endpoint (one extra call per agent)
+TOKEN_COUNT_METHOD = "estimate"
+TOKEN_CALIBRATION_PATH = CACHE_DIR / "token_calibration.json"
+
+# Concurrent execution settings (async Layer 2 engine)
+MAX_CONCURRENT_AGENTS = 15  # Max in-flight agent calls per document (15 = all at once)
+
+# Durable work queue for large batch runs (see work_queue.py)
+# `enqueue` adds one job per (document, agent) to a SQLite database in WAL
+# mode; `worker --processes N` leases jobs from it in N processes and writes
+# each document's report once its last agent is done. Each process gets 1/N
+# of the rate limits above, so N workers share one budget.
+WORK_QUEUE_PATH = DATA_DIR / "queue" / "work_queue.db"
+WORK_QUEUE_VISIBILITY_TIMEOUT = 300  # Seconds a leased job is hidden from other workers (renewed while it runs)
+WORK_QUEUE_MAX_ATTEMPTS = 3          # Attempts per job before its failure is final
+WORK_QUEUE_RETRY_DELAY = 30          # Seconds before a failed job is offered again (doubles per attempt)
+WORK_QUEUE_CLAIM_SIZE = 8            # Jobs a worker leases at once (agents of one document, run concurrently)
+WORK_QUEUE_POLL_SECONDS = 2.0        # How often an idle worker looks for new jobs
 
 # ============================================================================
 # SCORING WEIGHTS: 17 SUB-PARAMETERS (v6.0)
@@ -131,6 +297,38 @@ WEIGHTS_PARAMETERS = {
 }
 # Verify: 0.30 + 0.05 + 0.25 + 0.30 + 0.10 = 1.00 ✓
 
+# ============================================================================
+# DOCUMENT SEGMENTS (see segmenter.py)
+# ============================================================================
+# Each agent declares the segments its score depends on. When a draft is
+# re-analyzed, agents whose segments hash the same as in the previous report
+# reuse that report's result instead of calling the API again.
+SEGMENT_HEADLINE = "headline"  # First H1 (or first line of a plain-text draft)
+SEGMENT_INTRO = "intro"  # Everything between the headline and the first H2
+SEGMENT_SECTIONS = "sections"  # The H2 sections, including their subsections
+SEGMENT_STRUCTURE = "structure"  # Heading outline and paragraph/list shape
+SEGMENTS_FULL = (SEGMENT_HEADLINE, SEGMENT_INTRO, SEGMENT_SECTIONS)
+
+# Per-agent input views: the part of the draft an agent is sent ("input_view"
+# in SUB_PARAMETERS). Narrow views cut input tokens for agents that only
+# judge the opening or the structure; an agent's segments must cover its view.
+INPUT_VIEW_FULL = "full"  # The whole draft
+INPUT_VIEW_HEADLINE_INTRO = "headline_intro"  # Headline and intro only
+INPUT_VIEW_OUTLINE = "outline_only"  # Headings plus a size summary per block
+INPUT_VIEW_FIRST_N_TOKENS = "first_n_tokens"  # The first INPUT_VIEW_TOKENS tokens
+INPUT_VIEWS = (
+    INPUT_VIEW_FULL,
+    INPUT_VIEW_HEADLINE_INTRO,
+    INPUT_VIEW_OUTLINE,
+    INPUT_VIEW_FIRST_N_TOKENS,
+)
+INPUT_VIEW_TOKENS = 800  # Size of the first_n_tokens view
+
+# Markdown normalization (see normalizer.py): link targets, images, HTML and
+# redundant whitespace are stripped from the draft before the agents see it.
+# Layer 1 still runs on the source, and agent flag quotes are mapped back to it.
+NORMALIZE_MARKDOWN = True
+
 # ============================================================================
 # COMPLETE SUB-PARAMETER REGISTRY
 # ============================================================================
@@ -143,6 +341,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P1["1A_Positive"],
         "prompt_file": "1A_Positive.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "1B_Direct": {
         "name": "Direct with Personality",
@@ -150,6 +350,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P1["1B_Direct"],
         "prompt_file": "1B_Direct.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "1C_Trustworthy": {
         "name": "Trustworthy & Authentic",
@@ -157,6 +359,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P1["1C_Trustworthy"],
         "prompt_file": "1C_Trustworthy.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "1D_Sharp_Wit": {
         "name": "Sharp Wit & Confidence",
@@ -164,6 +368,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P1["1D_Sharp_Wit"],
         "prompt_file": "1D_Sharp_Wit.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     # P2: Brand Hygiene & Compliance
     "2A_Mechanical": {
@@ -179,6 +385,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P2["2B_Contextual"],
         "prompt_file": "2B_Contextual_Terminology.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "2C_Persona": {
         "name": "Persona & Lexicon",
@@ -186,6 +394,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P2["2C_Persona"],
         "prompt_file": "2C_Persona_Lexicon.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     # P3: Structural Integrity & Clarity
     "3A_BLUF": {
@@ -194,6 +404,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P3["3A_BLUF"],
         "prompt_file": "3A_BLUF.txt",
         "requires_llm": True,
+        "segments": (SEGMENT_HEADLINE, SEGMENT_INTRO),
+        "input_view": INPUT_VIEW_HEADLINE_INTRO,
     },
     "3B_Scannability": {
         "name": "Scannability & Hierarchy",
@@ -201,6 +413,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P3["3B_Scannability"],
         "prompt_file": "3B_Scannability.txt",
         "requires_llm": True,
+        "segments": (SEGMENT_STRUCTURE,),
+        "input_view": INPUT_VIEW_OUTLINE,
     },
     "3C_Conciseness": {
         "name": "Conciseness & Human Language",
@@ -208,6 +422,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P3["3C_Conciseness"],
         "prompt_file": "3C_Conciseness.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "3D_Specificity": {
         "name": "Specificity",
@@ -215,6 +431,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P3["3D_Specificity"],
         "prompt_file": "3D_Specificity.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     # P4: Strategic Value & Depth
     "4A_Audience": {
@@ -223,6 +441,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P4["4A_Audience"],
         "prompt_file": "4A_Audience_Alignment.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "4B_Actionability": {
         "name": "Actionability",
@@ -230,6 +450,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P4["4B_Actionability"],
         "prompt_file": "4B_Actionability.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "4C_Evidence": {
         "name": "Evidence & Examples",
@@ -237,6 +459,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P4["4C_Evidence"],
         "prompt_file": "4C_Evidence.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     "4D_Originality": {
         "name": "Originality & AI Detection",
@@ -244,6 +468,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P4["4D_Originality"],
         "prompt_file": "4D_Originality.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
     # P5: Engagement & Discoverability
     "5A_Headline": {
@@ -252,6 +478,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P5["5A_Headline"],
         "prompt_file": "5A_Headline_Hook.txt",
         "requires_llm": True,
+        "segments": (SEGMENT_HEADLINE, SEGMENT_INTRO),
+        "input_view": INPUT_VIEW_HEADLINE_INTRO,
     },
     "5B_SEO": {
         "name": "SEO & Shareability",
@@ -259,6 +487,8 @@ SUB_PARAMETERS = {
         "weight": WEIGHTS_P5["5B_SEO"],
         "prompt_file": "5B_SEO.txt",
         "requires_llm": True,
+        "segments": SEGMENTS_FULL,
+        "input_view": INPUT_VIEW_FULL,
     },
 }
 
@@ -317,6 +547,16 @@ def get_agent_metadata(agent_id):
     return SUB_PARAMETERS.get(agent_id)
 
 
+def get_agent_segments(agent_id):
+    """Document segments an agent's score depends on."""
+    return SUB_PARAMETERS[agent_id].get("segments", SEGMENTS_FULL)
+
+
+def get_agent_input_view(agent_id):
+    """Input view (INPUT_VIEW_*) an agent is sent."""
+    return SUB_PARAMETERS[agent_id].get("input_view", INPUT_VIEW_FULL)
+
+
 def get_parameter_agents(parameter_id):
     """Get all agent IDs belonging to a specific parameter."""
     return [
@@ -326,6 +566,14 @@ def get_parameter_agents(parameter_id):
     ]
 
 
+def get_llm_agent_groups():
+    """Group LLM agent IDs by parameter, in SUB_PARAMETERS order."""
+    groups = {}
+    for agent_id in get_llm_agents():
+        groups.setdefault(SUB_PARAMETERS[agent_id]["parameter"], []).append(agent_id)
+    return groups
+
+
 # Validation: Ensure all weights sum correctly
 def validate_weights():
     """Validate that all weight configurations are correct."""
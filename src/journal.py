@@ -0,0 +1,164 @@
+"""
+Journal: Crash-safe checkpoint of agent results during a single analysis.
+Appends each agent result to a per-document JSONL file so an interrupted analysis resumes instead of starting over.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+from config import JOURNAL_DIR, JOURNAL_MAX_AGE_DAYS, MODEL_NAME
+from llm_client import get_llm_client
+from prompt_registry import get_prompt_registry
+from result_cache import sha256_text
+
+# Bumped if the line format changes; journals of another version are ignored
+JOURNAL_VERSION = 1
+
+
+class AnalysisJournal:
+    """
+    Append-only JSONL journal of one draft's agent results.
+
+    The first line is a header naming the draft the agents were sent
+    (normalized or not) and the model, prefixed for isolated backends so a
+    fake-backend journal is never resumed by a real run; every further line
+    is one successful agent result. Each line is flushed and fsynced as it
+    is written, so a crash loses at most the line being written. resume()
+    cuts a torn last line off the file, so later appends start on a fresh
+    line.
+    """
+
+    def __init__(self, content: str, agent_content: str, directory: Path = JOURNAL_DIR):
+        """
+        Args:
+            content: Source draft (names the journal file)
+            agent_content: Draft the agents are sent
+            directory: Journal directory
+        """
+        self.content_hash = sha256_text(content)
+        self.path = directory / f"{self.content_hash}.jsonl"
+        self.header = {
+            "journal": JOURNAL_VERSION,
+            "content_hash": self.content_hash,
+            "agent_content_hash": sha256_text(agent_content),
+            "model": get_llm_client()._cache_model(MODEL_NAME),
+        }
+        self._lock = threading.Lock()
+        self._file = None
+
+    def resume(self) -> Dict[str, Dict]:
+        """
+        Results recorded by an interrupted analysis of this draft.
+
+        A journal written for a different agent input (e.g. normalization
+        toggled), model or backend is discarded, and results from a prompt
+        version that has since changed are dropped. A torn last line (a crash
+        mid-write) is truncated away; an unreadable line elsewhere is skipped.
+
+        Returns:
+            Dictionary mapping agent_id to result (marked "resumed": True)
+        """
+        if not self.path.exists():
+            return {}
+
+        header = None
+        results = {}
+        registry = get_prompt_registry()
+        with open(self.path, "rb") as f:
+            lines = f.readlines()
+        offset = 0
+        for i, line in enumerate(lines):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated line")
+                entry = json.loads(line)
+            except ValueError:
+                if i == len(lines) - 1:
+                    # Torn write from a crash: drop it so the next append
+                    # does not continue the partial line
+                    with open(self.path, "r+b") as f:
+                        f.truncate(offset)
+                    break
+                offset += len(line)
+                continue
+            offset += len(line)
+            if header is None:
+                header = entry
+                if header != self.header:
+                    break
+                continue
+            agent_id = entry.get("agent_id")
+            if entry.get("prompt_version") == registry.get_version(agent_id):
+                results[agent_id] = dict(entry, resumed=True)
+
+        if header is None:
+            # Crashed before the first result was written
+            self.discard()
+            return {}
+        if header != self.header:
+            print("  ⚠️  Journal was written for a different input, model or backend; starting over")
+            self.discard()
+            return {}
+        return results
+
+    def append(self, result: Dict) -> None:
+        """
+        Record a successful agent result (failed results are not journaled,
+        so a resumed analysis retries them).
+
+        Args:
+            result: Agent result as returned by the LLM client
+        """
+        if not result.get("success") or result.get("skipped"):
+            return
+        line = json.dumps(result, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fresh = not self.path.exists() or self.path.stat().st_size == 0
+                self._file = open(self.path, "a", encoding="utf-8")
+                if fresh:
+                    self._file.write(json.dumps(self.header) + "\n")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the journal file, keeping it on disk."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self) -> None:
+        """Delete the journal (its results are in a report, or no longer valid)."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def prune_journals(directory: Path = JOURNAL_DIR, max_age_days: float = JOURNAL_MAX_AGE_DAYS) -> int:
+    """
+    Remove journals not written to for max_age_days (drafts never re-analyzed).
+
+    Returns:
+        Number of journals removed
+    """
+    if not directory.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in directory.glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
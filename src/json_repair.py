@@ -0,0 +1,229 @@
+"""
+JSON Repair: Tolerant extraction of agent JSON from model output.
+Recovers objects wrapped in prose, with unescaped quotes, trailing commas or truncation.
+"""
+
+import json
+import math
+import re
+from typing import Any, List, Optional, Tuple
+
+# Repair labels recorded on results (and counted in the report)
+REPAIR_SURROUNDING_TEXT = "surrounding_text"  # Prose or code fences around the object
+REPAIR_UNESCAPED_QUOTE = "unescaped_quote"  # Bare " inside a string value
+REPAIR_CONTROL_CHARACTER = "control_character"  # Raw newline / tab inside a string
+REPAIR_TRAILING_COMMA = "trailing_comma"  # , before } or ]
+REPAIR_TRUNCATED = "truncated"  # Output ended mid-object; open values closed
+REPAIR_SCORE_COERCED = "score_coerced"  # Score given as float or string
+REPAIR_FLAGS_DEFAULTED = "flags_defaulted"  # flags missing (cut off) or not a list
+
+# Characters that may legitimately follow a closing quote in JSON
+_AFTER_STRING = set(",:}]")
+
+_SCORE_IN_TEXT = re.compile(r"^\s*([1-4])(?:\s*(?:/|out of)\s*4)?\s*$")
+
+
+def _scan_object(text: str, start: int) -> Tuple[int, bool]:
+    """
+    Balanced-brace scan from an opening '{', string-aware.
+
+    Returns:
+        Tuple of (end index exclusive, complete). When the braces never
+        balance, end is len(text) and complete is False.
+    """
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+            continue
+        if c == '"':
+            in_string = True
+        elif c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1, True
+    return len(text), False
+
+
+def _next_significant(text: str, index: int) -> str:
+    """Next non-whitespace character at or after index ('' at end of text)."""
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return text[index] if index < len(text) else ""
+
+
+def _repair_text(text: str, repairs: List[str]) -> List[str]:
+    """
+    Fix string-level defects and close a truncated object.
+
+    A quote inside a string only counts as closing it when the next
+    significant character is one JSON allows after a string; otherwise it is
+    escaped. Raw control characters in strings are escaped and commas before
+    a closing bracket are dropped.
+
+    If the text ends inside the object, the first candidate closes the open
+    string and brackets (keeping a partially written value); the rest cut
+    back to each earlier member boundary, latest first, for output cut off
+    inside a key or literal.
+
+    Returns:
+        Candidate texts to try, in order of preference
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    # (length of out, open brackets) after each complete member
+    safe_points: List[Tuple[int, Tuple[str, ...]]] = []
+    in_string = False
+    escape = False
+
+    for i, c in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+                out.append(c)
+            elif c == "\\":
+                escape = True
+                out.append(c)
+            elif c == '"':
+                nxt = _next_significant(text, i + 1)
+                if nxt in _AFTER_STRING or nxt == "":
+                    in_string = False
+                    out.append(c)
+                else:
+                    out.append('\\"')
+                    _add(repairs, REPAIR_UNESCAPED_QUOTE)
+            elif c in "\n\r\t":
+                out.append({"\n": "\\n", "\r": "\\r", "\t": "\\t"}[c])
+                _add(repairs, REPAIR_CONTROL_CHARACTER)
+            else:
+                out.append(c)
+            continue
+
+        if c == '"':
+            in_string = True
+            out.append(c)
+        elif c in "{[":
+            stack.append("}" if c == "{" else "]")
+            out.append(c)
+            safe_points.append((len(out), tuple(stack)))
+        elif c in "}]":
+            _drop_trailing_comma(out, repairs)
+            if stack:
+                stack.pop()
+            out.append(c)
+        elif c == ",":
+            safe_points.append((len(out), tuple(stack)))
+            out.append(c)
+        else:
+            out.append(c)
+
+    if not in_string and not stack:
+        return ["".join(out)]
+
+    _add(repairs, REPAIR_TRUNCATED)
+    if escape:
+        out.pop()
+    closed = out + (['"'] if in_string else [])
+    _drop_trailing_comma(closed, repairs, record=False)
+    candidates = ["".join(closed) + "".join(reversed(stack))]
+
+    for length, open_brackets in reversed(safe_points):
+        prefix = out[:length]
+        _drop_trailing_comma(prefix, repairs, record=False)
+        candidates.append("".join(prefix) + "".join(reversed(open_brackets)))
+    return candidates
+
+
+def _drop_trailing_comma(out: List[str], repairs: List[str], record: bool = True) -> None:
+    """Remove a ',' (and following whitespace) at the end of out."""
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i:]
+        if record:
+            _add(repairs, REPAIR_TRAILING_COMMA)
+
+
+def _add(repairs: List[str], label: str) -> None:
+    if label not in repairs:
+        repairs.append(label)
+
+
+def extract_json_object(text: str) -> Tuple[Optional[Any], List[str]]:
+    """
+    Extract the first JSON object from model output, repairing it if needed.
+
+    Args:
+        text: Full model output (including any assistant prefill)
+
+    Returns:
+        Tuple of (decoded object or None if unrecoverable, repairs applied)
+    """
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError:
+        pass
+
+    repairs: List[str] = []
+    start = text.find("{")
+    if start < 0:
+        return None, repairs
+
+    end, complete = _scan_object(text, start)
+    candidate = text[start:end]
+    if start > 0 or (complete and text[end:].strip()):
+        _add(repairs, REPAIR_SURROUNDING_TEXT)
+
+    if complete:
+        try:
+            return json.loads(candidate), repairs
+        except json.JSONDecodeError:
+            pass
+
+    for repaired in _repair_text(candidate, repairs):
+        try:
+            return json.loads(repaired), repairs
+        except json.JSONDecodeError:
+            continue
+
+    return None, repairs
+
+
+def coerce_score(value: Any) -> Tuple[Optional[int], bool]:
+    """
+    Coerce a model-reported score to an integer on the 1-4 scale.
+
+    Accepts ints, whole or near-whole floats (3.0, 2.5 rounds half up) and
+    strings such as "3" or "3/4". Booleans, NaN / infinity and out-of-range
+    values (0.6, 4.4) are rejected.
+
+    Args:
+        value: The "score" value from the agent's JSON
+
+    Returns:
+        Tuple of (score or None if invalid, whether it was coerced)
+    """
+    if isinstance(value, bool):
+        return None, False
+    if isinstance(value, int):
+        return (value, False) if 1 <= value <= 4 else (None, False)
+    if isinstance(value, float):
+        if not (math.isfinite(value) and 1 <= value <= 4):
+            return None, False
+        return int(value + 0.5), True
+    if isinstance(value, str):
+        match = _SCORE_IN_TEXT.match(value)
+        if match:
+            return int(match.group(1)), True
+    return None, False
@@ -0,0 +1,112 @@
+"""
+Incremental JSON scanning for streamed agent responses.
+Reports top-level fields of the agent's JSON object as soon as each value is complete.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+
+
+class IncrementalFieldParser:
+    """
+    Character-level scanner over a JSON object that arrives in chunks.
+
+    Tracks string/escape state and nesting depth so that a top-level value
+    (e.g. "score": 3) is decoded the moment its terminating comma or brace
+    arrives, long before the rest of the object (feedback, flags) is done.
+    """
+
+    def __init__(self, watch: Optional[Iterable[str]] = None):
+        """
+        Args:
+            watch: Top-level keys to report from feed(); None reports every key
+        """
+        self.watch = set(watch) if watch is not None else None
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = True
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """
+        Consume the next chunk of streamed text.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Watched top-level fields completed by this chunk
+        """
+        self.buffer += chunk
+        completed = {}
+
+        while self._pos < len(self.buffer):
+            i = self._pos
+            c = self.buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key and self._key_start is not None:
+                        self._key = _decode(self.buffer[self._key_start : i + 1])
+                        self._key_start = None
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+            elif c in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif c in "}]":
+                if self._depth == 1:
+                    self._finish_value(i, completed)
+                self._depth -= 1
+            elif c == ":" and self._depth == 1:
+                self._expect_key = False
+                self._value_start = i + 1
+            elif c == "," and self._depth == 1:
+                self._finish_value(i, completed)
+                self._expect_key = True
+
+        return completed
+
+    def _finish_value(self, end: int, completed: Dict[str, Any]) -> None:
+        """Decode the top-level value that ends at `end`, if one is open."""
+        if self._key is None or self._value_start is None:
+            return
+
+        raw_value = self.buffer[self._value_start : end].strip()
+        key = self._key
+        self._key = None
+        self._value_start = None
+
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            return
+
+        self.fields[key] = value
+        if self.watch is None or key in self.watch:
+            completed[key] = value
+
+
+def _decode(raw_string: str) -> Optional[str]:
+    """Decode a JSON string literal (including quotes)."""
+    try:
+        return json.loads(raw_string)
+    except json.JSONDecodeError:
+        return None
@@ -0,0 +1,357 @@
+"""
+Key Pool: Spreads Claude API calls over several API keys.
+Each key has its own rate limiter; calls go to the key with the most headroom and failing keys are ejected for a while.
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import anthropic
+
+from backends import BACKEND_ANTHROPIC, AnthropicBackend, Backend, create_backend
+from config import (
+    API_KEYS_FILE,
+    KEY_EJECT_SECONDS,
+    KEY_EJECT_MAX_SECONDS,
+    LLM_BACKEND,
+)
+from rate_limiter import RateLimiter, get_rate_limiter
+
+# Reasons a key is ejected from the pool
+EJECT_AUTH = "auth"  # 401 / 403: revoked, mistyped or without access
+EJECT_QUOTA = "quota"  # Credit balance or workspace spend limit exhausted
+
+# Error message fragments that identify a quota error (the API reports these
+# as 400 / 402 / 429, the last indistinguishable by status from rate limiting)
+QUOTA_MARKERS = ("credit balance", "usage limit", "spend limit", "quota", "billing")
+
+# "label=key" entry (keys themselves start with "sk-")
+_LABELLED_ENTRY = re.compile(r"^(?!sk-)([^=]+)=(\S+)$")
+
+# Usage counters kept per key
+KEY_USAGE_FIELDS = ("api_calls", "input_tokens", "output_tokens", "errors", "ejections")
+
+
+def key_error_reason(error: anthropic.APIError) -> Optional[str]:
+    """
+    Whether an API error is the key's fault rather than the request's.
+
+    Args:
+        error: Exception raised by a backend call
+
+    Returns:
+        EJECT_AUTH, EJECT_QUOTA, or None for any other error
+    """
+    status = getattr(error, "status_code", None)
+    if status in (401, 403):
+        return EJECT_AUTH
+    if status in (400, 402, 429):
+        message = str(error).lower()
+        if any(marker in message for marker in QUOTA_MARKERS):
+            return EJECT_QUOTA
+    return None
+
+
+def _mask(api_key: str) -> str:
+    """Last characters of a key, enough to tell keys apart in logs."""
+    return f"…{api_key[-4:]}"
+
+
+def load_api_keys() -> List[Tuple[str, str]]:
+    """
+    Configured API keys, in order of preference.
+
+    Read from $ANTHROPIC_API_KEYS (comma or whitespace separated), else
+    API_KEYS_FILE (one key per line, # comments), else $ANTHROPIC_API_KEY.
+    An entry written "label=key" is reported under that label; other keys
+    are labelled by position and masked suffix. Duplicates are dropped.
+
+    Returns:
+        List of (label, key)
+    """
+    entries = [entry for entry in re.split(r"[,\s]+", os.getenv("ANTHROPIC_API_KEYS", "")) if entry]
+    if not entries and API_KEYS_FILE.exists():
+        for line in API_KEYS_FILE.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                entries.append(line)
+    if not entries and os.getenv("ANTHROPIC_API_KEY"):
+        entries.append(os.getenv("ANTHROPIC_API_KEY"))
+
+    keys: List[Tuple[str, str]] = []
+    seen = set()
+    for entry in entries:
+        label, api_key = "", entry
+        match = _LABELLED_ENTRY.match(entry)
+        if match:
+            label, api_key = match.groups()
+        if api_key in seen:
+            continue
+        seen.add(api_key)
+        label = label or f"key-{len(keys) + 1}"
+        keys.append((f"{label} ({_mask(api_key)})", api_key))
+    return keys
+
+
+# ============================================================================
+# KEY POOL
+# ============================================================================
+
+
+class ApiKey:
+    """One API key: its backend, its own rate limiter and its usage."""
+
+    def __init__(self, label: str, backend: Backend, limiter: RateLimiter):
+        self.label = label
+        self.backend = backend
+        self.limiter = limiter
+        self.ejected_until = 0.0
+        self.eject_seconds = float(KEY_EJECT_SECONDS)
+        self.last_eject_reason: Optional[str] = None
+        self.usage = {field: 0 for field in KEY_USAGE_FIELDS}
+
+    def ejected(self, now: float) -> bool:
+        """True while the key is being skipped."""
+        return now < self.ejected_until
+
+
+class KeyPool:
+    """
+    API keys calls are spread over.
+
+    Each call is admitted by one key's limiter: the non-ejected key with the
+    most headroom that has budget for it right now. A key that fails with an
+    auth or quota error is ejected for KEY_EJECT_SECONDS (doubling on repeat
+    ejections up to KEY_EJECT_MAX_SECONDS) and the call moves to another
+    key. A pool of one key never ejects it, so a single key fails exactly
+    as it would without the pool.
+    """
+
+    def __init__(self, keys: List[ApiKey]):
+        if not keys:
+            raise ValueError("A key pool needs at least one key")
+        self.keys = keys
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    @property
+    def primary(self) -> ApiKey:
+        """First configured key (serves count_tokens and output estimates)."""
+        return self.keys[0]
+
+    def _try_acquire(
+        self, input_tokens: int, output_tokens: int, not_before: Optional[float]
+    ) -> Tuple[Optional[ApiKey], float]:
+        """
+        Reserve budget on the best key that can take the call now.
+
+        Returns:
+            Tuple of (key, 0.0) on success; (None, seconds to wait) when no
+            key has budget; (None, -1.0) when every key is ejected
+        """
+        now = time.monotonic()
+        with self._lock:
+            available = [key for key in self.keys if not key.ejected(now)]
+        if not available:
+            return None, -1.0
+
+        waits = []
+        for key in sorted(available, key=lambda key: key.limiter.headroom(), reverse=True):
+            wait = key.limiter.try_reserve(input_tokens, output_tokens, not_before)
+            if wait <= 0:
+                return key, 0.0
+            waits.append(wait)
+        return None, min(waits)
+
+    async def acquire(
+        self, input_tokens: int, output_tokens: int, not_before: Optional[float] = None
+    ) -> Tuple[Optional[ApiKey], float]:
+        """
+        Wait (without blocking the event loop) until some key admits the call.
+
+        Args:
+            input_tokens: Estimated input tokens for the request
+            output_tokens: Output tokens to reserve for the request
+            not_before: Monotonic time before which this call must not start
+
+        Returns:
+            Tuple of (key the budget was reserved on, seconds waited). The
+            key is None when every key has been ejected.
+        """
+        waited = 0.0
+        while True:
+            key, wait = self._try_acquire(input_tokens, output_tokens, not_before)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self.total_wait += waited
+        return key, waited
+
+    def acquire_blocking(
+        self, input_tokens: int, output_tokens: int, not_before: Optional[float] = None
+    ) -> Tuple[Optional[ApiKey], float]:
+        """Synchronous counterpart of acquire() for threaded callers."""
+        waited = 0.0
+        while True:
+            key, wait = self._try_acquire(input_tokens, output_tokens, not_before)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        self.total_wait += waited
+        return key, waited
+
+    def pause_until(self, deadline: float) -> None:
+        """Hold back admissions on every key (API-wide overload)."""
+        for key in self.keys:
+            key.limiter.pause_until(deadline)
+
+    def record_usage(self, key: ApiKey, usage: Optional[Dict]) -> None:
+        """Count a successful call (and its billed tokens) against its key."""
+        with self._lock:
+            key.usage["api_calls"] += 1
+            if usage:
+                key.usage["input_tokens"] += (
+                    usage["input_tokens"]
+                    + usage["cache_creation_input_tokens"]
+                    + usage["cache_read_input_tokens"]
+                )
+                key.usage["output_tokens"] += usage["output_tokens"]
+            # Back in good standing: the next ejection starts from the minimum again
+            key.eject_seconds = float(KEY_EJECT_SECONDS)
+
+    def record_failure(self, key: ApiKey, error: anthropic.APIError) -> bool:
+        """
+        Count a failed call against its key, ejecting the key if it is at fault.
+
+        Args:
+            key: Key the call was sent with
+            error: The API error
+
+        Returns:
+            True if the key was ejected and another key can take the call
+        """
+        reason = key_error_reason(error)
+        with self._lock:
+            key.usage["errors"] += 1
+            if reason is None or len(self.keys) == 1:
+                return False
+            now = time.monotonic()
+            if not key.ejected(now):
+                key.ejected_until = now + key.eject_seconds
+                key.last_eject_reason = reason
+                key.usage["ejections"] += 1
+                print(
+                    f"🔑 API key {key.label} ejected for {key.eject_seconds:.0f}s "
+                    f"({reason} error: {error})"
+                )
+                key.eject_seconds = min(KEY_EJECT_MAX_SECONDS, key.eject_seconds * 2)
+            return any(not other.ejected(now) for other in self.keys)
+
+    def set_limit_share(self, share: float) -> None:
+        """Give every key's limiter a share of its budgets (see RateLimiter.set_share)."""
+        for key in self.keys:
+            key.limiter.set_share(share)
+
+    def input_token_capacities(self) -> List[float]:
+        """
+        Input-token budget per minute of each key that is not ejected.
+
+        Full budgets, not this process's share of them: a call larger than
+        the share is still admitted once the share's bucket is full.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                key.limiter.buckets["input_tokens"].capacity / key.limiter.share
+                for key in self.keys
+                if not key.ejected(now)
+            ]
+
+    def summary(self) -> Dict[str, Dict]:
+        """Usage, headroom and ejection state per key (for reports and logs)."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key.label: {
+                    **key.usage,
+                    "headroom": round(key.limiter.headroom(), 3),
+                    "ejected_s": round(key.ejected_until - now, 1) if key.ejected(now) else 0.0,
+                    "last_eject_reason": key.last_eject_reason,
+                }
+                for key in self.keys
+            }
+
+    def print_summary(self) -> None:
+        """Print per-key usage (only meaningful with more than one key)."""
+        print(f"API keys: {len(self.keys)}")
+        for label, usage in self.summary().items():
+            state = f", ejected for {usage['ejected_s']:.0f}s" if usage["ejected_s"] else ""
+            print(
+                f"  {label}: {usage['api_calls']} calls, {usage['input_tokens']} input / "
+                f"{usage['output_tokens']} output tokens, {usage['errors']} errors{state}"
+            )
+
+
+def single_key_pool(backend: Backend, limiter: Optional[RateLimiter] = None) -> KeyPool:
+    """
+    Pool of one key for a given backend (the fake, or an explicit backend).
+
+    Args:
+        backend: Backend every call goes through
+        limiter: Its limiter (defaults to the process-wide one)
+    """
+    return KeyPool([ApiKey(backend.name, backend, limiter or get_rate_limiter())])
+
+
+def create_key_pool() -> KeyPool:
+    """
+    Build the pool for the configured backend.
+
+    The Claude API gets one AnthropicBackend and limiter per configured key;
+    the first key keeps the process-wide limiter. Other backends (the fake)
+    get a single-key pool.
+    """
+    name = os.getenv("SCORING_LLM_BACKEND") or LLM_BACKEND
+    if name != BACKEND_ANTHROPIC:
+        return single_key_pool(create_backend(name))
+    keys = load_api_keys()
+    if len(keys) <= 1:
+        # AnthropicBackend raises the usual "key not found" error if there is none
+        return single_key_pool(AnthropicBackend(keys[0][1] if keys else None))
+
+    print(f"🔑 API key pool: {len(keys)} keys ({', '.join(label for label, _ in keys)})")
+    return KeyPool(
+        [
+            ApiKey(label, AnthropicBackend(api_key), get_rate_limiter() if i == 0 else RateLimiter())
+            for i, (label, api_key) in enumerate(keys)
+        ]
+    )
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_pool: Optional[KeyPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_key_pool() -> KeyPool:
+    """Return the process-wide key pool, building it on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = create_key_pool()
+        return _shared_pool
@@ -0,0 +1,140 @@
+"""
+Latency History: Per-agent response times that drive hedged requests.
+Records each agent's API latency in SQLite and exposes its high percentile as the hedge trigger.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    LATENCY_HISTORY_PATH,
+    LATENCY_HISTORY_SIZE,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+)
+from output_budget import percentile
+
+
+class LatencyHistory:
+    """
+    API latency history and hedge delays per agent.
+
+    Only the time spent in the API call itself is recorded (not limiter
+    waits or retry backoff), so the hedge delay reflects how long the
+    service takes to answer this agent. Agents with fewer than
+    HEDGE_MIN_SAMPLES recorded calls are never hedged.
+    """
+
+    def __init__(
+        self,
+        path: Path = LATENCY_HISTORY_PATH,
+        history_size: int = LATENCY_HISTORY_SIZE,
+    ):
+        """
+        Args:
+            path: SQLite file for the history (":memory:" for a throwaway store)
+            history_size: Latencies kept per agent and model
+        """
+        self.path = Path(path)
+        self.history_size = history_size
+        self._delays: Dict[str, Optional[float]] = {}
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS latencies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                agent_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_latencies_agent ON latencies (agent_id, model, id)"
+        )
+        self._conn.commit()
+
+    def _history(self, agent_id: str, model: str) -> List[float]:
+        """Most recent latencies for an agent (caller holds the lock)."""
+        rows = self._conn.execute(
+            "SELECT seconds FROM latencies WHERE agent_id = ? AND model = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (agent_id, model, self.history_size),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def hedge_delay(self, agent_id: str, model: str) -> Optional[float]:
+        """
+        Seconds after which an unanswered call for this agent is hedged.
+
+        Args:
+            agent_id: Agent identifier
+            model: Model that will serve the call
+
+        Returns:
+            The HEDGE_PERCENTILE latency, or None while history is insufficient
+        """
+        key = f"{model}:{agent_id}"
+        with self._lock:
+            if key not in self._delays:
+                history = self._history(agent_id, model)
+                self._delays[key] = (
+                    percentile(history, HEDGE_PERCENTILE)
+                    if len(history) >= HEDGE_MIN_SAMPLES
+                    else None
+                )
+            return self._delays[key]
+
+    def record(self, agent_id: str, model: str, seconds: float) -> None:
+        """
+        Record how long a successful API call took.
+
+        Args:
+            agent_id: Agent identifier
+            model: Model that served the call
+            seconds: Time from sending the request to the complete response
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO latencies (agent_id, model, seconds, recorded_at) "
+                "VALUES (?, ?, ?, ?)",
+                (agent_id, model, seconds, time.time()),
+            )
+            # Keep only the window the percentile is computed over
+            self._conn.execute(
+                """
+                DELETE FROM latencies
+                WHERE agent_id = ? AND model = ? AND id NOT IN (
+                    SELECT id FROM latencies WHERE agent_id = ? AND model = ?
+                    ORDER BY id DESC LIMIT ?
+                )
+                """,
+                (agent_id, model, agent_id, model, self.history_size),
+            )
+            self._conn.commit()
+            self._delays.pop(f"{model}:{agent_id}", None)
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_history: Optional[LatencyHistory] = None
+_shared_history_lock = threading.Lock()
+
+
+def get_latency_history() -> LatencyHistory:
+    """Return the process-wide latency history, opening it on first use."""
+    global _shared_history
+    with _shared_history_lock:
+        if _shared_history is None:
+            _shared_history = LatencyHistory()
+        return _shared_history
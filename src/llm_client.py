@@ -1,28 +1,81 @@
 """
-LLM Client for Layer 2: Sequential execution of 16 specialized agents.
+LLM Client for Layer 2: Concurrent execution of 16 specialized agents.
 Handles rate limiting, retries, JSON parsing, and error recovery.
 """
 
+import asyncio
 import json
-import os
+import threading
 import time
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import anthropic
 from dotenv import load_dotenv
 
 from config import (
     MODEL_NAME,
+    MODEL_PRICING,
     TEMPERATURE,
     MAX_TOKENS,
-    MAX_RETRIES,
-    RETRY_DELAY,
-    DELAY_BETWEEN_AGENT_CALLS,
-    RATE_LIMIT_BACKOFF,
+    MAX_CONCURRENT_AGENTS,
+    TOKEN_COUNT_METHOD,
+    HEDGE_REQUESTS,
+    HEDGE_MAX_FRACTION,
+    PROMPT_CACHE_LAYOUT,
+    LAYER_2_MODE_FULL,
+    LAYER_2_MODE_GROUPED,
+    LAYER_2_MODE_TRIAGE,
+    LAYER_2_MODE_CASCADE,
+    TRIAGE_MAX_CONCURRENCY,
+    CASCADE_MODEL,
+    CASCADE_MARGIN,
     PROMPTS_DIR,
     get_llm_agents,
+    get_llm_agent_groups,
     get_agent_metadata,
+    get_parameter_agents,
+    GATE_2_TONE_MINIMUM,
+)
+from backends import Backend
+from circuit_breaker import CircuitBreaker, get_circuit_breaker
+from json_repair import (
+    REPAIR_FLAGS_DEFAULTED,
+    REPAIR_SCORE_COERCED,
+    coerce_score,
+    extract_json_object,
+)
+from json_stream import IncrementalFieldParser
+from key_pool import ApiKey, KeyPool, get_key_pool, single_key_pool
+from latency_history import LatencyHistory, get_latency_history
+from output_budget import OutputBudget, get_output_budget
+from prompt_registry import get_prompt_registry
+from retry_policy import (
+    ERROR_OVERLOADED,
+    GLOBAL_BACKOFF_ERRORS,
+    RETRYABLE_ERRORS,
+    RetryPolicy,
+    classify_error,
+    get_retry_after,
+)
+from scorer import (
+    calculate_parameter_score,
+    cascade_escalations,
+    compute_verdict_bounds,
+    triage_order,
+)
+from segmenter import agent_input
+from token_counter import (
+    TOKEN_COUNT_API,
+    DocumentTooLargeError,
+    TokenCounter,
+    get_token_counter,
+)
+from result_cache import (
+    CACHE_MODE_USE,
+    CACHE_MODE_OFF,
+    CACHE_MISS,
+    get_result_cache,
+    make_cache_key,
 )
 
 # Load environment variables
@@ -35,7 +88,10 @@ load_dotenv()
 
 def load_prompt(agent_id: str) -> Optional[str]:
     """
-    Load prompt content from the prompts directory.
+    Load prompt content for an agent from the shared prompt registry.
+
+    Prompts are read from disk once per process; edited files are reloaded
+    by mtime (see prompt_registry.py).
 
     Args:
         agent_id: The agent identifier (e.g., "1A_Positive")
@@ -47,56 +103,989 @@ def load_prompt(agent_id: str) -> Optional[str]:
     if not metadata or not metadata["prompt_file"]:
         return None
 
-    prompt_path = PROMPTS_DIR / metadata["prompt_file"]
-
-    if not prompt_path.exists():
-        print(f"Warning: Prompt file not found: {prompt_path}")
+    entry = get_prompt_registry().get_entry(metadata["prompt_file"])
+    if not entry:
+        print(f"Warning: Prompt file not found: {PROMPTS_DIR / metadata['prompt_file']}")
         return None
 
-    try:
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            return f.read().strip()
-    except Exception as e:
-        print(f"Error loading prompt for {agent_id}: {e}")
-        return None
+    return entry["text"]
 
 
 # ============================================================================
 # LLM API CLIENT
 # ============================================================================
 
+# Assistant prefill to enforce JSON start
+ASSISTANT_PREFILL = "{"
+
+# User turn for the prompt-cache layout (the content lives in the system blocks)
+CACHED_LAYOUT_USER_MESSAGE = "Evaluate and score the content piece above based on the 1-4 scale."
+
+# Top-level response fields surfaced early when streaming
+STREAMED_FIELDS = ("score",)
+
+# Request layouts (part of the result cache key)
+LAYOUT_STANDARD = "standard"
+LAYOUT_PROMPT_CACHE = "prompt_cache"
+LAYOUT_GROUPED = "grouped"
+
+# System preamble for grouped mode (one call scores all agents of a parameter)
+GROUPED_SYSTEM_PREAMBLE = """You are running several specialized content evaluations for monday.com in a single pass. Each evaluator's complete instructions are given below inside <evaluator id="..."> tags.
+
+Apply each evaluator's criteria, rubric and examples independently, exactly as if the other evaluators did not exist. Do not let one evaluator's findings influence another evaluator's score."""
+
+
+def extract_usage(response) -> Optional[Dict[str, int]]:
+    """
+    Extract token usage (including prompt-cache counters) from a response.
+
+    Args:
+        response: anthropic.types.Message
+
+    Returns:
+        Dict of token counts, or None if the response carries no usage
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {
+        "input_tokens": usage.input_tokens or 0,
+        "output_tokens": usage.output_tokens or 0,
+        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+    }
+
+
+def estimate_cost(model: str, usage: Optional[Dict[str, int]]) -> Optional[float]:
+    """
+    Cost of one call in USD from its token usage and MODEL_PRICING.
+
+    Args:
+        model: Model that served the call
+        usage: Token counts from extract_usage
+
+    Returns:
+        Cost in USD, or None if the usage or the model's pricing is unknown
+        (fake backend responses name a "fake:" model and cost nothing)
+    """
+    pricing = MODEL_PRICING.get(model)
+    if usage is None or pricing is None:
+        return None
+    cost = (
+        usage["input_tokens"] * pricing["input"]
+        + usage["output_tokens"] * pricing["output"]
+        + usage["cache_creation_input_tokens"] * pricing["cache_write"]
+        + usage["cache_read_input_tokens"] * pricing["cache_read"]
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+def attach_call_stats(
+    result: Dict,
+    response: Optional[anthropic.types.Message],
+    stats: Dict,
+    model: str = MODEL_NAME,
+) -> Dict:
+    """
+    Record per-call accounting on an agent result.
+
+    Adds token usage, stop reason, cost, wall-clock latency (including
+    rate-limit waits and retries), limiter wait and retry count.
+
+    Args:
+        result: Agent result to annotate (modified in place)
+        response: The API response, or None if the call failed
+        stats: Timing and retry counters from _send / _send_async
+        model: Model the call was made with (used when there is no response)
+
+    Returns:
+        The same result dict
+    """
+    stats = dict(stats)
+    extra_usage = stats.pop("extra_usage", None)
+    usage = extract_usage(response) if response is not None else None
+    if extra_usage:
+        usage = {
+            field: (usage or {}).get(field, 0) + count for field, count in extra_usage.items()
+        }
+    result["model"] = getattr(response, "model", None) or model
+    result["usage"] = usage
+    result["stop_reason"] = getattr(response, "stop_reason", None)
+    result["cost_usd"] = estimate_cost(result["model"], usage)
+    result.update(stats)
+    return result
+
+
+# Error for calls refused while the circuit breaker is open (result has circuit_open=True)
+CIRCUIT_OPEN_ERROR = "Circuit open: API calls paused after sustained failures"
+
+# Error for calls that found every API key in the pool ejected
+ALL_KEYS_EJECTED_ERROR = "No API key available: every key in the pool is ejected (auth or quota errors)"
+
+# Call stats set on a result whose request was hedged
+HEDGE_FIELDS = ("hedged", "hedge_won")
+
+
+def merge_call_stats(
+    first: Dict, second: Dict, truncated: anthropic.types.Message
+) -> Dict:
+    """
+    Combine the call stats of a truncated call and its re-issue.
+
+    The truncated call's tokens were billed too, so its usage is carried
+    along as extra_usage and added in by attach_call_stats.
+    """
+    return {
+        "latency_s": round(first["latency_s"] + second["latency_s"], 3),
+        "queue_wait_s": round(first["queue_wait_s"] + second["queue_wait_s"], 3),
+        "retries": first["retries"] + second["retries"],
+        "reissued": True,
+        "extra_usage": extract_usage(truncated),
+        **{field: first[field] for field in HEDGE_FIELDS if field in first},
+    }
+
 
 class LLMClient:
     """
-    Synchronous client for Claude API with retry logic and JSON enforcement.
+    Client for Claude API with retry logic and JSON enforcement.
+    Exposes a synchronous call_agent and an asyncio call_agent_async.
+
+    Use get_llm_client() rather than constructing one per document: the
+    underlying HTTP pools are meant to live for the whole process. Requests
+    go through a Backend (see backends.py), so the same retry, limiter and
+    parsing path runs against the Claude API or the offline fake.
     """
 
-    def __init__(self):
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "ANTHROPIC_API_KEY not found in environment variables. "
-                "Please create a .env file with your API key."
-            )
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(self, backend: Optional[Backend] = None):
+        """
+        Args:
+            backend: Transport for API calls (defaults to LLM_BACKEND from
+                config, over every configured API key; see key_pool.py)
+        """
+        self.use_keys(single_key_pool(backend) if backend else get_key_pool())
+        self.retry_policy = RetryPolicy()
+        if self.backend.isolated:
+            # Fake responses must not leak into the persistent calibration,
+            # output history or result cache
+            self.token_counter = TokenCounter(path=None)
+            self.output_budget = OutputBudget(path=":memory:")
+            self.latency_history = LatencyHistory(path=":memory:")
+            self.breaker = CircuitBreaker()
+        else:
+            self.token_counter = get_token_counter()
+            self.output_budget = get_output_budget()
+            self.latency_history = get_latency_history()
+            self.breaker = get_circuit_breaker()
+
+        # Hedge cap bookkeeping (see _hedged_call)
+        self.hedgeable_calls = 0
+        self.hedges_sent = 0
+
+    def use_keys(self, keys: KeyPool) -> None:
+        """
+        Send calls through the given key pool.
+
+        backend and limiter stay bound to the pool's primary key: they serve
+        count_tokens, output-token estimates and the pre-flight budget.
+        """
+        self.keys = keys
+        self.backend = keys.primary.backend
+        self.limiter = keys.primary.limiter
+
+    def _cache_model(self, model: str) -> str:
+        """Model name used in result cache keys (prefixed for isolated backends)."""
+        if self.backend.isolated:
+            return f"{self.backend.name}:{model}"
+        return model
 
     def call_agent(
-        self, agent_id: str, content: str, retry_count: int = 0
+        self, agent_id: str, content: str, cache_mode: str = CACHE_MODE_USE
     ) -> Dict:
         """
-        Make a synchronous API call for a single agent with retry logic.
+        Score the content with a single agent, consulting the result cache first.
 
         Args:
             agent_id: The agent identifier
             content: The draft content to analyze
-            retry_count: Current retry attempt (for exponential backoff)
+            cache_mode: One of result_cache.CACHE_MODES
 
         Returns:
             Dict with parsed result or error information
         """
+        cache_key, cached = self._check_cache(agent_id, content, cache_mode)
+        if cached:
+            return cached
+
+        result = self._call_api(agent_id, content)
+        result["prompt_version"] = get_prompt_registry().get_version(agent_id)
+        self._store_cache(cache_key, agent_id, result)
+        self._mark_cache_miss(result, cache_key, cache_mode)
+        return result
+
+    async def call_agent_async(
+        self,
+        agent_id: str,
+        content: str,
+        cache_mode: str = CACHE_MODE_USE,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+        hedge: bool = HEDGE_REQUESTS,
+        model: str = MODEL_NAME,
+    ) -> Dict:
+        """
+        Asyncio counterpart of call_agent.
+
+        Args:
+            agent_id: The agent identifier
+            content: The draft content to analyze
+            cache_mode: One of result_cache.CACHE_MODES
+            on_field: If given, stream the response and call on_field(key, value)
+                as soon as "score" (and other STREAMED_FIELDS) are emitted
+            hedge: Send a duplicate request if the call outlives the agent's p95 latency
+            model: Model to score with (the cascade's first tier uses CASCADE_MODEL)
+
+        Returns:
+            Dict with parsed result or error information
+        """
+        cache_key, cached = self._check_cache(agent_id, content, cache_mode, model=model)
+        if cached:
+            return cached
+
+        result = await self._call_api_async(agent_id, content, on_field, hedge, model)
+        result["prompt_version"] = get_prompt_registry().get_version(agent_id)
+        self._store_cache(cache_key, agent_id, result, model)
+        self._mark_cache_miss(result, cache_key, cache_mode)
+        return result
+
+    def _check_cache(
+        self,
+        agent_id: str,
+        content: str,
+        cache_mode: str,
+        layout: Optional[str] = None,
+        model: str = MODEL_NAME,
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Compute the cache key for a call and look it up if reads are enabled.
+
+        Args:
+            agent_id: The agent identifier
+            content: The draft content to analyze
+            cache_mode: One of result_cache.CACHE_MODES
+            layout: Request layout (defaults to the configured single-agent layout)
+            model: Model the call would be made with
+
+        Returns:
+            Tuple of (cache_key or None when caching is off, cached result or None)
+        """
+        if cache_mode == CACHE_MODE_OFF:
+            return None, None
+
+        prompt_entry = get_prompt_registry().get_agent_prompt(agent_id)
+        if not prompt_entry:
+            return None, None
+
+        if layout is None:
+            # Keyed on what the agent is sent, so edits outside a narrow
+            # agent's view still hit the cache
+            content = agent_input(agent_id, content)
+        cache_key = make_cache_key(
+            content,
+            prompt_entry["sha256"],
+            self._cache_model(model),
+            TEMPERATURE,
+            MAX_TOKENS,
+            layout=layout or (LAYOUT_PROMPT_CACHE if PROMPT_CACHE_LAYOUT else LAYOUT_STANDARD),
+        )
+        if cache_mode == CACHE_MODE_USE:
+            return cache_key, get_result_cache().get(cache_key)
+        return cache_key, None
+
+    def _store_cache(
+        self, cache_key: Optional[str], agent_id: str, result: Dict, model: str = MODEL_NAME
+    ) -> None:
+        """Write a fresh successful result to the result cache."""
+        if cache_key and result.get("success"):
+            get_result_cache().put(cache_key, agent_id, self._cache_model(model), result)
+
+    def _mark_cache_miss(self, result: Dict, cache_key: Optional[str], cache_mode: str) -> None:
+        """Mark a fresh result as a cache miss if the cache was looked up for it."""
+        if cache_key and cache_mode == CACHE_MODE_USE:
+            result["cache"] = CACHE_MISS
+
+    async def call_group_async(
+        self,
+        parameter_id: str,
+        agent_ids: List[str],
+        content: str,
+        cache_mode: str = CACHE_MODE_USE,
+    ) -> List[Dict]:
+        """
+        Score all sub-parameters of one parameter in a single API call.
+
+        The response holds one JSON object per agent and is split back into
+        per-agent results with the same shape call_agent returns.
+
+        Args:
+            parameter_id: Parameter identifier (e.g., "P1_Challenger_Tone")
+            agent_ids: LLM agents belonging to the parameter
+            content: The draft content to analyze
+            cache_mode: One of result_cache.CACHE_MODES
+
+        Returns:
+            List of agent results, ordered like agent_ids
+        """
+        cache_keys = {}
+        cached_results = {}
+        for agent_id in agent_ids:
+            cache_key, cached = self._check_cache(
+                agent_id, content, cache_mode, layout=LAYOUT_GROUPED
+            )
+            cache_keys[agent_id] = cache_key
+            if cached:
+                cached_results[agent_id] = cached
+
+        if len(cached_results) == len(agent_ids):
+            return [cached_results[agent_id] for agent_id in agent_ids]
+
+        request, error_result = self._prepare_group_request(parameter_id, agent_ids, content)
+        if error_result:
+            return [dict(error_result, agent_id=agent_id) for agent_id in agent_ids]
+
+        output_tokens = self._output_reservation([parameter_id], request)
+        response, error, stats = await self._send_async(
+            parameter_id,
+            request,
+            output_tokens=output_tokens or self.limiter.reserve_output_tokens() * len(agent_ids),
+        )
+        reissue = self._reissue_request(
+            parameter_id, request, response, ceiling=MAX_TOKENS * len(agent_ids)
+        )
+        if reissue:
+            truncated = response
+            response, error, more = await self._send_async(
+                parameter_id, reissue, output_tokens=reissue["max_tokens"]
+            )
+            stats = merge_call_stats(stats, more, truncated)
+        # The call is accounted as a unit: every agent of the group shares
+        # one group_call record (see scorer.call_records)
+        group_call = attach_call_stats(
+            {"group": parameter_id, "agent_ids": list(agent_ids)}, response, stats
+        )
+        if error:
+            failed = [
+                {"agent_id": agent_id, "success": False, "error": error, "group_call": group_call}
+                for agent_id in agent_ids
+            ]
+            for result in failed:
+                self._mark_cache_miss(result, cache_keys[result["agent_id"]], cache_mode)
+            return failed
+
+        self._record_output(parameter_id, request["model"], response)
+
+        results = self._parse_group_response(agent_ids, response, ASSISTANT_PREFILL)
+        for result in results:
+            result["grouped"] = True
+            result["group"] = parameter_id
+            result["model"] = response.model
+            result["prompt_version"] = get_prompt_registry().get_version(result["agent_id"])
+            self._store_cache(cache_keys[result["agent_id"]], result["agent_id"], result)
+            self._mark_cache_miss(result, cache_keys[result["agent_id"]], cache_mode)
+            result["group_call"] = group_call
+        return results
+
+    def _call_api(self, agent_id: str, content: str) -> Dict:
+        """
+        Make a synchronous API call for a single agent.
+
+        Args:
+            agent_id: The agent identifier
+            content: The draft content to analyze
+
+        Returns:
+            Dict with parsed result or error information
+        """
+        request, error_result = self._prepare_request(agent_id, content)
+        if error_result:
+            return error_result
+
+        response, error, stats = self._send(
+            agent_id, request, output_tokens=self._output_reservation([agent_id], request)
+        )
+        reissue = self._reissue_request(agent_id, request, response)
+        if reissue:
+            truncated = response
+            response, error, more = self._send(
+                agent_id, reissue, output_tokens=reissue["max_tokens"]
+            )
+            stats = merge_call_stats(stats, more, truncated)
+        if error:
+            return attach_call_stats(
+                {"agent_id": agent_id, "success": False, "error": error}, None, stats
+            )
+
+        self._record_output(agent_id, request["model"], response)
+
+        # Parse response
+        result = self._parse_response(agent_id, response, ASSISTANT_PREFILL)
+        return attach_call_stats(result, response, stats)
+
+    async def _call_api_async(
+        self,
+        agent_id: str,
+        content: str,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+        hedge: bool = HEDGE_REQUESTS,
+        model: str = MODEL_NAME,
+    ) -> Dict:
+        """
+        Make an asyncio API call for a single agent.
+
+        Mirrors _call_api, but awaits the request and any backoff so that
+        many agents can be in flight on one event loop.
+
+        Args:
+            agent_id: The agent identifier
+            content: The draft content to analyze
+            on_field: Optional streaming callback (see call_agent_async)
+            hedge: Hedge the call at the agent's p95 latency (see _hedged_call)
+            model: Model to score with
+
+        Returns:
+            Dict with parsed result or error information
+        """
+        request, error_result = self._prepare_request(agent_id, content, model)
+        if error_result:
+            return error_result
+
+        response, error, stats = await self._send_async(
+            agent_id,
+            request,
+            output_tokens=self._output_reservation([agent_id], request),
+            on_field=on_field,
+            hedge=hedge,
+        )
+        reissue = self._reissue_request(agent_id, request, response)
+        if reissue:
+            truncated = response
+            response, error, more = await self._send_async(
+                agent_id, reissue, output_tokens=reissue["max_tokens"], on_field=on_field
+            )
+            stats = merge_call_stats(stats, more, truncated)
+        if error:
+            return attach_call_stats(
+                {"agent_id": agent_id, "success": False, "error": error}, None, stats, model
+            )
+
+        self._record_output(agent_id, model, response)
+
+        result = self._parse_response(agent_id, response, ASSISTANT_PREFILL)
+        return attach_call_stats(result, response, stats, model)
+
+    def _output_reservation(self, agent_ids: List[str], request: Dict) -> Optional[int]:
+        """
+        OTPM reservation for a call: its max_tokens once every agent's budget
+        is learned, otherwise None (the limiter's running estimate is used).
+        """
+        model = request["model"]
+        if all(self.output_budget.is_learned(agent_id, model) for agent_id in agent_ids):
+            return request["max_tokens"]
+        return None
+
+    def _reissue_request(
+        self,
+        label: str,
+        request: Dict,
+        response: Optional[anthropic.types.Message],
+        ceiling: int = MAX_TOKENS,
+    ) -> Optional[Dict]:
+        """
+        Return a copy of a request with max_tokens raised to the ceiling if its
+        response was cut off at a learned budget.
+
+        Args:
+            label: Agent or group identifier (for logging)
+            request: The request that was sent
+            response: Its response (None if the call failed)
+            ceiling: Output limit to re-issue with (MAX_TOKENS per agent)
+
+        Returns:
+            The request to re-issue, or None if the response is complete
+        """
+        if response is None or response.stop_reason != "max_tokens":
+            return None
+        if request["max_tokens"] >= ceiling:
+            return None
+        print(
+            f"  ↻ {label} stopped at max_tokens={request['max_tokens']}; "
+            f"re-issuing with {ceiling}"
+        )
+        return dict(request, max_tokens=ceiling)
+
+    def _record_output(
+        self, agent_id: str, model: str, response: anthropic.types.Message
+    ) -> None:
+        """
+        Add a complete response's output size to the agent's history for a
+        model (a grouped call's to its parameter's history).
+        """
+        usage = extract_usage(response)
+        if usage and response.stop_reason != "max_tokens":
+            self.output_budget.record(agent_id, model, usage["output_tokens"])
+
+    def _send(
+        self,
+        label: str,
+        request: Dict,
+        output_tokens: Optional[int] = None,
+    ) -> Tuple[Optional[anthropic.types.Message], Optional[str], Dict]:
+        """
+        Send one prepared request through the rate limiter, retrying per the retry policy.
+
+        Retries are not slept here: each one is handed back to the limiter
+        with a not_before time (or, for 429 / 529, a limiter-wide pause), so
+        backoff and rate-limit pacing are a single queue.
+
+        Args:
+            label: Agent or group identifier (for logging)
+            request: messages.create keyword arguments
+            output_tokens: Output tokens to reserve (defaults to the limiter's estimate)
+
+        Returns:
+            Tuple of (response, error message, call stats). Exactly one of
+            response and error is None; call stats hold latency_s,
+            queue_wait_s and retries.
+        """
+        # Exact pre-flight count if one was recorded, else the calibrated estimate
+        input_tokens = self.token_counter.count(request)
+        if output_tokens is None:
+            output_tokens = self.limiter.reserve_output_tokens()
+
+        attempt = 0
+        delay = 0.0
+        not_before = None
+        started = time.monotonic()
+        waited = 0.0
+        key: Optional[ApiKey] = None
+
+        def stats() -> Dict:
+            return {
+                "latency_s": round(time.monotonic() - started, 3),
+                "queue_wait_s": round(waited, 3),
+                "retries": attempt,
+                **self._key_stats(key),
+            }
+
+        while True:
+            # Fail fast (before taking rate-limit budget) while the API is down
+            if not self.breaker.admit_blocking():
+                return None, CIRCUIT_OPEN_ERROR, dict(stats(), circuit_open=True)
+
+            # Wait for rate-limit budget (RPM / ITPM / OTPM) on the key with
+            # the most headroom, and for any scheduled backoff
+            key, key_waited = self.keys.acquire_blocking(input_tokens, output_tokens, not_before)
+            waited += key_waited
+            if key is None:
+                return None, ALL_KEYS_EJECTED_ERROR, stats()
+
+            try:
+                # Make API call (synchronous)
+                headers, response = key.backend.create(request)
+                response = self._record_usage(
+                    key, headers, response, request, input_tokens, output_tokens
+                )
+                self.breaker.record_success()
+                return response, None, stats()
+
+            except anthropic.APIError as e:
+                if self._record_failure(key, e, output_tokens):
+                    continue
+                delay, not_before, error = self._schedule_retry(key, label, e, attempt, delay)
+                if error:
+                    return None, error, stats()
+                attempt += 1
+
+            except Exception as e:
+                self.breaker.record_failure(None)
+                return None, f"Unexpected error: {str(e)}", stats()
+
+    async def _send_async(
+        self,
+        label: str,
+        request: Dict,
+        output_tokens: Optional[int] = None,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+        hedge: bool = False,
+    ) -> Tuple[Optional[anthropic.types.Message], Optional[str], Dict]:
+        """
+        Asyncio counterpart of _send.
+
+        When on_field is given the response is streamed, and on_field is
+        called with each STREAMED_FIELDS value as soon as it is complete.
+        A retried stream starts over with a fresh parser. With hedge, each
+        attempt goes through _hedged_call and the call stats record whether
+        a hedge was sent and whether it answered first.
+        """
+        # Exact pre-flight count if one was recorded, else the calibrated estimate
+        input_tokens = self.token_counter.count(request)
+        if output_tokens is None:
+            output_tokens = self.limiter.reserve_output_tokens()
+
+        attempt = 0
+        delay = 0.0
+        not_before = None
+        started = time.monotonic()
+        waited = 0.0
+        hedge_stats: Dict = {}
+        key: Optional[ApiKey] = None
+
+        def stats() -> Dict:
+            return {
+                "latency_s": round(time.monotonic() - started, 3),
+                "queue_wait_s": round(waited, 3),
+                "retries": attempt,
+                **hedge_stats,
+                **self._key_stats(key),
+            }
+
+        while True:
+            if not await self.breaker.admit():
+                return None, CIRCUIT_OPEN_ERROR, dict(stats(), circuit_open=True)
+
+            key, key_waited = await self.keys.acquire(input_tokens, output_tokens, not_before)
+            waited += key_waited
+            if key is None:
+                return None, ALL_KEYS_EJECTED_ERROR, stats()
+
+            try:
+                if hedge:
+                    # Settles every request it sends on the key that served it
+                    headers, response, key = await self._hedged_call(
+                        key, label, request, on_field, input_tokens, output_tokens, hedge_stats
+                    )
+                else:
+                    headers, response = await self._backend_call(key, request, on_field)
+                    response = self._record_usage(
+                        key, headers, response, request, input_tokens, output_tokens
+                    )
+                self.breaker.record_success()
+                return response, None, stats()
+
+            except anthropic.APIError as e:
+                if self._record_failure(key, e, output_tokens):
+                    continue
+                delay, not_before, error = self._schedule_retry(key, label, e, attempt, delay)
+                if error:
+                    return None, error, stats()
+                attempt += 1
+
+            except Exception as e:
+                self.breaker.record_failure(None)
+                return None, f"Unexpected error: {str(e)}", stats()
+
+    async def _backend_call(
+        self, key: ApiKey, request: Dict, on_field: Optional[Callable[[str, Any], None]]
+    ) -> Tuple[Any, anthropic.types.Message]:
+        """One request with the given key, streamed when on_field is given."""
+        if on_field is not None:
+            return await self._stream_async(key, request, on_field)
+        return await key.backend.create_async(request)
+
+    def _key_stats(self, key: Optional[ApiKey]) -> Dict:
+        """Call stat naming the key that served the call (only with several keys)."""
+        if key is None or len(self.keys) == 1:
+            return {}
+        return {"api_key": key.label}
+
+    async def _hedged_call(
+        self,
+        key: ApiKey,
+        label: str,
+        request: Dict,
+        on_field: Optional[Callable[[str, Any], None]],
+        input_tokens: int,
+        output_tokens: int,
+        hedge_stats: Dict,
+    ) -> Tuple[Any, anthropic.types.Message, ApiKey]:
+        """
+        Send a request, duplicating it if it outlives the agent's p95 latency.
+
+        The duplicate is admitted by the key pool like any other call (so
+        it may go out on another key). Every request is settled on the key
+        that served it: a completed one with its real usage, a cancelled one
+        with the winner's input tokens (it was billed for the same input; its
+        output is unknown and stays reserved). Hedges are capped at
+        HEDGE_MAX_FRACTION of hedgeable calls. If one request fails the
+        other is awaited; a failed hedge is recorded against its own key,
+        and the primary's error is raised only if both fail.
+
+        Args:
+            key: Key the primary request was admitted on
+            label: Agent identifier (keys the latency history)
+            request: messages.create keyword arguments
+            on_field: Optional streaming callback; each field is passed on once
+            input_tokens: Input tokens to reserve for the hedge
+            output_tokens: Output tokens to reserve for the hedge
+            hedge_stats: Updated in place with hedged / hedge_won
+
+        Returns:
+            Tuple of (response headers, message, key it was sent with) from
+            the first request to succeed
+        """
+        model = request["model"]
+        delay = self.latency_history.hedge_delay(label, model)
+        self.hedgeable_calls += 1
+        if on_field is not None:
+            on_field = _first_emission_only(on_field)
+
+        billed: Dict[str, int] = {}
+
+        async def timed(
+            call_key: Optional[ApiKey],
+        ) -> Tuple[Any, anthropic.types.Message, ApiKey]:
+            is_hedge = call_key is None
+            if is_hedge:
+                call_key, _ = await self.keys.acquire(input_tokens, output_tokens)
+                if call_key is None:
+                    raise RuntimeError(ALL_KEYS_EJECTED_ERROR)
+            sent = time.monotonic()
+            try:
+                headers, response = await self._backend_call(call_key, request, on_field)
+            except asyncio.CancelledError:
+                call_key.limiter.settle(input_tokens, billed.get("input"), output_tokens, None)
+                raise
+            except anthropic.APIError as e:
+                if is_hedge:
+                    self._record_failure(call_key, e, output_tokens)
+                raise
+            self.latency_history.record(label, model, time.monotonic() - sent)
+            response = self._record_usage(
+                call_key, headers, response, request, input_tokens, output_tokens
+            )
+            usage = extract_usage(response)
+            if usage:
+                billed["input"] = usage["input_tokens"] + usage["cache_creation_input_tokens"]
+            return headers, response, call_key
+
+        primary = asyncio.ensure_future(timed(key))
+        tasks = [primary]
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+            if delay is None or primary.done() or not self._take_hedge():
+                return await primary
+
+            print(f"  ⑂ {label} unanswered after {delay:.1f}s (p95); sending a hedged request")
+            hedge = asyncio.ensure_future(timed(None))
+            tasks.append(hedge)
+            hedge_stats["hedged"] = True
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    hedge_stats["hedge_won"] = task is hedge
+                    if task is hedge and primary.done() and isinstance(
+                        primary.exception(), anthropic.APIError
+                    ):
+                        # The primary's failure is not retried, but still counts against its key
+                        self._record_failure(key, primary.exception(), output_tokens)
+                    return task.result()
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _take_hedge(self) -> bool:
+        """Claim a hedge if that keeps hedges within HEDGE_MAX_FRACTION of calls."""
+        if self.hedges_sent + 1 > HEDGE_MAX_FRACTION * self.hedgeable_calls:
+            return False
+        self.hedges_sent += 1
+        return True
+
+    async def _stream_async(
+        self, key: ApiKey, request: Dict, on_field: Callable[[str, Any], None]
+    ) -> Tuple[Any, anthropic.types.Message]:
+        """
+        Stream one request, surfacing top-level JSON fields as they complete.
+
+        Args:
+            key: Key to send the request with
+            request: messages.create keyword arguments
+            on_field: Callback receiving (key, value) for each STREAMED_FIELDS value
+
+        Returns:
+            Tuple of (response headers, final message)
+        """
+        parser = IncrementalFieldParser(watch=STREAMED_FIELDS)
+        # Seed the parser with the assistant prefill so the object is complete
+        last_message = request["messages"][-1]
+        if last_message["role"] == "assistant":
+            parser.feed(last_message["content"])
+
+        def on_text(text: str) -> None:
+            for key, value in parser.feed(text).items():
+                on_field(key, value)
+
+        return await key.backend.stream_async(request, on_text)
+
+    def _record_usage(
+        self,
+        key: ApiKey,
+        headers,
+        response: anthropic.types.Message,
+        request: Dict,
+        input_tokens: int,
+        output_tokens: int,
+    ) -> anthropic.types.Message:
+        """
+        Feed an API response back into its key's limiter and usage, and the
+        token counter.
+
+        Args:
+            key: Key the call was sent with
+            headers: HTTP response headers (anthropic-ratelimit-*)
+            response: The parsed message
+            request: The request that produced it (calibrates the token estimate)
+            input_tokens: Input tokens reserved for the call
+            output_tokens: Output tokens reserved for the call
+
+        Returns:
+            The message, unchanged
+        """
+        key.limiter.update_from_headers(headers)
+        usage = extract_usage(response)
+        self.keys.record_usage(key, usage)
+        if usage:
+            self.token_counter.observe(
+                request,
+                usage["input_tokens"]
+                + usage["cache_creation_input_tokens"]
+                + usage["cache_read_input_tokens"],
+            )
+        key.limiter.settle(
+            input_tokens,
+            # Cache reads do not count towards ITPM; cache writes do
+            usage["input_tokens"] + usage["cache_creation_input_tokens"] if usage else None,
+            output_tokens,
+            usage["output_tokens"] if usage else None,
+        )
+        return response
+
+    async def count_input_tokens_async(self, request: Dict) -> int:
+        """
+        Pre-flight input-token count for a prepared request.
+
+        With TOKEN_COUNT_METHOD = "api" the count_tokens endpoint is asked
+        and its exact answer is remembered for the call's reservation;
+        otherwise (or if that call fails) the calibrated estimate is used.
+
+        Args:
+            request: messages.create keyword arguments
+
+        Returns:
+            Input token count
+        """
+        if TOKEN_COUNT_METHOD == TOKEN_COUNT_API:
+            try:
+                input_tokens = await self.backend.count_tokens_async(request)
+                self.token_counter.record_exact(request, input_tokens)
+                return input_tokens
+            except anthropic.APIError as e:
+                print(f"  ⚠️  count_tokens failed ({e}); using the local estimate")
+        return self.token_counter.count(request)
+
+    def _record_failure(self, key: ApiKey, error: anthropic.APIError, output_tokens: int) -> bool:
+        """
+        Sync the key's limiter from an error response, release the output
+        reservation and count the error towards the circuit breaker.
+
+        Returns:
+            True if the key was ejected (auth or quota error) and the call
+            should go straight to another key instead of being retried
+        """
+        self.breaker.record_failure(classify_error(error))
+        response = getattr(error, "response", None)
+        key.limiter.update_from_headers(getattr(response, "headers", None))
+        key.limiter.settle(0, None, output_tokens, 0)
+        return self.keys.record_failure(key, error)
+
+    def _schedule_retry(
+        self,
+        key: ApiKey,
+        label: str,
+        error: anthropic.APIError,
+        attempt: int,
+        previous_delay: float,
+    ) -> Tuple[float, Optional[float], Optional[str]]:
+        """
+        Classify a failed call and schedule its retry with the limiter.
+
+        429 pauses the key's whole limiter (every in-flight agent on that key
+        is hitting the same wall) and 529 pauses every key (the API itself is
+        overloaded); other retryable errors only delay this call.
+
+        Args:
+            key: Key the call was sent with
+            label: Agent or group identifier (for logging)
+            error: The API error
+            attempt: Retries already made for this call
+            previous_delay: Backoff used before the previous retry
+
+        Returns:
+            Tuple of (delay, not_before, error message). The error message is
+            set when the call should not be retried.
+        """
+        error_class = classify_error(error)
+        delay = self.retry_policy.next_delay(
+            error_class, attempt, previous_delay, get_retry_after(error)
+        )
+
+        if delay is None:
+            if error_class in RETRYABLE_ERRORS:
+                return 0.0, None, (
+                    f"API error after {self.retry_policy.max_retries} retries "
+                    f"({error_class}): {str(error)}"
+                )
+            return 0.0, None, f"API error ({error_class}, not retried): {str(error)}"
+
+        deadline = time.monotonic() + delay
+        if error_class == ERROR_OVERLOADED:
+            self.keys.pause_until(deadline)
+            not_before = None
+        elif error_class in GLOBAL_BACKOFF_ERRORS:
+            key.limiter.pause_until(deadline)
+            not_before = None
+        else:
+            not_before = deadline
+
+        print(
+            f"⚠️  {error_class} for {label} "
+            f"(retry {attempt + 1}/{self.retry_policy.max_retries}). "
+            f"Retrying in {delay:.1f}s..."
+        )
+        return delay, not_before, None
+
+    def _prepare_request(
+        self, agent_id: str, content: str, model: str = MODEL_NAME
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Build the messages.create keyword arguments for a single agent.
+
+        Args:
+            agent_id: The agent identifier
+            content: The draft content to analyze (narrowed to the agent's
+                input view here)
+            model: Model to send the request to
+
+        Returns:
+            Tuple of (request_kwargs, error_result). Exactly one is None.
+        """
         metadata = get_agent_metadata(agent_id)
         if not metadata:
-            return {
+            return None, {
                 "agent_id": agent_id,
                 "success": False,
                 "error": "Agent metadata not found",
@@ -105,74 +1094,95 @@ class LLMClient:
         # Load prompt instructions
         prompt_instructions = load_prompt(agent_id)
         if not prompt_instructions:
-            return {
+            return None, {
                 "agent_id": agent_id,
                 "success": False,
                 "error": f"Prompt file not found: {metadata['prompt_file']}",
             }
 
-        # Build system prompt (specialized for this agent)
-        system_prompt = self._build_system_prompt(agent_id, metadata, prompt_instructions)
+        content = agent_input(agent_id, content)
+        if PROMPT_CACHE_LAYOUT:
+            # Shared, cacheable document block first; agent instructions after it
+            system_prompt = self._build_cached_system_blocks(content, prompt_instructions)
+            user_message = CACHED_LAYOUT_USER_MESSAGE
+        else:
+            # Build system prompt (specialized for this agent)
+            system_prompt = self._build_system_prompt(agent_id, metadata, prompt_instructions)
+
+            # Build user message (content to analyze)
+            user_message = self._build_user_message(content, prompt_instructions)
+
+        request = {
+            "model": model,
+            "max_tokens": self.output_budget.budget(agent_id, model),
+            "temperature": TEMPERATURE,
+            "system": system_prompt,
+            "messages": [
+                {"role": "user", "content": user_message},
+                # Assistant prefill to enforce JSON start
+                {"role": "assistant", "content": ASSISTANT_PREFILL},
+            ],
+        }
+        return request, None
+
+    def _prepare_group_request(
+        self, parameter_id: str, agent_ids: List[str], content: str
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Build the messages.create keyword arguments for a grouped call.
 
-        # Build user message (content to analyze)
-        user_message = self._build_user_message(content, prompt_instructions)
+        max_tokens is the group's own learned budget once it has history
+        (recorded under the parameter id), else the sum of its agents' budgets.
 
-        # Assistant prefill to enforce JSON start
-        assistant_prefill = "{"
+        Args:
+            parameter_id: Parameter the agents belong to
+            agent_ids: Agents to score in one call
+            content: The draft content to analyze
 
-        try:
-            # Add delay before API call for rate limiting (sequential execution)
-            time.sleep(DELAY_BETWEEN_AGENT_CALLS)
-
-            # Make API call (synchronous)
-            response = self.client.messages.create(
-                model=MODEL_NAME,
-                max_tokens=MAX_TOKENS,
-                temperature=TEMPERATURE,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_message},
-                    {"role": "assistant", "content": assistant_prefill},
-                ],
+        Returns:
+            Tuple of (request_kwargs, error_result). Exactly one is None.
+        """
+        sections = [GROUPED_SYSTEM_PREAMBLE]
+        for agent_id in agent_ids:
+            prompt_instructions = load_prompt(agent_id)
+            if not prompt_instructions:
+                metadata = get_agent_metadata(agent_id) or {}
+                return None, {
+                    "agent_id": agent_id,
+                    "success": False,
+                    "error": f"Prompt file not found: {metadata.get('prompt_file')}",
+                }
+            sections.append(
+                f'<evaluator id="{agent_id}">\n{prompt_instructions}\n</evaluator>'
             )
 
-            # Parse response
-            return self._parse_response(agent_id, response, assistant_prefill)
+        id_list = ", ".join(agent_ids)
+        user_message = f"""Evaluate and score this content piece based on the 1-4 scale, once for each evaluator.
 
-        except anthropic.APIError as e:
-            # Retry logic
-            if retry_count < MAX_RETRIES:
-                error_str = str(e)
+Return ONE JSON object whose keys are exactly these evaluator ids: {id_list}. Each value must be the JSON object described in that evaluator's output format.
 
-                # Smart backoff: Detect rate limit errors and wait longer
-                if "rate_limit" in error_str.lower():
-                    wait_time = RATE_LIMIT_BACKOFF
-                    print(
-                        f"⚠️  Rate limit hit for {agent_id} (attempt {retry_count + 1}/{MAX_RETRIES}). "
-                        f"Waiting {wait_time}s for rate limit reset..."
-                    )
-                else:
-                    wait_time = RETRY_DELAY * (2**retry_count)  # Exponential backoff
-                    print(
-                        f"API error for {agent_id} (attempt {retry_count + 1}/{MAX_RETRIES}): {e}. "
-                        f"Retrying in {wait_time}s..."
-                    )
+---BEGIN CONTENT---
+{content}
+---END CONTENT---"""
 
-                time.sleep(wait_time)
-                return self.call_agent(agent_id, content, retry_count + 1)
-            else:
-                return {
-                    "agent_id": agent_id,
-                    "success": False,
-                    "error": f"API error after {MAX_RETRIES} retries: {str(e)}",
-                }
+        if self.output_budget.is_learned(parameter_id, MODEL_NAME):
+            max_tokens = self.output_budget.budget(parameter_id, MODEL_NAME)
+        else:
+            max_tokens = sum(
+                self.output_budget.budget(agent_id, MODEL_NAME) for agent_id in agent_ids
+            )
 
-        except Exception as e:
-            return {
-                "agent_id": agent_id,
-                "success": False,
-                "error": f"Unexpected error: {str(e)}",
-            }
+        request = {
+            "model": MODEL_NAME,
+            "max_tokens": max_tokens,
+            "temperature": TEMPERATURE,
+            "system": "\n\n".join(sections),
+            "messages": [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": ASSISTANT_PREFILL},
+            ],
+        }
+        return request, None
 
     def _build_system_prompt(
         self, agent_id: str, metadata: Dict, instructions: str
@@ -213,6 +1223,35 @@ class LLMClient:
 {content}
 ---END CONTENT---"""
 
+    def _build_cached_system_blocks(self, content: str, instructions: str) -> List[Dict]:
+        """
+        Build system blocks for the prompt-cache-friendly layout.
+
+        The first block holds only the draft and is identical for every agent,
+        so it is marked with cache_control and billed in full once per
+        document; the other agents read it from the cache. The agent-specific
+        prompt file follows as a second, uncached block.
+
+        Args:
+            content: Draft content to evaluate
+            instructions: Complete prompt content from file
+
+        Returns:
+            List of system content blocks
+        """
+        return [
+            {
+                "type": "text",
+                "text": f"""You will evaluate the content piece below. Your evaluation role, criteria and output format follow after it.
+
+---BEGIN CONTENT---
+{content}
+---END CONTENT---""",
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": instructions},
+        ]
+
     def _parse_response(
         self, agent_id: str, response: anthropic.types.Message, prefill: str
     ) -> Dict:
@@ -241,112 +1280,727 @@ class LLMClient:
             # Reconstruct full JSON (prepend the prefill)
             full_json = prefill + response_text
 
-            # Parse JSON
-            parsed = json.loads(full_json)
-
-            # Validate structure
-            required_keys = {"score", "feedback", "flags"}
-            optional_keys = {"thinking"}  # Chain-of-thought reasoning (optional)
-            if not required_keys.issubset(parsed.keys()):
-                missing = required_keys - set(parsed.keys())
+            # Parse JSON, repairing common defects before giving up
+            parsed, repairs = extract_json_object(full_json)
+            if not isinstance(parsed, dict):
                 return {
                     "agent_id": agent_id,
                     "success": False,
-                    "error": f"Missing required keys: {missing}",
+                    "error": "JSON parsing error (unrecoverable)",
                     "raw_response": full_json,
                 }
 
-            # Validate score is 1-4
-            if not isinstance(parsed["score"], int) or not (1 <= parsed["score"] <= 4):
-                return {
+            return self._validate_parsed(agent_id, parsed, full_json, repairs)
+
+        except Exception as e:
+            return {
+                "agent_id": agent_id,
+                "success": False,
+                "error": f"Response parsing error: {str(e)}",
+            }
+
+    def _parse_group_response(
+        self, agent_ids: List[str], response: anthropic.types.Message, prefill: str
+    ) -> List[Dict]:
+        """
+        Split a grouped response into per-agent results.
+
+        Args:
+            agent_ids: Agents scored by the grouped call
+            response: API response object
+            prefill: The assistant prefill used (to reconstruct full JSON)
+
+        Returns:
+            List of per-agent result dictionaries, ordered like agent_ids
+        """
+        if not response.content:
+            return [
+                {"agent_id": agent_id, "success": False, "error": "Empty response from API"}
+                for agent_id in agent_ids
+            ]
+
+        full_json = prefill + response.content[0].text
+        parsed, repairs = extract_json_object(full_json)
+        if not isinstance(parsed, dict):
+            return [
+                {
                     "agent_id": agent_id,
                     "success": False,
-                    "error": f"Invalid score: {parsed.get('score')}. Must be integer 1-4.",
+                    "error": "JSON parsing error (unrecoverable)",
                     "raw_response": full_json,
                 }
+                for agent_id in agent_ids
+            ]
+
+        results = []
+        for agent_id in agent_ids:
+            agent_output = parsed.get(agent_id)
+            if not isinstance(agent_output, dict):
+                results.append(
+                    {
+                        "agent_id": agent_id,
+                        "success": False,
+                        "error": "Missing result for this agent in grouped response",
+                    }
+                )
+                continue
+            results.append(
+                self._validate_parsed(
+                    agent_id, agent_output, json.dumps(agent_output), list(repairs)
+                )
+            )
+        return results
+
+    def _validate_parsed(
+        self,
+        agent_id: str,
+        parsed: Dict,
+        raw: str,
+        repairs: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Validate a parsed agent JSON object and build the result dictionary.
 
-            # Success!
-            result = {
-                "agent_id": agent_id,
-                "success": True,
-                "score": parsed["score"],
-                "feedback": parsed["feedback"],
-                "flags": parsed.get("flags", []),
-            }
-
-            # Include optional thinking field if present
-            if "thinking" in parsed:
-                result["thinking"] = parsed["thinking"]
+        Scores given as floats or strings ("3", "3/4") are coerced to the
+        1-4 integer scale, and flags lost to truncation default to an empty
+        list, so a usable answer is not thrown away (and re-bought) over a
+        formatting slip. Anything applied is listed in result["repairs"].
 
-            return result
+        Args:
+            agent_id: Agent identifier
+            parsed: Decoded JSON object
+            raw: Raw JSON text (kept on validation failures for debugging)
+            repairs: Repairs already applied while extracting the JSON
 
-        except json.JSONDecodeError as e:
+        Returns:
+            Result dictionary
+        """
+        repairs = list(repairs or [])
+
+        # flags is the last key in the output format, so it is what truncation loses
+        if "flags" not in parsed or not isinstance(parsed["flags"], list):
+            if "score" in parsed and "feedback" in parsed:
+                parsed["flags"] = []
+                repairs.append(REPAIR_FLAGS_DEFAULTED)
+
+        # Validate structure
+        required_keys = {"score", "feedback", "flags"}
+        if not required_keys.issubset(parsed.keys()):
+            missing = required_keys - set(parsed.keys())
             return {
                 "agent_id": agent_id,
                 "success": False,
-                "error": f"JSON parsing error: {str(e)}",
-                "raw_response": prefill + response.content[0].text if response.content else "",
+                "error": f"Missing required keys: {missing}",
+                "raw_response": raw,
             }
-        except Exception as e:
+
+        # Validate score is 1-4
+        score, coerced = coerce_score(parsed["score"])
+        if score is None:
             return {
                 "agent_id": agent_id,
                 "success": False,
-                "error": f"Response parsing error: {str(e)}",
+                "error": f"Invalid score: {parsed.get('score')}. Must be integer 1-4.",
+                "raw_response": raw,
             }
+        if coerced:
+            repairs.append(REPAIR_SCORE_COERCED)
+
+        # Success!
+        result = {
+            "agent_id": agent_id,
+            "success": True,
+            "score": score,
+            "feedback": parsed["feedback"],
+            "flags": parsed.get("flags", []),
+        }
+
+        # Include optional thinking field if present
+        if "thinking" in parsed:
+            result["thinking"] = parsed["thinking"]
+
+        if repairs:
+            result["repairs"] = repairs
+
+        return result
+
+
+# ============================================================================
+# SHARED CLIENT AND EVENT LOOP
+# ============================================================================
+
+_shared_client: Optional[LLMClient] = None
+_shared_client_lock = threading.Lock()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLM client, creating it on first use."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = LLMClient()
+        return _shared_client
+
+
+def set_llm_backend(backend: Backend) -> LLMClient:
+    """
+    Replace the process-wide client with one using the given backend.
+
+    Used by the bench command to swap in a configured FakeBackend.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        _shared_client = LLMClient(backend)
+        return _shared_client
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the persistent event loop, starting its thread on first use.
+
+    An httpx AsyncClient's pooled connections belong to the loop they were
+    opened on, so asyncio.run() per document would throw them away (or break
+    them). All Layer 2 coroutines run on this one daemon-thread loop instead.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="llm-client-loop", daemon=True
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_on_client_loop(coro):
+    """
+    Run a coroutine on the shared event loop and block until it finishes.
+
+    Args:
+        coro: Coroutine to run (typically one document's agent fan-out)
+
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_event_loop())
+    try:
+        return future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        raise
 
 
 # ============================================================================
-# SEQUENTIAL EXECUTION ORCHESTRATION
+# CONCURRENT EXECUTION ORCHESTRATION
 # ============================================================================
 
 
-def run_all_agents_sequential(content: str) -> Dict[str, Dict]:
+def _first_emission_only(on_field: Callable[[str, Any], None]) -> Callable[[str, Any], None]:
+    """Wrap a streaming callback so each field is passed on once across hedged requests."""
+    emitted = set()
+
+    def wrapper(key: str, value: Any) -> None:
+        if key not in emitted:
+            emitted.add(key)
+            on_field(key, value)
+
+    return wrapper
+
+
+def _print_result(result: Dict) -> None:
+    """Print a one-line completion status for an agent result."""
+    agent_id = result["agent_id"]
+    if result.get("cached"):
+        print(f"  ✓ {agent_id} Score: {result['score']} (cached)")
+    elif result["success"]:
+        notes = []
+        if result.get("repairs"):
+            notes.append(f"repaired: {', '.join(result['repairs'])}")
+        if result.get("hedged"):
+            notes.append("hedge answered first" if result.get("hedge_won") else "hedged")
+        suffix = f" ({'; '.join(notes)})" if notes else ""
+        print(f"  ✓ {agent_id} Score: {result['score']}{suffix}")
+    else:
+        print(f"  ✗ {agent_id} Error: {result.get('error', 'Unknown')[:50]}...")
+
+
+def _print_provisional_gates(early_scores: Dict[str, int], announced: set) -> None:
     """
-    Execute all 16 LLM agents sequentially with smart rate limiting.
+    Print Gate 2 / LLM Gate 3 status as soon as streamed scores decide them.
 
     Args:
+        early_scores: Scores surfaced so far, by agent_id
+        announced: Gates already printed (updated in place)
+    """
+    tone_agents = get_parameter_agents("P1_Challenger_Tone")
+    if "gate_2" not in announced and all(a in early_scores for a in tone_agents):
+        announced.add("gate_2")
+        tone = calculate_parameter_score(
+            "P1_Challenger_Tone",
+            {a: {"success": True, "score": early_scores[a], "feedback": ""} for a in tone_agents},
+        )["parameter_score"]
+        status = "✓ PASS" if tone >= GATE_2_TONE_MINIMUM else "✗ FAIL"
+        print(f"  ⏱ Provisional Gate 2 (Tone Minimum): {status} (P1 = {tone:.2f})")
+
+    for agent_id in ("2B_Contextual", "2C_Persona"):
+        if "gate_3" not in announced and early_scores.get(agent_id) == 1:
+            announced.add("gate_3")
+            print(f"  ⏱ Provisional Gate 3 (Brand Compliance): ✗ FAIL ({agent_id} scored 1)")
+
+
+async def _run_agents_concurrent(
+    client: LLMClient,
+    agent_ids: List[str],
+    content: str,
+    max_concurrency: int,
+    cache_mode: str = CACHE_MODE_USE,
+    stream: bool = False,
+    hedge: bool = HEDGE_REQUESTS,
+    model: str = MODEL_NAME,
+    on_result: Optional[Callable[[Dict], None]] = None,
+) -> List[Dict]:
+    """
+    Fan out all agent calls on the current event loop.
+
+    At most max_concurrency calls are in flight at once. Results are returned
+    in the same order as agent_ids, regardless of completion order.
+
+    Args:
+        client: Client used for every agent call
+        agent_ids: Agents to execute
         content: The draft content to analyze
+        max_concurrency: Maximum number of in-flight API calls
+        cache_mode: One of result_cache.CACHE_MODES
+        stream: Stream responses and surface each score as soon as it is emitted
+        hedge: Hedge calls that outlive their agent's p95 latency
+        model: Model every agent is scored with
+        on_result: Called with each result as soon as its agent completes
 
     Returns:
-        Dictionary mapping agent_id to result
+        List of agent results, ordered like agent_ids
     """
-    client = LLMClient()
-    agent_ids = get_llm_agents()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    total = len(agent_ids)
+    early_scores: Dict[str, int] = {}
+    announced: set = set()
+
+    async def run_one(index: int, agent_id: str) -> Dict:
+        time_to_score = {}
+
+        async with semaphore:
+            print(f"  [{index}/{total}] Calling {agent_id}...")
+            started = time.monotonic()
+
+            def on_score(key: str, value: Any) -> None:
+                if key != "score" or not isinstance(value, int) or not 1 <= value <= 4:
+                    return
+                time_to_score["seconds"] = round(time.monotonic() - started, 2)
+                early_scores[agent_id] = value
+                print(f"  ⏱ {agent_id} Score: {value} (feedback still streaming)")
+                _print_provisional_gates(early_scores, announced)
+
+            result = await client.call_agent_async(
+                agent_id, content, cache_mode, on_score if stream else None, hedge, model
+            )
 
-    print(f"Starting sequential execution of {len(agent_ids)} agents...")
+        if time_to_score:
+            result["time_to_score_s"] = time_to_score["seconds"]
+
+        _print_result(result)
+        if on_result:
+            on_result(result)
+        return result
+
+    indexed = list(enumerate(agent_ids, 1))
+    if PROMPT_CACHE_LAYOUT and len(indexed) > 1:
+        # Write the shared document prefix to the cache with a single call
+        # first; otherwise every concurrent call would miss and write it too.
+        first = await run_one(*indexed[0])
+        rest = await asyncio.gather(*(run_one(i, agent_id) for i, agent_id in indexed[1:]))
+        return [first] + list(rest)
+
+    return await asyncio.gather(*(run_one(i, agent_id) for i, agent_id in indexed))
+
+
+async def _run_agents_cascade(
+    client: LLMClient,
+    agent_ids: List[str],
+    content: str,
+    layer_1_flags: List[Dict],
+    max_concurrency: int,
+    cache_mode: str = CACHE_MODE_USE,
+    hedge: bool = HEDGE_REQUESTS,
+) -> List[Dict]:
+    """
+    Score every agent on CASCADE_MODEL, then re-score on MODEL_NAME only the
+    agents scorer.cascade_escalations says the verdict depends on.
 
-    # Execute agents one by one
-    results = []
-    for i, agent_id in enumerate(agent_ids, 1):
-        print(f"  [{i}/{len(agent_ids)}] Calling {agent_id}...", end=" ")
-        result = client.call_agent(agent_id, content)
+    Escalated results replace the cheap ones and keep a summary of the
+    cheap call under "escalated_from" (its cost still counts).
 
-        if result["success"]:
-            print(f"✓ Score: {result['score']}")
-        else:
-            print(f"✗ Error: {result.get('error', 'Unknown')[:50]}...")
+    Args:
+        client: Client used for every agent call
+        agent_ids: Agents to execute
+        content: The draft content to analyze
+        layer_1_flags: Layer 1 violations (input to the cheap-tier verdict)
+        max_concurrency: Maximum number of in-flight API calls
+        cache_mode: One of result_cache.CACHE_MODES
+        hedge: Hedge calls that outlive their agent's p95 latency
 
-        results.append(result)
+    Returns:
+        List of agent results, ordered like agent_ids
+    """
+    print(f"  Tier 1: {len(agent_ids)} agents on {CASCADE_MODEL}")
+    cheap = await _run_agents_concurrent(
+        client, agent_ids, content, max_concurrency, cache_mode, False, hedge, CASCADE_MODEL
+    )
+    results = {result["agent_id"]: result for result in cheap}
+
+    escalations = cascade_escalations(layer_1_flags, results, CASCADE_MARGIN)
+    if not escalations:
+        print("  Tier 2: verdict is clear of both gates; no agents escalated")
+        return cheap
+
+    escalated_ids = [agent_id for agent_id in agent_ids if agent_id in escalations]
+    print(f"  Tier 2: {len(escalated_ids)} agent(s) escalated to {MODEL_NAME}")
+    primary = await _run_agents_concurrent(
+        client, escalated_ids, content, max_concurrency, cache_mode, False, hedge, MODEL_NAME
+    )
+    for result in primary:
+        first = results[result["agent_id"]]
+        result["escalated_from"] = {
+            "model": first.get("model"),
+            "reason": escalations[result["agent_id"]],
+            "score": first.get("score"),
+            "usage": first.get("usage"),
+            "cost_usd": first.get("cost_usd"),
+            **({"latency_s": first["latency_s"]} if "latency_s" in first else {}),
+            "retries": first.get("retries", 0),
+        }
+        results[result["agent_id"]] = result
+
+    return [results[agent_id] for agent_id in agent_ids]
+
+
+def _skipped_result(agent_id: str) -> Dict:
+    """Result for an agent triage did not need (the verdict was already decided)."""
+    return {
+        "agent_id": agent_id,
+        "success": False,
+        "skipped": True,
+        "error": "Skipped (triage): publish-ready verdict decided without this agent",
+    }
+
+
+async def _run_agents_triage(
+    client: LLMClient,
+    agent_ids: List[str],
+    content: str,
+    layer_1_flags: List[Dict],
+    max_concurrency: int,
+    cache_mode: str = CACHE_MODE_USE,
+    hedge: bool = HEDGE_REQUESTS,
+) -> List[Dict]:
+    """
+    Run agents in gate-priority order and stop once publish_ready is settled.
+
+    Agents are started in triage_order (Gate 2 / Gate 3 agents first, then
+    by weight). After each result the verdict is bounded with the pending
+    agents at score 1 and 4; once it cannot change, agents still queued or
+    in flight are cancelled and returned as skipped results.
+
+    Args:
+        client: Client used for every agent call
+        agent_ids: Agents to execute
+        content: The draft content to analyze
+        layer_1_flags: Layer 1 violations (Gate 3 input)
+        max_concurrency: Maximum number of in-flight API calls
+        cache_mode: One of result_cache.CACHE_MODES
+        hedge: Hedge calls that outlive their agent's p95 latency
+
+    Returns:
+        List of agent results, ordered like agent_ids
+    """
+    # Waiters on an asyncio.Semaphore are woken in FIFO order, so creating
+    # the tasks in priority order makes them start in priority order
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    ordered = triage_order(agent_ids)
+    total = len(ordered)
+    completed: Dict[str, Dict] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_one(index: int, agent_id: str) -> None:
+        async with semaphore:
+            print(f"  [{index}/{total}] Calling {agent_id}...")
+            result = await client.call_agent_async(agent_id, content, cache_mode, None, hedge)
+        completed[agent_id] = result
+        _print_result(result)
+
+        pending = [other for other in ordered if other not in completed]
+        if not pending:
+            return
+        bounds = compute_verdict_bounds(layer_1_flags, completed, pending)
+        if not bounds["decided"]:
+            return
+
+        low, high = bounds["overall_score_bounds"]
+        print(
+            f"  ⚖ Verdict decided after {len(completed)}/{total} agents: "
+            f"{bounds['gates']['status']} (overall score between {low} and {high}); "
+            f"skipping {len(pending)} agent(s)"
+        )
+        for other in pending:
+            tasks[other].cancel()
+
+    for index, agent_id in enumerate(ordered, 1):
+        tasks[agent_id] = asyncio.ensure_future(run_one(index, agent_id))
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    return [completed.get(agent_id) or _skipped_result(agent_id) for agent_id in agent_ids]
+
+
+async def _run_groups_concurrent(
+    client: LLMClient,
+    content: str,
+    max_concurrency: int,
+    cache_mode: str = CACHE_MODE_USE,
+) -> List[Dict]:
+    """
+    Grouped mode: one concurrent call per parameter instead of per agent.
+
+    Args:
+        client: Client used for every grouped call
+        content: The draft content to analyze
+        max_concurrency: Maximum number of in-flight API calls
+        cache_mode: One of result_cache.CACHE_MODES
+
+    Returns:
+        Flat list of per-agent results, in SUB_PARAMETERS order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    groups = list(get_llm_agent_groups().items())
+    total = len(groups)
+
+    async def run_group(index: int, parameter_id: str, agent_ids: List[str]) -> List[Dict]:
+        async with semaphore:
+            print(f"  [{index}/{total}] Calling {parameter_id} ({', '.join(agent_ids)})...")
+            results = await client.call_group_async(parameter_id, agent_ids, content, cache_mode)
+
+        for result in results:
+            _print_result(result)
+        return results
+
+    grouped = await asyncio.gather(
+        *(run_group(i, parameter_id, agent_ids) for i, (parameter_id, agent_ids) in enumerate(groups, 1))
+    )
+    return [result for results in grouped for result in results]
+
+
+async def _preflight_async(
+    client: LLMClient,
+    agent_ids: List[str],
+    content: str,
+    mode: str = LAYER_2_MODE_FULL,
+) -> Dict[str, int]:
+    """
+    Count the input tokens of every request a run is about to send.
+
+    Args:
+        client: Client that will make the calls
+        agent_ids: Agents to execute (full mode)
+        content: The draft content to analyze
+        mode: "full" (one request per agent) or "grouped" (one per parameter)
+
+    Returns:
+        Dictionary mapping agent or parameter id to input tokens
+
+    Raises:
+        DocumentTooLargeError: If any single request exceeds the ITPM budget,
+            so it could never be admitted without tripping the rate limit
+    """
+    if mode == LAYER_2_MODE_GROUPED:
+        prepared = [
+            (parameter_id, client._prepare_group_request(parameter_id, group, content)[0])
+            for parameter_id, group in get_llm_agent_groups().items()
+        ]
+    else:
+        prepared = [
+            (agent_id, client._prepare_request(agent_id, content)[0]) for agent_id in agent_ids
+        ]
+    prepared = [(label, request) for label, request in prepared if request is not None]
+
+    counts = await asyncio.gather(
+        *(client.count_input_tokens_async(request) for _, request in prepared)
+    )
+    token_counts = {label: count for (label, _), count in zip(prepared, counts)}
+    if not token_counts:
+        return token_counts
+
+    # The server-reported limits (synced from headers) win over ITPM_LIMIT.
+    # One call must fit a single key; the document is paced over all of them.
+    capacities = client.keys.input_token_capacities() or [
+        client.limiter.buckets["input_tokens"].capacity
+    ]
+    largest = max(token_counts, key=token_counts.get)
+    if token_counts[largest] > max(capacities):
+        raise DocumentTooLargeError(largest, token_counts[largest], int(max(capacities)))
+
+    itpm = int(sum(capacities))
+    total = sum(token_counts.values())
+    print(
+        f"Pre-flight: {len(token_counts)} calls, ~{total} input tokens "
+        f"(largest: {largest} ~{token_counts[largest]})"
+    )
+    if total > itpm:
+        print(
+            f"  Exceeds the {itpm} ITPM budget: calls will be paced over "
+            f"~{60 * (total - itpm) / itpm:.0f}s"
+        )
+    return token_counts
+
+
+def run_all_agents_concurrent(
+    content: str,
+    max_concurrency: int = MAX_CONCURRENT_AGENTS,
+    cache_mode: str = CACHE_MODE_USE,
+    mode: str = LAYER_2_MODE_FULL,
+    stream: bool = False,
+    hedge: bool = HEDGE_REQUESTS,
+    layer_1_flags: Optional[List[Dict]] = None,
+    agent_ids: Optional[List[str]] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+) -> Dict[str, Dict]:
+    """
+    Execute all 16 LLM agents concurrently on an asyncio event loop.
+
+    Args:
+        content: The draft content to analyze
+        max_concurrency: Maximum number of in-flight API calls
+        cache_mode: One of result_cache.CACHE_MODES
+        mode: "full" (one call per agent), "grouped" (one call per parameter),
+            "triage" (gate-critical agents first, stop once the verdict is decided)
+            or "cascade" (cheap model first, primary model near the gates)
+        stream: Stream full-mode responses and print scores as they arrive
+        hedge: Hedge slow full-mode calls at the agent's p95 latency
+        layer_1_flags: Layer 1 violations (triage and cascade modes need them for Gate 3)
+        agent_ids: Agents to run in full mode (default: every LLM agent);
+            the other modes always run every agent
+        on_result: Called with each full-mode result as soon as its agent
+            completes (e.g. to journal it)
+
+    Returns:
+        Dictionary mapping agent_id to result
+
+    Raises:
+        DocumentTooLargeError: If a single call's input can never fit ITPM_LIMIT
+    """
+    client = get_llm_client()
+    if agent_ids is None or mode != LAYER_2_MODE_FULL:
+        agent_ids = get_llm_agents()
+
+    run_on_client_loop(_preflight_async(client, agent_ids, content, mode))
+
+    started = time.monotonic()
+    if mode == LAYER_2_MODE_GROUPED:
+        print(
+            f"Starting grouped execution of {len(agent_ids)} agents in "
+            f"{len(get_llm_agent_groups())} calls (max {max_concurrency} in flight)..."
+        )
+        results = run_on_client_loop(
+            _run_groups_concurrent(client, content, max_concurrency, cache_mode)
+        )
+    elif mode == LAYER_2_MODE_CASCADE:
+        print(
+            f"Starting cascade execution of {len(agent_ids)} agents "
+            f"(max {max_concurrency} in flight)..."
+        )
+        results = run_on_client_loop(
+            _run_agents_cascade(
+                client,
+                agent_ids,
+                content,
+                layer_1_flags or [],
+                max_concurrency,
+                cache_mode,
+                hedge,
+            )
+        )
+    elif mode == LAYER_2_MODE_TRIAGE:
+        max_concurrency = min(max_concurrency, TRIAGE_MAX_CONCURRENCY)
+        print(
+            f"Starting triage of {len(agent_ids)} agents, gate-critical first "
+            f"(max {max_concurrency} in flight)..."
+        )
+        results = run_on_client_loop(
+            _run_agents_triage(
+                client,
+                agent_ids,
+                content,
+                layer_1_flags or [],
+                max_concurrency,
+                cache_mode,
+                hedge,
+            )
+        )
+    else:
+        print(
+            f"Starting concurrent execution of {len(agent_ids)} agents "
+            f"(max {max_concurrency} in flight)..."
+        )
+        results = run_on_client_loop(
+            _run_agents_concurrent(
+                client,
+                agent_ids,
+                content,
+                max_concurrency,
+                cache_mode,
+                stream,
+                hedge,
+                on_result=on_result,
+            )
+        )
+    elapsed = time.monotonic() - started
 
     # Convert list to dictionary
     results_dict = {result["agent_id"]: result for result in results}
 
     # Report success/failure
     successful = sum(1 for r in results if r["success"])
-    failed = len(results) - successful
-
-    print(f"\nAgent execution complete: {successful} successful, {failed} failed")
+    skipped = sum(1 for r in results if r.get("skipped"))
+    failed = len(results) - successful - skipped
+
+    cached = sum(1 for r in results if r.get("cached"))
+    repaired = sum(1 for r in results if r.get("repairs"))
+    hedged = sum(1 for r in results if r.get("hedged"))
+
+    print(
+        f"\nAgent execution complete in {elapsed:.1f}s: "
+        f"{successful} successful ({cached} from cache, {repaired} repaired), {failed} failed"
+        + (f", {skipped} skipped by triage" if skipped else "")
+    )
+    if hedged:
+        won = sum(1 for r in results if r.get("hedge_won"))
+        print(f"Hedged {hedged} slow call(s); the hedge answered first for {won}")
 
     if failed > 0:
         print("\nFailed agents:")
         for result in results:
-            if not result["success"]:
+            if not result["success"] and not result.get("skipped"):
                 print(f"  - {result['agent_id']}: {result.get('error', 'Unknown error')}")
 
     return results_dict
 
 
-def retry_failed_agents(content: str, previous_results: Dict[str, Dict]) -> Dict[str, Dict]:
+def retry_failed_agents(
+    content: str,
+    previous_results: Dict[str, Dict],
+    cache_mode: str = CACHE_MODE_USE,
+) -> Dict[str, Dict]:
     """
     Retry only the agents that failed in the previous run.
     This implements the "continue/resume" functionality.
@@ -354,11 +2008,12 @@ def retry_failed_agents(content: str, previous_results: Dict[str, Dict]) -> Dict
     Args:
         content: The draft content to analyze
         previous_results: Results from previous execution
+        cache_mode: One of result_cache.CACHE_MODES
 
     Returns:
         Dictionary mapping agent_id to result (only retried agents)
     """
-    client = LLMClient()
+    client = get_llm_client()
 
     # Identify failed agents
     failed_agents = [
@@ -370,12 +2025,14 @@ def retry_failed_agents(content: str, previous_results: Dict[str, Dict]) -> Dict
         return {}
 
     print(f"\nRetrying {len(failed_agents)} failed agents...")
+    run_on_client_loop(_preflight_async(client, failed_agents, content))
 
-    # Execute retries sequentially
-    results = []
-    for agent_id in failed_agents:
-        result = client.call_agent(agent_id, content)
-        results.append(result)
+    # Execute retries concurrently
+    results = run_on_client_loop(
+        _run_agents_concurrent(
+            client, failed_agents, content, MAX_CONCURRENT_AGENTS, cache_mode
+        )
+    )
 
     # Convert to dictionary
     retry_results = {result["agent_id"]: result for result in results}
@@ -394,28 +2051,60 @@ def retry_failed_agents(content: str, previous_results: Dict[str, Dict]) -> Dict
 # ============================================================================
 
 
-def run_layer_2_analysis(content: str) -> Dict[str, Dict]:
+def run_layer_2_analysis(
+    content: str,
+    cache_mode: str = CACHE_MODE_USE,
+    mode: str = LAYER_2_MODE_FULL,
+    stream: bool = False,
+    hedge: bool = HEDGE_REQUESTS,
+    layer_1_flags: Optional[List[Dict]] = None,
+    agent_ids: Optional[List[str]] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+) -> Dict[str, Dict]:
     """
-    Run all 16 LLM agents sequentially and return results.
+    Run all 16 LLM agents concurrently and return results.
 
     Args:
         content: Draft content to analyze
+        cache_mode: One of result_cache.CACHE_MODES
+        mode: "full" (gold standard), "grouped" (pre-screening), "triage"
+            (verdict only) or "cascade" (cheap model, escalated near the gates)
+        stream: Stream responses and surface scores early (full mode only)
+        hedge: Hedge slow calls at the agent's p95 latency (full and triage modes)
+        layer_1_flags: Layer 1 violations (used by triage and cascade modes)
+        agent_ids: Subset of agents to run (full mode only, e.g. the agents
+            whose segments changed since the previous report)
+        on_result: Called with each result as its agent completes (full mode only)
 
     Returns:
         Dictionary of results by agent_id
     """
-    return run_all_agents_sequential(content)
-
-
-def retry_failed(content: str, previous_results: Dict[str, Dict]) -> Dict[str, Dict]:
+    return run_all_agents_concurrent(
+        content,
+        cache_mode=cache_mode,
+        mode=mode,
+        stream=stream,
+        hedge=hedge,
+        layer_1_flags=layer_1_flags,
+        agent_ids=agent_ids,
+        on_result=on_result,
+    )
+
+
+def retry_failed(
+    content: str,
+    previous_results: Dict[str, Dict],
+    cache_mode: str = CACHE_MODE_USE,
+) -> Dict[str, Dict]:
     """
     Retry only failed agents from a previous run.
 
     Args:
         content: Draft content to analyze
         previous_results: Previous execution results
+        cache_mode: One of result_cache.CACHE_MODES
 
     Returns:
         Dictionary of retry results by agent_id
     """
-    return retry_failed_agents(content, previous_results)
+    return retry_failed_agents(content, previous_results, cache_mode)
@@ -6,7 +6,13 @@ Usage:
     python src/main.py analyze <file_path>              # Analyze a single file
     python src/main.py batch <directory>                # Analyze all files in directory
     python src/main.py continue <file> <report>         # Retry failed agents from previous run
+    python src/main.py enqueue <file_or_dir>            # Queue drafts for the workers (one job per agent)
+    python src/main.py worker [--processes N]           # Work the queue in N processes
     python src/main.py test-layer1 <file>               # Test Layer 1 only (regex)
+    python src/main.py bench [file_or_dir]              # Layer 2 throughput benchmark (fake backend)
+
+    Add --no-cache to bypass the agent result cache, or --refresh to re-run
+    every agent and overwrite its cached result.
 """
 
 import argparse
@@ -16,12 +22,119 @@ from pathlib import Path
 # Add src directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import INPUT_DIR, CALIBRATION_DIR
-from orchestrator import analyze_content, continue_analysis, analyze_batch
+from config import (
+    INPUT_DIR,
+    CALIBRATION_DIR,
+    GOLDEN_SET_DIR,
+    LAYER_2_MODES,
+    LAYER_2_MODE_FULL,
+    HEDGE_REQUESTS,
+    MAX_CONCURRENT_AGENTS,
+    RPM_LIMIT,
+    ITPM_LIMIT,
+    OTPM_LIMIT,
+    FAKE_BACKEND_SEED,
+    FAKE_LATENCY_MEDIAN_S,
+    FAKE_LATENCY_SIGMA,
+    FAKE_OUTPUT_TOKENS_PER_SECOND,
+    FAKE_RATE_LIMIT_RATE,
+    FAKE_OVERLOADED_RATE,
+)
+from backends import BACKENDS, BACKEND_FAKE
+from circuit_breaker import CircuitOpenError
+from orchestrator import (
+    analyze_content,
+    continue_analysis,
+    analyze_batch,
+    enqueue_path,
+    run_workers,
+)
 from regex_checker import run_layer_1_checks
+from result_cache import CACHE_MODE_USE, CACHE_MODE_REFRESH, CACHE_MODE_OFF
+from token_counter import DocumentTooLargeError
 import json
 
 
+def _cache_mode(args) -> str:
+    """Resolve the result cache mode from --no-cache / --refresh."""
+    if args.no_cache:
+        return CACHE_MODE_OFF
+    if args.refresh:
+        return CACHE_MODE_REFRESH
+    return CACHE_MODE_USE
+
+
+def _format_counts(by_state, noun: str) -> str:
+    """Total of a WorkQueue.counts() table with its per-state breakdown."""
+    states = ", ".join(f"{count} {state}" for state, count in sorted(by_state.items()))
+    return f"{sum(by_state.values())} {noun}" + (f" ({states})" if states else "")
+
+
+def _add_mode_argument(parser):
+    """Add the Layer 2 execution mode switch to a subcommand."""
+    parser.add_argument(
+        "--mode",
+        choices=LAYER_2_MODES,
+        default=LAYER_2_MODE_FULL,
+        help="Layer 2 mode: 'full' = one call per sub-parameter (gold standard), "
+        "'grouped' = one call per parameter (fast pre-screening), "
+        "'triage' = gate-critical agents first, stop once publish-ready is decided, "
+        "'cascade' = cheap model first, primary model only for agents near a gate",
+    )
+
+
+def _add_hedge_argument(parser):
+    """Add the hedged-request switch to a subcommand."""
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        default=HEDGE_REQUESTS,
+        help="Re-send agent calls still unanswered after their p95 latency and keep "
+        "the first answer (full mode; capped, and paced by the rate limiter)",
+    )
+
+
+def _add_fast_fail_argument(parser):
+    """Add the Layer 1 fast-fail switch to a subcommand."""
+    parser.add_argument(
+        "--fast-fail",
+        action="store_true",
+        help="Skip the LLM agents when Layer 1 finds a Critical violation (Gate 3 fails "
+        "regardless); run `continue` on the report later for the full analysis",
+    )
+
+
+def _add_full_rescore_argument(parser):
+    """Add the switch that disables incremental re-scoring to a subcommand."""
+    parser.add_argument(
+        "--full-rescore",
+        action="store_true",
+        help="Re-run every agent even if the previous report has results for "
+        "unchanged segments of the draft",
+    )
+
+
+def _add_normalize_argument(parser):
+    """Add the switch that sends agents the draft as-is to a subcommand."""
+    parser.add_argument(
+        "--no-normalize",
+        action="store_true",
+        help="Send the agents the raw draft instead of the normalized one "
+        "(link targets, images, HTML and extra whitespace removed)",
+    )
+
+
+def _add_cache_arguments(parser):
+    """Add the mutually exclusive result cache switches to a subcommand."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--no-cache", action="store_true", help="Bypass the agent result cache entirely"
+    )
+    group.add_argument(
+        "--refresh", action="store_true", help="Ignore cached results and overwrite them with fresh calls"
+    )
+
+
 def cmd_analyze(args):
     """Analyze a single content file."""
     filepath = Path(args.file)
@@ -43,7 +156,19 @@ def cmd_analyze(args):
 
     # Run analysis
     try:
-        report, report_path = analyze_content(content, content_id, save_report=not args.no_save)
+        report, report_path = analyze_content(
+            content,
+            content_id,
+            save_report=not args.no_save,
+            cache_mode=_cache_mode(args),
+            mode=args.mode,
+            stream=args.stream,
+            hedge=args.hedge,
+            fast_fail=args.fast_fail,
+            previous_report_path=args.previous,
+            incremental=not args.full_rescore,
+            normalize=not args.no_normalize,
+        )
         print(f"\n✓ Analysis complete!")
         if report_path:
             print(f"Report saved to: {report_path}")
@@ -54,6 +179,9 @@ def cmd_analyze(args):
             print(json.dumps(report, indent=2))
 
         return 0
+    except (DocumentTooLargeError, CircuitOpenError) as e:
+        print(f"\n✗ {e}")
+        return 1
     except Exception as e:
         print(f"\n✗ Analysis failed: {e}")
         import traceback
@@ -75,7 +203,15 @@ def cmd_batch(args):
 
     # Run batch analysis
     try:
-        results = analyze_batch(directory)
+        results = analyze_batch(
+            directory,
+            cache_mode=_cache_mode(args),
+            mode=args.mode,
+            hedge=args.hedge,
+            fast_fail=args.fast_fail,
+            incremental=not args.full_rescore,
+            normalize=not args.no_normalize,
+        )
 
         # Summary
         successful = sum(1 for path in results.values() if path is not None)
@@ -89,6 +225,48 @@ def cmd_batch(args):
         return 1
 
 
+def cmd_enqueue(args):
+    """Queue content files for the workers."""
+    from work_queue import get_work_queue
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"Error: Path not found: {path}")
+        return 1
+
+    queued = enqueue_path(
+        path,
+        cache_mode=_cache_mode(args),
+        hedge=args.hedge,
+        normalize=not args.no_normalize,
+    )
+    if not queued:
+        print(f"No content files found in {path}")
+        return 1
+
+    counts = get_work_queue().counts()
+    print(
+        f"\nQueue: {_format_counts(counts['jobs'], 'jobs')}, "
+        f"{_format_counts(counts['documents'], 'documents')}"
+    )
+    print("Run `python src/main.py worker --processes N` to process it.")
+    return 0
+
+
+def cmd_worker(args):
+    """Work the queue until it is drained."""
+    if args.processes < 1:
+        print("Error: --processes must be at least 1")
+        return 1
+    try:
+        run_workers(processes=args.processes, watch=args.watch)
+        return 0
+    except KeyboardInterrupt:
+        # Leased jobs are picked up again once their leases expire
+        print("\nWorker interrupted")
+        return 1
+
+
 def cmd_continue(args):
     """Continue a previous analysis by retrying failed agents."""
     filepath = Path(args.file)
@@ -116,12 +294,15 @@ def cmd_continue(args):
     # Continue analysis
     try:
         report, new_report_path = continue_analysis(
-            content, content_id, str(report_path), save_report=True
+            content, content_id, str(report_path), save_report=True, cache_mode=_cache_mode(args)
         )
         print(f"\n✓ Retry complete!")
         print(f"Updated report saved to: {new_report_path}")
 
         return 0
+    except CircuitOpenError as e:
+        print(f"\n✗ {e}")
+        return 1
     except Exception as e:
         print(f"\n✗ Retry failed: {e}")
         import traceback
@@ -180,6 +361,51 @@ def cmd_test_layer1(args):
         return 1
 
 
+def cmd_bench(args):
+    """Benchmark Layer 2 throughput (fake backend by default)."""
+    from benchmark import load_documents, run_benchmark
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"Error: Path not found: {path}")
+        return 1
+
+    documents = load_documents(path)
+    if not documents:
+        print(f"Error: No .md or .txt files found in {path}")
+        return 1
+
+    try:
+        summary = run_benchmark(
+            documents,
+            runs=args.runs,
+            backend_name=args.backend,
+            max_concurrency=args.concurrency,
+            mode=args.mode,
+            rpm=args.rpm,
+            itpm=args.itpm,
+            otpm=args.otpm,
+            hedge=args.hedge,
+            keys=args.keys,
+            fake_options={
+                "seed": args.seed,
+                "latency_median_s": args.latency,
+                "latency_sigma": args.latency_sigma,
+                "output_tokens_per_second": args.output_tps,
+                "rate_limit_rate": args.rate_429,
+                "overloaded_rate": args.rate_529,
+            },
+        )
+        if args.json:
+            print(json.dumps(summary, indent=2))
+        return 0
+    except Exception as e:
+        print(f"\n✗ Benchmark failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -201,6 +427,23 @@ def main():
     parser_analyze.add_argument(
         "--no-save", action="store_true", help="Do not save report to file (live analysis mode)"
     )
+    parser_analyze.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream agent responses and print each score (and provisional gates) as soon as it is emitted",
+    )
+    _add_mode_argument(parser_analyze)
+    _add_hedge_argument(parser_analyze)
+    parser_analyze.add_argument(
+        "--previous",
+        metavar="REPORT",
+        help="Report of an earlier version of this draft; agents whose segments are "
+        "unchanged reuse its results (default: the report this run overwrites)",
+    )
+    _add_fast_fail_argument(parser_analyze)
+    _add_full_rescore_argument(parser_analyze)
+    _add_normalize_argument(parser_analyze)
+    _add_cache_arguments(parser_analyze)
     parser_analyze.set_defaults(func=cmd_analyze)
 
     # Batch command
@@ -208,14 +451,46 @@ def main():
         "batch", help="Analyze all files in a directory"
     )
     parser_batch.add_argument("directory", help="Path to directory containing content files")
+    _add_mode_argument(parser_batch)
+    _add_hedge_argument(parser_batch)
+    _add_fast_fail_argument(parser_batch)
+    _add_full_rescore_argument(parser_batch)
+    _add_normalize_argument(parser_batch)
+    _add_cache_arguments(parser_batch)
     parser_batch.set_defaults(func=cmd_batch)
 
+    # Enqueue command
+    parser_enqueue = subparsers.add_parser(
+        "enqueue", help="Queue content files for `worker` (one job per document and agent)"
+    )
+    parser_enqueue.add_argument("path", help="Content file or directory (.txt or .md)")
+    _add_hedge_argument(parser_enqueue)
+    _add_normalize_argument(parser_enqueue)
+    _add_cache_arguments(parser_enqueue)
+    parser_enqueue.set_defaults(func=cmd_enqueue)
+
+    # Worker command
+    parser_worker = subparsers.add_parser(
+        "worker", help="Score queued jobs and write each document's report when it is complete"
+    )
+    parser_worker.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes to run (default: 1); each gets 1/N of the rate limits",
+    )
+    parser_worker.add_argument(
+        "--watch", action="store_true", help="Keep polling for new jobs instead of exiting when idle"
+    )
+    parser_worker.set_defaults(func=cmd_worker)
+
     # Continue command
     parser_continue = subparsers.add_parser(
         "continue", help="Retry failed agents from a previous analysis"
     )
     parser_continue.add_argument("file", help="Path to original content file")
     parser_continue.add_argument("report", help="Path to previous report JSON")
+    _add_cache_arguments(parser_continue)
     parser_continue.set_defaults(func=cmd_continue)
 
     # Test Layer 1 command
@@ -225,6 +500,56 @@ def main():
     parser_test.add_argument("file", help="Path to content file")
     parser_test.set_defaults(func=cmd_test_layer1)
 
+    # Bench command
+    parser_bench = subparsers.add_parser(
+        "bench", help="Benchmark Layer 2 throughput against concurrency and limiter settings"
+    )
+    parser_bench.add_argument(
+        "path",
+        nargs="?",
+        default=str(GOLDEN_SET_DIR),
+        help="Content file or directory (default: calibration golden set)",
+    )
+    parser_bench.add_argument("--runs", type=int, default=5, help="Documents to analyze (default: 5)")
+    parser_bench.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=BACKEND_FAKE,
+        help="LLM backend (default: fake, no API key or network needed)",
+    )
+    parser_bench.add_argument(
+        "--concurrency", type=int, default=MAX_CONCURRENT_AGENTS, help="Max in-flight agent calls"
+    )
+    parser_bench.add_argument(
+        "--keys", type=int, default=1, help="Fake API keys, each with the budgets below (default: 1)"
+    )
+    parser_bench.add_argument("--rpm", type=float, default=RPM_LIMIT, help="Requests per minute budget")
+    parser_bench.add_argument("--itpm", type=float, default=ITPM_LIMIT, help="Input tokens per minute budget")
+    parser_bench.add_argument("--otpm", type=float, default=OTPM_LIMIT, help="Output tokens per minute budget")
+    parser_bench.add_argument("--seed", type=int, default=FAKE_BACKEND_SEED, help="Fake backend RNG seed")
+    parser_bench.add_argument(
+        "--latency", type=float, default=FAKE_LATENCY_MEDIAN_S, help="Fake median time to first token (s)"
+    )
+    parser_bench.add_argument(
+        "--latency-sigma", type=float, default=FAKE_LATENCY_SIGMA, help="Fake log-normal latency spread"
+    )
+    parser_bench.add_argument(
+        "--output-tps",
+        type=float,
+        default=FAKE_OUTPUT_TOKENS_PER_SECOND,
+        help="Fake generation speed (output tokens/s)",
+    )
+    parser_bench.add_argument(
+        "--rate-429", type=float, default=FAKE_RATE_LIMIT_RATE, help="Fraction of fake calls answered with 429"
+    )
+    parser_bench.add_argument(
+        "--rate-529", type=float, default=FAKE_OVERLOADED_RATE, help="Fraction of fake calls answered with 529"
+    )
+    parser_bench.add_argument("--json", action="store_true", help="Also print the summary as JSON")
+    _add_mode_argument(parser_bench)
+    _add_hedge_argument(parser_bench)
+    parser_bench.set_defaults(func=cmd_bench)
+
     # Parse arguments
     args = parser.parse_args()
 
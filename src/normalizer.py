@@ -0,0 +1,246 @@
+"""
+Normalizer: Shrinks a markdown draft before it is sent to the LLM agents.
+Strips link targets, images, HTML and redundant whitespace while keeping headings and lists,
+and maps every offset of the normalized text back to the source draft.
+"""
+
+import bisect
+import html
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import CHARS_PER_TOKEN
+from result_cache import sha256_text
+
+# Normalized drafts remembered per content hash
+NORMALIZED_CACHE_SIZE = 64
+
+# Tags replaced by a line break (the others are dropped, keeping their text)
+_BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+# One alternative per construct; the first that matches at a position wins
+_PATTERN = re.compile(
+    r"(?P<comment><!--[\s\S]*?-->)"
+    r"|(?P<image>!\[(?P<alt>[^\]]*)\]\([^)]*\))"
+    r"|(?P<img><img\b[^>]*>)"
+    r"|(?P<link>\[(?P<text>[^\]]+)\]\((?:[^()\s]|\([^()]*\))*(?:\s+\"[^\"]*\")?\s*\))"
+    r"|(?P<refdef>^[ ]{0,3}\[[^\]]+\]:[ \t]*\S+[^\n]*\n?)"
+    r"|(?P<autolink><https?://[^>\s]+>)"
+    r"|(?P<tag></?(?P<tagname>[A-Za-z][A-Za-z0-9]*)\b[^>\n]*>)"
+    r"|(?P<entity>&(?:#\d+|#x[0-9a-fA-F]+|[A-Za-z]+);)"
+    r"|(?P<tablerule>^[ \t]*\|?(?:[ \t]*:?-{3,}:?[ \t]*\|)+(?:[ \t]*:?-{3,}:?[ \t]*)?$)"
+    r"|(?P<trailing>[ \t]+(?=\n|\Z))"
+    r"|(?P<blanklines>\n(?:[ \t]*\n){2,})"
+    r"|(?P<spaces>(?<=\S)(?:[ \t]{2,}|\t))",
+    re.MULTILINE,
+)
+_ALT_ATTRIBUTE = re.compile(r"\balt\s*=\s*(\"([^\"]*)\"|'([^']*)')", re.IGNORECASE)
+
+
+class NormalizedText:
+    """
+    A normalized draft plus the mapping of its offsets to the source.
+
+    The text is built from runs copied verbatim from the source and short
+    replacements (placeholders, single spaces). Offsets inside a copied run
+    map one to one; offsets inside a replacement map to the start of the
+    source construct it replaced.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: List[str] = []
+        self._length = 0
+        # Parallel lists, one entry per run: normalized start, source start, copied?
+        self._starts: List[int] = []
+        self._source_starts: List[int] = []
+        self._copied: List[bool] = []
+
+    def _add(self, text: str, source_start: int, copied: bool) -> None:
+        if not text:
+            return
+        self._starts.append(self._length)
+        self._source_starts.append(source_start)
+        self._copied.append(copied)
+        self._parts.append(text)
+        self._length += len(text)
+
+    def copy(self, start: int, end: int) -> None:
+        """Append source[start:end] verbatim."""
+        self._add(self.source[start:end], start, True)
+
+    def insert(self, text: str, source_start: int) -> None:
+        """Append replacement text standing for the source construct at source_start."""
+        self._add(text, source_start, False)
+
+    @property
+    def text(self) -> str:
+        """The normalized draft."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def source_offset(self, index: int) -> int:
+        """
+        Source offset of a normalized offset.
+
+        Args:
+            index: Offset into the normalized text (len(text) maps to len(source))
+
+        Returns:
+            Offset into the source draft
+        """
+        if index >= self._length:
+            return len(self.source)
+        run = bisect.bisect_right(self._starts, index) - 1
+        if run < 0:
+            return 0
+        if self._copied[run]:
+            return self._source_starts[run] + index - self._starts[run]
+        return self._source_starts[run]
+
+    def source_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Source span covering the normalized span [start, end)."""
+        if end <= start:
+            offset = self.source_offset(start)
+            return offset, offset
+        return self.source_offset(start), self.source_offset(end - 1) + 1
+
+    def locate(self, quote: str) -> Optional[Tuple[int, int]]:
+        """
+        Find a quote (e.g. an agent flag) in the source draft.
+
+        Quotes are taken from the normalized text the agent saw, so they are
+        looked up there and mapped back; a quote that only occurs in the
+        source is located directly.
+
+        Args:
+            quote: Text quoted by an agent
+
+        Returns:
+            (start, end) source offsets, or None if the quote is not found
+        """
+        quote = quote.strip()
+        if not quote:
+            return None
+        index = self.text.find(quote)
+        if index >= 0:
+            return self.source_span(index, index + len(quote))
+        index = self.source.find(quote)
+        if index >= 0:
+            return index, index + len(quote)
+        return None
+
+
+def _image_placeholder(alt: str) -> str:
+    alt = " ".join(alt.split())
+    return f"[image: {alt}]" if alt else "[image]"
+
+
+def normalize_markdown(content: str) -> NormalizedText:
+    """
+    Normalize a markdown draft for the LLM agents.
+
+    - Links keep their text, without the target; reference definitions and
+      autolinks are dropped (autolinks become "[link]")
+    - Images (markdown or <img>) become "[image: alt text]"
+    - HTML comments and tags are removed (block tags become a line break)
+      and entities are decoded
+    - Trailing whitespace, runs of spaces inside a line and runs of blank
+      lines are collapsed; table rules shrink to "---" cells
+    - Headings, list markers, indentation and emphasis are kept as they are
+
+    Args:
+        content: Source draft
+
+    Returns:
+        NormalizedText with the normalized text and the offset mapping
+    """
+    result = NormalizedText(content)
+    position = 0
+
+    for match in _PATTERN.finditer(content):
+        start, end = match.span()
+        result.copy(position, start)
+        kind = match.lastgroup
+
+        if kind == "image":
+            result.insert(_image_placeholder(match.group("alt")), start)
+        elif kind == "img":
+            alt = _ALT_ATTRIBUTE.search(match.group("img"))
+            result.insert(_image_placeholder((alt.group(2) or alt.group(3)) if alt else ""), start)
+        elif kind == "link":
+            text_start, text_end = match.span("text")
+            text = match.group("text")
+            result.copy(
+                text_start + len(text) - len(text.lstrip()),
+                text_end - len(text) + len(text.rstrip()),
+            )
+        elif kind == "autolink":
+            result.insert("[link]", start)
+        elif kind == "tag":
+            if match.group("tagname").lower() in _BLOCK_TAGS:
+                result.insert("\n", start)
+        elif kind == "entity":
+            result.insert(html.unescape(match.group("entity")), start)
+        elif kind == "tablerule":
+            cells = match.group("tablerule").strip().strip("|").split("|")
+            result.insert("|" + "|".join("---" for _ in cells) + "|", start)
+        elif kind == "blanklines":
+            result.insert("\n\n", start)
+        elif kind == "spaces":
+            result.insert(" ", start)
+        # comment, refdef, trailing: dropped
+        position = end
+
+    result.copy(position, len(content))
+    return result
+
+
+def normalization_summary(normalized: NormalizedText) -> Dict:
+    """
+    Size of a draft before and after normalization, for the report.
+
+    Args:
+        normalized: Output of normalize_markdown()
+
+    Returns:
+        Dict with source and normalized characters and the estimated input
+        tokens saved per agent call
+    """
+    source_chars = len(normalized.source)
+    normalized_chars = len(normalized.text)
+    return {
+        "content_hash": sha256_text(normalized.source),
+        "source_chars": source_chars,
+        "normalized_chars": normalized_chars,
+        "estimated_tokens_saved_per_call": int(
+            (source_chars - normalized_chars) / CHARS_PER_TOKEN
+        ),
+    }
+
+
+# ============================================================================
+# SHARED CACHE
+# ============================================================================
+
+_normalized_cache: "OrderedDict[str, NormalizedText]" = OrderedDict()
+_normalized_cache_lock = threading.Lock()
+
+
+def get_normalized(content: str) -> NormalizedText:
+    """Return the normalized draft, normalizing each distinct content hash once."""
+    key = sha256_text(content)
+    with _normalized_cache_lock:
+        if key in _normalized_cache:
+            _normalized_cache.move_to_end(key)
+            return _normalized_cache[key]
+
+    normalized = normalize_markdown(content)
+    with _normalized_cache_lock:
+        _normalized_cache[key] = normalized
+        while len(_normalized_cache) > NORMALIZED_CACHE_SIZE:
+            _normalized_cache.popitem(last=False)
+    return normalized
@@ -4,14 +4,36 @@ Executes Layer 1 → Layer 2 → Scorer and manages state/retries.
 """
 
 import json
+import multiprocessing
+import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-from config import REPORTS_DIR, DELAY_BETWEEN_FILES
+from config import (
+    REPORTS_DIR,
+    MODEL_NAME,
+    LAYER_2_MODE_FULL,
+    HEDGE_REQUESTS,
+    NORMALIZE_MARKDOWN,
+    CIRCUIT_MAX_REQUEUES,
+    WORK_QUEUE_CLAIM_SIZE,
+    WORK_QUEUE_POLL_SECONDS,
+    WORK_QUEUE_VISIBILITY_TIMEOUT,
+    get_llm_agents,
+    get_agent_segments,
+)
+from circuit_breaker import CircuitOpenError
+from journal import AnalysisJournal, prune_journals
 from regex_checker import run_layer_1_checks
-from llm_client import run_layer_2_analysis, retry_failed
+from llm_client import get_llm_client, run_layer_2_analysis, retry_failed
+from normalizer import NormalizedText, get_normalized, normalization_summary
+from prompt_registry import get_prompt_registry
+from result_cache import CACHE_MODE_USE, CACHE_MODE_REFRESH, sha256_text
 from scorer import generate_report
+from segmenter import changed_segments, segment_hashes, segment_markdown
+from work_queue import JOB_FAILED, JOB_QUEUED, WorkQueue, get_work_queue, worker_id
 
 
 # ============================================================================
@@ -20,7 +42,18 @@ from scorer import generate_report
 
 
 def analyze_content(
-    content: str, content_id: str, save_report: bool = True, subfolder: str = None
+    content: str,
+    content_id: str,
+    save_report: bool = True,
+    subfolder: str = None,
+    cache_mode: str = CACHE_MODE_USE,
+    mode: str = LAYER_2_MODE_FULL,
+    stream: bool = False,
+    hedge: bool = HEDGE_REQUESTS,
+    fast_fail: bool = False,
+    previous_report_path: Optional[str] = None,
+    incremental: bool = True,
+    normalize: bool = NORMALIZE_MARKDOWN,
 ) -> Tuple[Dict, str]:
     """
     Execute the complete content analysis pipeline.
@@ -36,9 +69,30 @@ def analyze_content(
         content_id: Identifier for the content (used in report filename)
         save_report: Whether to save the report to disk
         subfolder: Optional subfolder within reports directory (e.g., "golden_set", "poison_set")
+        cache_mode: Result cache mode ("use", "refresh" or "off")
+        mode: Layer 2 execution mode ("full", "grouped", "triage" or "cascade")
+        stream: Stream agent responses and print scores/provisional gates early
+        hedge: Re-send agent calls that outlive their p95 latency (first answer wins)
+        fast_fail: Skip Layer 2 when Layer 1 finds a Critical violation (Gate 3
+            fails regardless); `continue` can complete the report later
+        previous_report_path: Report of an earlier version of this draft
+            (default: the report this run would overwrite, if saving)
+        incremental: Reuse previous results of agents whose segments are
+            unchanged (full mode only; off when cache_mode is "refresh")
+        normalize: Send the agents the normalized draft (no link targets,
+            images, HTML or redundant whitespace)
+
+    In full mode each agent result is journaled as it arrives; if this
+    draft's previous analysis was interrupted before its report was
+    produced, the journaled results are resumed instead of re-called
+    (unless cache_mode is "refresh").
 
     Returns:
         Tuple of (report_dict, report_path)
+
+    Raises:
+        CircuitOpenError: If agents were refused by the open circuit breaker
+            (no report is generated from a half-scored draft)
     """
     print("\n" + "=" * 70)
     print(f"STARTING ANALYSIS: {content_id}")
@@ -49,55 +103,175 @@ def analyze_content(
     # ========================================================================
     print("\n[LAYER 1] Running deterministic regex checks...")
     layer_1_flags = run_layer_1_checks(content)
+    critical_count = sum(1 for f in layer_1_flags if f["severity"] == "Critical")
 
     if layer_1_flags:
         print(f"  ⚠️  Found {len(layer_1_flags)} violation(s)")
-        critical_count = sum(1 for f in layer_1_flags if f["severity"] == "Critical")
         if critical_count > 0:
             print(f"  🚫 {critical_count} CRITICAL violation(s) found (Gate 3 will fail)")
     else:
         print("  ✓ Layer 1 passed: No violations found")
 
+    # Layer 1 runs on the source; the agents get the normalized draft
+    normalized = get_normalized(content) if normalize else None
+    agent_content = normalized.text if normalized else content
+    normalization = normalization_summary(normalized) if normalized else None
+    if normalization:
+        print(
+            f"\n[NORMALIZE] {normalization['source_chars']} → {normalization['normalized_chars']} "
+            f"characters (~{normalization['estimated_tokens_saved_per_call']} tokens saved per call)"
+        )
+
+    segments = _segment_record(agent_content)
+
+    # ========================================================================
+    # FAST-FAIL: LAYER 1 VETO
+    # ========================================================================
+    if fast_fail and critical_count > 0:
+        print("\n[LAYER 2] Skipped (--fast-fail): Gate 3 already fails on Layer 1")
+        layer_2_results = {
+            agent_id: {
+                "agent_id": agent_id,
+                "success": False,
+                "skipped": True,
+                "error": "Skipped (fast-fail): Layer 1 critical violation vetoes the draft",
+            }
+            for agent_id in get_llm_agents()
+        }
+        report = generate_report(
+            content_id,
+            layer_1_flags,
+            layer_2_results,
+            layer_2_skipped=True,
+            segments=segments,
+            normalization=normalization,
+        )
+        print(f"\nStatus: {report['results']['status']}")
+        print(f"Publish-Ready: {report['results']['publish_ready']}")
+        print("Run `continue` with this report for the full Layer 2 analysis.")
+        report_path = None
+        if save_report:
+            report_path = save_report_to_file(report, content_id, subfolder=subfolder)
+            print(f"Report saved to: {report_path}")
+        return report, report_path
+
     # ========================================================================
     # LAYER 2: LLM AGENT EXECUTION (The Soft Gate)
     # ========================================================================
-    print("\n[LAYER 2] Executing 16 parallel LLM agents...")
-    print("  (This may take 30-60 seconds depending on API response times)")
+    reused = {}
+    if incremental and mode == LAYER_2_MODE_FULL and cache_mode != CACHE_MODE_REFRESH:
+        if previous_report_path is None and save_report:
+            default_path = report_file_path(content_id, subfolder)
+            previous_report_path = str(default_path) if default_path.exists() else None
+        if previous_report_path:
+            reused = _reusable_results(previous_report_path, segments)
+
+    journal = None
+    journaled = {}
+    if mode == LAYER_2_MODE_FULL:
+        prune_journals()
+        journal = AnalysisJournal(content, agent_content)
+        if cache_mode == CACHE_MODE_REFRESH:
+            journal.discard()
+        else:
+            journaled = {
+                agent_id: result
+                for agent_id, result in journal.resume().items()
+                if agent_id not in reused
+            }
+        if journaled:
+            print(
+                f"\n[JOURNAL] Resuming: {len(journaled)} agent result(s) recovered "
+                f"from an interrupted run"
+            )
+
+    agent_ids = [
+        agent_id
+        for agent_id in get_llm_agents()
+        if agent_id not in reused and agent_id not in journaled
+    ]
+    segments["reused"] = sorted(reused)
 
-    layer_2_results = run_layer_2_analysis(content)
+    if not agent_ids:
+        print("\n[LAYER 2] Skipped: every agent result is reused or resumed")
+        layer_2_results = {}
+    else:
+        print(f"\n[LAYER 2] Executing {len(agent_ids)} parallel LLM agents...")
+        print("  (This may take 30-60 seconds depending on API response times)")
+        try:
+            layer_2_results = run_layer_2_analysis(
+                agent_content,
+                cache_mode=cache_mode,
+                mode=mode,
+                stream=stream,
+                hedge=hedge,
+                layer_1_flags=layer_1_flags,
+                agent_ids=agent_ids,
+                on_result=journal.append if journal else None,
+            )
+        finally:
+            if journal:
+                journal.close()
+        _raise_if_circuit_open(layer_2_results)
+    layer_2_results = {
+        agent_id: reused.get(agent_id) or journaled.get(agent_id) or layer_2_results[agent_id]
+        for agent_id in get_llm_agents()
+    }
+    _locate_flags(layer_2_results, content, normalized)
 
     # Check for failures
     failed_agents = [
         agent_id
         for agent_id, result in layer_2_results.items()
-        if not result.get("success", False)
+        if not result.get("success", False) and not result.get("skipped")
+    ]
+    skipped_agents = [
+        agent_id for agent_id, result in layer_2_results.items() if result.get("skipped")
     ]
 
+    if skipped_agents:
+        print(f"  ⚖ Triage: {len(skipped_agents)} agent(s) skipped, verdict already decided")
     if failed_agents:
         print(f"\n  ⚠️  {len(failed_agents)} agent(s) failed:")
         for agent_id in failed_agents:
             error = layer_2_results[agent_id].get("error", "Unknown error")
             print(f"    - {agent_id}: {error}")
-    else:
+    elif not skipped_agents:
         print("  ✓ All 16 agents completed successfully")
 
     # ========================================================================
     # SCORER: AGGREGATION AND REPORT GENERATION
     # ========================================================================
     print("\n[SCORER] Generating comprehensive report...")
-    report = generate_report(content_id, layer_1_flags, layer_2_results)
+    report = generate_report(
+        content_id,
+        layer_1_flags,
+        layer_2_results,
+        segments=segments,
+        normalization=normalization,
+    )
 
     # Display summary
     print("\n" + "=" * 70)
     print("ANALYSIS COMPLETE")
     print("=" * 70)
     print(f"Overall Score: {report['results']['overall_score']}")
+    triage = report["metadata"].get("triage")
+    if triage:
+        low, high = triage["overall_score_bounds"]
+        print(f"  (triage: {len(triage['skipped'])} agent(s) skipped; final score between {low} and {high})")
     print(f"Status: {report['results']['status']}")
     print(f"Publish-Ready: {report['results']['publish_ready']}")
+    usage = report["metadata"]["accounting"]["document"]
+    print(
+        f"API Usage: {usage['api_calls']} call(s), {usage['input_tokens']} input / "
+        f"{usage['output_tokens']} output tokens, ${usage['cost_usd']:.4f}"
+    )
+    undetermined = "not needed, skipped by triage" if triage else "Threshold TBD"
     print("\nGate Status:")
-    print(f"  Gate 1 (Overall Threshold): {_format_gate_status(report['gates_status']['gate_1_overall_threshold_met'])}")
-    print(f"  Gate 2 (Tone Minimum): {_format_gate_status(report['gates_status']['gate_2_tone_veto_passed'])}")
-    print(f"  Gate 3 (Brand Compliance): {_format_gate_status(report['gates_status']['gate_3_brand_veto_passed'])}")
+    print(f"  Gate 1 (Overall Threshold): {_format_gate_status(report['gates_status']['gate_1_overall_threshold_met'], undetermined)}")
+    print(f"  Gate 2 (Tone Minimum): {_format_gate_status(report['gates_status']['gate_2_tone_veto_passed'], undetermined)}")
+    print(f"  Gate 3 (Brand Compliance): {_format_gate_status(report['gates_status']['gate_3_brand_veto_passed'], undetermined)}")
     print("=" * 70 + "\n")
 
     # ========================================================================
@@ -109,6 +283,10 @@ def analyze_content(
     else:
         report_path = None
 
+    # The results are in the report now (or with the caller, when not saving)
+    if journal:
+        journal.discard()
+
     return report, report_path
 
 
@@ -124,6 +302,29 @@ def save_report_to_file(report: Dict, content_id: str, subfolder: str = None) ->
     Returns:
         Path to saved report file
     """
+    filepath = report_file_path(content_id, subfolder)
+
+    # Ensure target directory exists
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    # Save with pretty formatting
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return str(filepath)
+
+
+def report_file_path(content_id: str, subfolder: str = None) -> Path:
+    """
+    Path of the JSON report for a content ID.
+
+    Args:
+        content_id: Content identifier for filename
+        subfolder: Optional subfolder within reports directory
+
+    Returns:
+        Report file path (which may not exist yet)
+    """
     # Create safe filename from content_id
     safe_filename = "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in content_id)
     filename = f"{safe_filename}_report.json"
@@ -134,22 +335,50 @@ def save_report_to_file(report: Dict, content_id: str, subfolder: str = None) ->
     else:
         target_dir = REPORTS_DIR
 
-    filepath = target_dir / filename
+    return target_dir / filename
 
-    # Ensure target directory exists
-    target_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save with pretty formatting
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+def _raise_if_circuit_open(layer_2_results: Dict[str, Dict]) -> None:
+    """Raise CircuitOpenError if any agent was refused by the circuit breaker."""
+    refused = [r["agent_id"] for r in layer_2_results.values() if r.get("circuit_open")]
+    if refused:
+        print(f"\n  🔌 {len(refused)} agent(s) refused by the open circuit breaker")
+        raise CircuitOpenError(get_llm_client().breaker.seconds_until_probe())
 
-    return str(filepath)
+
+def _locate_flags(
+    layer_2_results: Dict[str, Dict], content: str, normalized: Optional[NormalizedText]
+) -> None:
+    """
+    Add source offsets for the quotes in each agent's flags.
+
+    Agents quote the draft they were sent: quotes from the normalized draft
+    are mapped back to the source, quotes from the raw draft are looked up
+    in it directly. Sets result["flag_locations"] to a list of
+    {"quote", "start", "end"} for every quote that was found.
+    """
+
+    def locate_in_source(quote: str) -> Optional[Tuple[int, int]]:
+        quote = quote.strip()
+        index = content.find(quote) if quote else -1
+        return (index, index + len(quote)) if index >= 0 else None
+
+    locate = normalized.locate if normalized else locate_in_source
+    for result in layer_2_results.values():
+        locations = []
+        for flag in result.get("flags") or []:
+            quote = flag if isinstance(flag, str) else (flag or {}).get("quote")
+            span = locate(quote) if isinstance(quote, str) else None
+            if span:
+                locations.append({"quote": quote, "start": span[0], "end": span[1]})
+        if locations:
+            result["flag_locations"] = locations
 
 
-def _format_gate_status(status: Optional[bool]) -> str:
+def _format_gate_status(status: Optional[bool], undetermined: str = "Threshold TBD") -> str:
     """Format gate status for display."""
     if status is None:
-        return "❓ Cannot Determine (Threshold TBD)"
+        return f"❓ Cannot Determine ({undetermined})"
     elif status:
         return "✓ PASS"
     else:
@@ -166,6 +395,8 @@ def continue_analysis(
     content_id: str,
     previous_report_path: str,
     save_report: bool = True,
+    cache_mode: str = CACHE_MODE_USE,
+    normalize: Optional[bool] = None,
 ) -> Tuple[Dict, str]:
     """
     Continue a previous analysis by retrying failed agents only.
@@ -176,9 +407,16 @@ def continue_analysis(
         content_id: Content identifier
         previous_report_path: Path to the previous report JSON
         save_report: Whether to save the updated report
+        cache_mode: Result cache mode ("use", "refresh" or "off")
+        normalize: Send the retried agents the normalized draft (default:
+            as the previous report did, so one report never mixes inputs)
 
     Returns:
         Tuple of (updated_report_dict, report_path)
+
+    Raises:
+        CircuitOpenError: If retried agents were refused by the open circuit
+            breaker (the previous report is left as it was)
     """
     print("\n" + "=" * 70)
     print(f"CONTINUING ANALYSIS: {content_id}")
@@ -202,12 +440,71 @@ def continue_analysis(
     if mechanical_flags:
         layer_1_flags = mechanical_flags
 
-    # Reconstruct Layer 2 results from report
-    # This is a bit complex as we need to reverse-engineer the structure
     print("\n[RETRY] Identifying failed agents from previous run...")
+    layer_2_results = results_from_report(previous_report)
+
+    # Retry failed agents on the same input the others were scored on
+    if normalize is None:
+        normalize = "normalization" in previous_report.get("metadata", {})
+    normalized = get_normalized(content) if normalize else None
+    agent_content = normalized.text if normalized else content
+    retry_results = retry_failed(agent_content, layer_2_results, cache_mode=cache_mode)
+
+    _raise_if_circuit_open(retry_results)
+
+    # Merge retry results back into layer_2_results
+    layer_2_results.update(retry_results)
+    _locate_flags(layer_2_results, content, normalized)
+
+    # ========================================================================
+    # SCORER: REGENERATE REPORT
+    # ========================================================================
+    print("\n[SCORER] Regenerating report with updated results...")
+    updated_report = generate_report(
+        content_id,
+        layer_1_flags,
+        layer_2_results,
+        segments=_segment_record(agent_content),
+        normalization=normalization_summary(normalized) if normalized else None,
+    )
+
+    # Display summary
+    print("\n" + "=" * 70)
+    print("RETRY COMPLETE")
+    print("=" * 70)
+    print(f"Overall Score: {updated_report['results']['overall_score']}")
+    print(f"Status: {updated_report['results']['status']}")
+    print(f"Publish-Ready: {updated_report['results']['publish_ready']}")
+    print("=" * 70 + "\n")
+
+    # Save updated report
+    if save_report:
+        report_path = save_report_to_file(updated_report, content_id)
+        print(f"Updated report saved to: {report_path}")
+    else:
+        report_path = None
+
+    return updated_report, report_path
+
+
+def results_from_report(report: Dict) -> Dict[str, Dict]:
+    """
+    Reconstruct Layer 2 results from a saved report.
+
+    Args:
+        report: A report produced by generate_report()
+
+    Returns:
+        Dictionary mapping agent_id to result (failed agents have
+        success False; Layer 1's 2A_Mechanical is not included)
+    """
+    # This is a bit complex as we need to reverse-engineer the structure
+    metadata = report.get("metadata", {})
+    prompt_versions = metadata.get("prompt_versions", {})
+    agent_accounting = (metadata.get("accounting") or {}).get("agents", {})
     layer_2_results = {}
 
-    for param_id, param_data in previous_report.get("parameters", {}).items():
+    for param_id, param_data in report.get("parameters", {}).items():
         for agent_id, sub_data in param_data.get("sub_parameters", {}).items():
             if agent_id == "2A_Mechanical":
                 # Skip Layer 1 results
@@ -230,37 +527,74 @@ def continue_analysis(
                     "score": sub_data.get("score"),
                     "feedback": sub_data.get("feedback", ""),
                     "flags": sub_data.get("flags", []),
+                    "prompt_version": prompt_versions.get(agent_id),
+                    "model": agent_accounting.get(agent_id, {}).get("model"),
                 }
 
-    # Retry failed agents
-    retry_results = retry_failed(content, layer_2_results)
+    return layer_2_results
 
-    # Merge retry results back into layer_2_results
-    layer_2_results.update(retry_results)
 
-    # ========================================================================
-    # SCORER: REGENERATE REPORT
-    # ========================================================================
-    print("\n[SCORER] Regenerating report with updated results...")
-    updated_report = generate_report(content_id, layer_1_flags, layer_2_results)
+# ============================================================================
+# INCREMENTAL RE-SCORING
+# ============================================================================
 
-    # Display summary
-    print("\n" + "=" * 70)
-    print("RETRY COMPLETE")
-    print("=" * 70)
-    print(f"Overall Score: {updated_report['results']['overall_score']}")
-    print(f"Status: {updated_report['results']['status']}")
-    print(f"Publish-Ready: {updated_report['results']['publish_ready']}")
-    print("=" * 70 + "\n")
 
-    # Save updated report
-    if save_report:
-        report_path = save_report_to_file(updated_report, content_id)
-        print(f"Updated report saved to: {report_path}")
-    else:
-        report_path = None
+def _segment_record(content: str) -> Dict:
+    """Segment hashes and per-agent segment dependencies for the report."""
+    record = segment_hashes(segment_markdown(content))
+    record["dependencies"] = {
+        agent_id: list(get_agent_segments(agent_id)) for agent_id in get_llm_agents()
+    }
+    return record
 
-    return updated_report, report_path
+
+def _reusable_results(previous_report_path: str, segments: Dict) -> Dict[str, Dict]:
+    """
+    Results from a previous report that are still valid for this draft.
+
+    An agent's result is reused when none of its segments changed, it
+    succeeded in a full-mode run, and it was produced by the current prompt
+    version and model on the current backend (fake backend results name a
+    "fake:" model and are never reused by real runs, or the reverse).
+
+    Args:
+        previous_report_path: Report of an earlier version of the draft
+        segments: This draft's _segment_record()
+
+    Returns:
+        Dictionary mapping agent_id to reused result
+    """
+    try:
+        with open(previous_report_path, "r", encoding="utf-8") as f:
+            previous_report = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  ⚠️  Previous report not usable ({e}); re-scoring every agent")
+        return {}
+
+    metadata = previous_report.get("metadata", {})
+    previous_segments = metadata.get("segments")
+    if not previous_segments or metadata.get("layer_2_mode") != LAYER_2_MODE_FULL:
+        return {}
+
+    changed = set(changed_segments(previous_segments["hashes"], segments["hashes"]))
+    registry = get_prompt_registry()
+    model = get_llm_client()._cache_model(MODEL_NAME)
+    reused = {}
+    for agent_id, result in results_from_report(previous_report).items():
+        if (
+            result["success"]
+            and not changed.intersection(get_agent_segments(agent_id))
+            and result["prompt_version"] == registry.get_version(agent_id)
+            and result["model"] == model
+        ):
+            result["reused"] = True
+            reused[agent_id] = result
+
+    print(
+        f"\n[INCREMENTAL] Changed segments: {', '.join(sorted(changed)) or 'none'}; "
+        f"reusing {len(reused)} agent result(s) from {previous_report_path}"
+    )
+    return reused
 
 
 # ============================================================================
@@ -268,16 +602,34 @@ def continue_analysis(
 # ============================================================================
 
 
-def analyze_batch(content_dir: Path) -> Dict[str, str]:
+def analyze_batch(
+    content_dir: Path,
+    cache_mode: str = CACHE_MODE_USE,
+    mode: str = LAYER_2_MODE_FULL,
+    hedge: bool = HEDGE_REQUESTS,
+    fast_fail: bool = False,
+    incremental: bool = True,
+    normalize: bool = NORMALIZE_MARKDOWN,
+) -> Dict[str, str]:
     """
     Analyze multiple content files in a directory.
 
     Args:
         content_dir: Directory containing content files (.txt or .md)
+        cache_mode: Result cache mode ("use", "refresh" or "off")
+        mode: Layer 2 execution mode ("full", "grouped", "triage" or "cascade")
+        hedge: Hedge agent calls that outlive their p95 latency
+        fast_fail: Skip Layer 2 for drafts with a Layer 1 Critical violation
+        incremental: Reuse results from each file's existing report for
+            agents whose segments are unchanged
+        normalize: Send the agents normalized drafts
 
     Returns:
         Dictionary mapping content_id to report_path
     """
+    # No fixed delay between files: the shared rate limiter paces every call
+    # across the whole batch.
+
     # Find all text files
     files = list(content_dir.glob("*.txt")) + list(content_dir.glob("*.md"))
 
@@ -285,13 +637,7 @@ def analyze_batch(content_dir: Path) -> Dict[str, str]:
         print(f"No content files found in {content_dir}")
         return {}
 
-    # Detect subfolder from source directory name
-    subfolder = None
-    dir_name = content_dir.name
-    if "golden" in dir_name.lower():
-        subfolder = "golden_set"
-    elif "poison" in dir_name.lower():
-        subfolder = "poison_set"
+    subfolder = _batch_subfolder(content_dir)
 
     print(f"\n{'=' * 70}")
     print(f"BATCH ANALYSIS: {len(files)} file(s)")
@@ -300,10 +646,30 @@ def analyze_batch(content_dir: Path) -> Dict[str, str]:
     print(f"{'=' * 70}\n")
 
     results = {}
+    client = get_llm_client()
+    breaker = client.breaker
 
-    for i, filepath in enumerate(files, 1):
+    # (file, times re-queued); files refused by the open circuit breaker go
+    # to the back of the queue instead of producing a report full of errors
+    queue = deque((filepath, 0) for filepath in files)
+    processed = 0
+
+    while queue:
+        filepath, requeues = queue.popleft()
         content_id = filepath.stem
-        print(f"\n[{i}/{len(files)}] Processing: {content_id}")
+
+        # Pause admission while the circuit is open; the next file's first
+        # call is then the probe
+        wait = breaker.seconds_until_probe()
+        if wait > 0:
+            print(f"\n🔌 Circuit open: pausing batch for {wait:.0f}s before probing the API")
+            time.sleep(wait)
+
+        if requeues == 0:
+            processed += 1
+            print(f"\n[{processed}/{len(files)}] Processing: {content_id}")
+        else:
+            print(f"\n[re-queued {requeues}/{CIRCUIT_MAX_REQUEUES}] Processing: {content_id}")
 
         try:
             # Load content
@@ -311,25 +677,311 @@ def analyze_batch(content_dir: Path) -> Dict[str, str]:
                 content = f.read()
 
             # Analyze with subfolder parameter
-            report, report_path = analyze_content(content, content_id, save_report=True, subfolder=subfolder)
+            report, report_path = analyze_content(
+                content,
+                content_id,
+                save_report=True,
+                subfolder=subfolder,
+                cache_mode=cache_mode,
+                mode=mode,
+                hedge=hedge,
+                fast_fail=fast_fail,
+                incremental=incremental,
+                normalize=normalize,
+            )
             results[content_id] = report_path
 
-            # Add delay between files (except after last file)
-            if i < len(files):
-                print(f"\n  Waiting {DELAY_BETWEEN_FILES}s before next file...")
-                time.sleep(DELAY_BETWEEN_FILES)
+        except CircuitOpenError as e:
+            if requeues < CIRCUIT_MAX_REQUEUES:
+                print(f"  ↻ {content_id} re-queued: {e}")
+                queue.append((filepath, requeues + 1))
+            else:
+                print(f"  ✗ {content_id} given up after {requeues} re-queue(s): {e}")
+                results[content_id] = None
 
         except Exception as e:
             print(f"  ✗ Error processing {content_id}: {e}")
             results[content_id] = None
 
-            # Still add delay even after errors (for rate limit safety)
-            if i < len(files):
-                print(f"\n  Waiting {DELAY_BETWEEN_FILES}s before next file...")
-                time.sleep(DELAY_BETWEEN_FILES)
-
     print(f"\n{'=' * 70}")
     print(f"BATCH COMPLETE: {len(results)} file(s) processed")
+    if len(client.keys) > 1:
+        client.keys.print_summary()
     print(f"{'=' * 70}\n")
 
     return results
+
+
+def _batch_subfolder(content_dir: Path) -> Optional[str]:
+    """Reports subfolder for a calibration set directory (None for others)."""
+    dir_name = content_dir.name.lower()
+    if "golden" in dir_name:
+        return "golden_set"
+    if "poison" in dir_name:
+        return "poison_set"
+    return None
+
+
+# ============================================================================
+# WORK QUEUE (enqueue / worker)
+# ============================================================================
+
+
+def enqueue_content(
+    content: str,
+    content_id: str,
+    subfolder: Optional[str] = None,
+    cache_mode: str = CACHE_MODE_USE,
+    hedge: bool = HEDGE_REQUESTS,
+    normalize: bool = NORMALIZE_MARKDOWN,
+) -> Optional[int]:
+    """
+    Queue a draft for the workers: one job per LLM agent.
+
+    Layer 1, normalization and segmentation run here (they are cheap and
+    deterministic) and are stored with the document for its reducer.
+
+    Args:
+        content: The draft content to analyze
+        content_id: Identifier for the content (used in report filename)
+        subfolder: Optional subfolder within reports directory
+        cache_mode: Result cache mode for the agent calls
+        hedge: Hedge agent calls that outlive their p95 latency
+        normalize: Send the agents the normalized draft
+
+    Returns:
+        Document ID in the queue, or None if this draft is already queued
+    """
+    layer_1_flags = run_layer_1_checks(content)
+    normalized = get_normalized(content) if normalize else None
+    agent_content = normalized.text if normalized else content
+    segments = _segment_record(agent_content)
+    segments["reused"] = []
+
+    return get_work_queue().add_document(
+        content_id,
+        subfolder,
+        sha256_text(content),
+        content,
+        agent_content,
+        {
+            "layer_1_flags": layer_1_flags,
+            "segments": segments,
+            "normalization": normalization_summary(normalized) if normalized else None,
+        },
+        get_llm_agents(),
+        cache_mode,
+        hedge,
+    )
+
+
+def enqueue_path(
+    path: Path,
+    cache_mode: str = CACHE_MODE_USE,
+    hedge: bool = HEDGE_REQUESTS,
+    normalize: bool = NORMALIZE_MARKDOWN,
+) -> Dict[str, Optional[int]]:
+    """
+    Queue a content file, or every .txt / .md file in a directory.
+
+    Returns:
+        Dictionary mapping content_id to document ID (None if already queued)
+    """
+    if path.is_dir():
+        files = list(path.glob("*.txt")) + list(path.glob("*.md"))
+        subfolder = _batch_subfolder(path)
+    else:
+        files = [path]
+        subfolder = None
+
+    queued = {}
+    for filepath in files:
+        with open(filepath, "r", encoding="utf-8") as f:
+            content = f.read()
+        doc_id = enqueue_content(
+            content,
+            filepath.stem,
+            subfolder=subfolder,
+            cache_mode=cache_mode,
+            hedge=hedge,
+            normalize=normalize,
+        )
+        queued[filepath.stem] = doc_id
+        if doc_id is None:
+            print(f"  = {filepath.stem}: already queued")
+        else:
+            print(f"  + {filepath.stem}: {len(get_llm_agents())} agent jobs (document {doc_id})")
+    return queued
+
+
+def run_workers(processes: int = 1, watch: bool = False) -> int:
+    """
+    Work the queue in `processes` worker processes until it is drained.
+
+    Each process gets 1/processes of every rate limit, so together they stay
+    within the budgets a single process would use. Processes are spawned
+    rather than forked: the parent may already hold an event loop thread
+    and open connections.
+
+    Args:
+        processes: Number of worker processes
+        watch: Keep polling for new jobs instead of exiting when idle
+
+    Returns:
+        Number of reports written (by this process, when processes == 1)
+    """
+    if processes <= 1:
+        return work(share=1.0, watch=watch)
+
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=work, args=(1.0 / processes, watch), name=f"worker-{i + 1}")
+        for i in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    return 0
+
+
+def work(share: float = 1.0, watch: bool = False) -> int:
+    """
+    One worker: lease jobs, run their agents, write finished reports.
+
+    Jobs are leased WORK_QUEUE_CLAIM_SIZE at a time from one document and
+    run concurrently through the usual Layer 2 fan-out. Whichever worker
+    completes a document's last job also writes its report.
+
+    Args:
+        share: Fraction of the rate limits this process may use
+        watch: Keep polling for new jobs instead of exiting when idle
+
+    Returns:
+        Number of reports written
+    """
+    queue = get_work_queue()
+    client = get_llm_client()
+    if share < 1.0:
+        client.keys.set_limit_share(share)
+    owner = worker_id()
+    print(f"[WORKER {owner}] Started ({share:.0%} of the rate limits)")
+
+    reports = 0
+    while True:
+        reports += _reduce_ready_documents(queue, owner)
+        claim = queue.claim(owner, WORK_QUEUE_CLAIM_SIZE)
+        if claim is None:
+            if not watch and not queue.has_work():
+                break
+            time.sleep(WORK_QUEUE_POLL_SECONDS)
+            continue
+        _run_claimed_jobs(queue, owner, claim)
+
+    print(f"[WORKER {owner}] Queue drained: {reports} report(s) written")
+    return reports
+
+
+def _run_claimed_jobs(queue: WorkQueue, owner: str, claim: Dict) -> None:
+    """Run the agents of leased jobs and record each job's outcome."""
+    jobs = claim["jobs"]
+    agent_ids = [job["agent_id"] for job in jobs]
+    print(f"\n[WORKER {owner}] {claim['content_id']}: {', '.join(agent_ids)}")
+
+    # Renew the leases while the agents run (limiter waits can be long)
+    stop = threading.Event()
+
+    def heartbeat() -> None:
+        while not stop.wait(WORK_QUEUE_VISIBILITY_TIMEOUT / 3):
+            queue.renew([job["job_id"] for job in jobs], owner)
+
+    renewer = threading.Thread(target=heartbeat, daemon=True)
+    renewer.start()
+    try:
+        results = run_layer_2_analysis(
+            claim["agent_content"],
+            cache_mode=claim["cache_mode"],
+            hedge=claim["hedge"],
+            layer_1_flags=claim["context"]["layer_1_flags"],
+            agent_ids=agent_ids,
+        )
+    except Exception as e:
+        results = {
+            agent_id: {"agent_id": agent_id, "success": False, "error": f"Worker error: {e}"}
+            for agent_id in agent_ids
+        }
+    finally:
+        stop.set()
+        renewer.join()
+
+    for job in jobs:
+        result = results[job["agent_id"]]
+        if result.get("success"):
+            queue.complete(job["job_id"], owner, result)
+            continue
+        if result.get("circuit_open"):
+            # Never reached the API: retry once the breaker lets a probe through
+            state = queue.fail(
+                job["job_id"],
+                owner,
+                result,
+                count_attempt=False,
+                retry_in=get_llm_client().breaker.seconds_until_probe(),
+            )
+        else:
+            state = queue.fail(job["job_id"], owner, result)
+        if state == JOB_QUEUED:
+            print(f"  ↻ {job['agent_id']} re-queued (attempt {job['attempts']}): {result.get('error')}")
+        elif state == JOB_FAILED:
+            print(f"  ✗ {job['agent_id']} failed after {job['attempts']} attempt(s): {result.get('error')}")
+
+
+def _reduce_ready_documents(queue: WorkQueue, owner: str) -> int:
+    """Write the report of every document whose jobs have all finished."""
+    written = 0
+    while True:
+        document = queue.claim_reduction(owner)
+        if document is None:
+            return written
+        try:
+            report_path = reduce_document(document)
+        except Exception as e:
+            print(f"  ✗ Report for {document['content_id']} failed: {e}")
+            queue.finish_reduction(document["doc_id"], owner, None, error=str(e))
+            continue
+        queue.finish_reduction(document["doc_id"], owner, report_path)
+        written += 1
+
+
+def reduce_document(document: Dict) -> str:
+    """
+    Score a queued document from its job results and save the report.
+
+    Args:
+        document: WorkQueue.claim_reduction() output
+
+    Returns:
+        Path to the saved report
+    """
+    context = document["context"]
+    layer_2_results = {
+        agent_id: document["results"].get(agent_id)
+        or {"agent_id": agent_id, "success": False, "error": "No result recorded in the work queue"}
+        for agent_id in get_llm_agents()
+    }
+    normalized = get_normalized(document["content"]) if context.get("normalization") else None
+    _locate_flags(layer_2_results, document["content"], normalized)
+
+    report = generate_report(
+        document["content_id"],
+        context["layer_1_flags"],
+        layer_2_results,
+        segments=context["segments"],
+        normalization=context["normalization"],
+    )
+    report_path = save_report_to_file(report, document["content_id"], subfolder=document["subfolder"])
+    print(
+        f"\n[REDUCER] {document['content_id']}: {report['results']['overall_score']} "
+        f"({report['results']['status']}) → {report_path}"
+    )
+    return report_path
@@ -0,0 +1,163 @@
+"""
+Output Budget: Per-agent max_tokens learned from historical output usage.
+Records each agent's output tokens in SQLite and budgets a high percentile plus a margin.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    MAX_TOKENS,
+    OUTPUT_HISTORY_PATH,
+    OUTPUT_HISTORY_SIZE,
+    OUTPUT_BUDGET_PERCENTILE,
+    OUTPUT_BUDGET_MARGIN,
+    OUTPUT_BUDGET_MIN_SAMPLES,
+    OUTPUT_BUDGET_FLOOR,
+)
+
+
+def percentile(values: List[int], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class OutputBudget:
+    """
+    Output-token history and budgets per agent.
+
+    Until an agent has OUTPUT_BUDGET_MIN_SAMPLES recorded responses it runs
+    with the global MAX_TOKENS. After that its budget is the
+    OUTPUT_BUDGET_PERCENTILE of its last OUTPUT_HISTORY_SIZE outputs plus
+    OUTPUT_BUDGET_MARGIN, clamped to [OUTPUT_BUDGET_FLOOR, MAX_TOKENS].
+    Responses cut off at the budget are re-issued by the caller with
+    MAX_TOKENS, so a too-tight budget costs one extra call, never a
+    truncated result.
+    """
+
+    def __init__(
+        self,
+        path: Path = OUTPUT_HISTORY_PATH,
+        history_size: int = OUTPUT_HISTORY_SIZE,
+    ):
+        """
+        Args:
+            path: SQLite file for the history (":memory:" for a throwaway store)
+            history_size: Responses kept per agent and model
+        """
+        self.path = Path(path)
+        self.history_size = history_size
+        self._budgets: Dict[str, int] = {}
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS output_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                agent_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_output_tokens_agent "
+            "ON output_tokens (agent_id, model, id)"
+        )
+        self._conn.commit()
+
+    def _history(self, agent_id: str, model: str) -> List[int]:
+        """Most recent output token counts for an agent (caller holds the lock)."""
+        rows = self._conn.execute(
+            "SELECT output_tokens FROM output_tokens WHERE agent_id = ? AND model = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (agent_id, model, self.history_size),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def budget(self, agent_id: str, model: str) -> int:
+        """
+        max_tokens to request for an agent's next call.
+
+        Args:
+            agent_id: Agent identifier
+            model: Model that will serve the call
+
+        Returns:
+            Learned budget, or MAX_TOKENS while history is insufficient
+        """
+        key = f"{model}:{agent_id}"
+        with self._lock:
+            if key not in self._budgets:
+                history = self._history(agent_id, model)
+                if len(history) < OUTPUT_BUDGET_MIN_SAMPLES:
+                    self._budgets[key] = MAX_TOKENS
+                else:
+                    learned = percentile(history, OUTPUT_BUDGET_PERCENTILE) * (
+                        1 + OUTPUT_BUDGET_MARGIN
+                    )
+                    self._budgets[key] = int(
+                        min(MAX_TOKENS, max(OUTPUT_BUDGET_FLOOR, math.ceil(learned)))
+                    )
+            return self._budgets[key]
+
+    def is_learned(self, agent_id: str, model: str) -> bool:
+        """True once the agent's budget comes from its history."""
+        with self._lock:
+            return len(self._history(agent_id, model)) >= OUTPUT_BUDGET_MIN_SAMPLES
+
+    def record(self, agent_id: str, model: str, output_tokens: int) -> None:
+        """
+        Record the output size of a complete (not truncated) response.
+
+        Args:
+            agent_id: Agent identifier
+            model: Model that served the call
+            output_tokens: Output tokens generated
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO output_tokens (agent_id, model, output_tokens, recorded_at) "
+                "VALUES (?, ?, ?, ?)",
+                (agent_id, model, output_tokens, time.time()),
+            )
+            # Keep only the window the percentile is computed over
+            self._conn.execute(
+                """
+                DELETE FROM output_tokens
+                WHERE agent_id = ? AND model = ? AND id NOT IN (
+                    SELECT id FROM output_tokens WHERE agent_id = ? AND model = ?
+                    ORDER BY id DESC LIMIT ?
+                )
+                """,
+                (agent_id, model, agent_id, model, self.history_size),
+            )
+            self._conn.commit()
+            self._budgets.pop(f"{model}:{agent_id}", None)
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_budget: Optional[OutputBudget] = None
+_shared_budget_lock = threading.Lock()
+
+
+def get_output_budget() -> OutputBudget:
+    """Return the process-wide output budget store, opening it on first use."""
+    global _shared_budget
+    with _shared_budget_lock:
+        if _shared_budget is None:
+            _shared_budget = OutputBudget()
+        return _shared_budget
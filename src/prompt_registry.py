@@ -0,0 +1,137 @@
+"""
+Prompt Registry: Preloaded, hash-stamped agent prompts.
+Loads every prompt file once per process and reloads edited files by mtime.
+"""
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import PROMPTS_DIR, PROMPT_RELOAD_CHECK_INTERVAL, get_agent_metadata
+
+# Length of the short prompt version recorded in reports
+PROMPT_VERSION_LENGTH = 12
+
+
+class PromptRegistry:
+    """
+    In-memory registry of prompt files keyed by filename.
+
+    Each entry holds the stripped prompt text, its sha256 and the file mtime.
+    Files are re-stat'ed at most once per check_interval seconds, so a
+    long-running process picks up edited prompts without a restart and the
+    hot path does no disk I/O in between.
+    """
+
+    def __init__(
+        self,
+        prompts_dir: Path = PROMPTS_DIR,
+        check_interval: float = PROMPT_RELOAD_CHECK_INTERVAL,
+    ):
+        self.prompts_dir = Path(prompts_dir)
+        self.check_interval = check_interval
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load_all()
+
+    def load_all(self) -> int:
+        """
+        (Re)load every *.txt file in the prompts directory.
+
+        Returns:
+            Number of prompts loaded
+        """
+        with self._lock:
+            self._entries = {}
+            for path in sorted(self.prompts_dir.glob("*.txt")):
+                entry = self._read(path)
+                if entry:
+                    self._entries[path.name] = entry
+            return len(self._entries)
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        """Read one prompt file into a registry entry."""
+        try:
+            mtime = path.stat().st_mtime
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read().strip()
+        except OSError as e:
+            print(f"Error loading prompt file {path}: {e}")
+            return None
+
+        return {
+            "path": path,
+            "text": text,
+            "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "mtime": mtime,
+            "checked_at": time.monotonic(),
+        }
+
+    def get_entry(self, prompt_file: str) -> Optional[Dict]:
+        """
+        Return the registry entry for a prompt file, reloading it if edited.
+
+        Args:
+            prompt_file: Filename within the prompts directory
+
+        Returns:
+            Entry dict with "text", "sha256" and "mtime", or None if missing
+        """
+        with self._lock:
+            entry = self._entries.get(prompt_file)
+            now = time.monotonic()
+
+            if entry is not None and now - entry["checked_at"] < self.check_interval:
+                return entry
+
+            path = self.prompts_dir / prompt_file
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                # File removed (or never existed)
+                self._entries.pop(prompt_file, None)
+                return None
+
+            if entry is None or mtime != entry["mtime"]:
+                entry = self._read(path)
+                if entry is None:
+                    self._entries.pop(prompt_file, None)
+                    return None
+                self._entries[prompt_file] = entry
+            else:
+                entry["checked_at"] = now
+
+            return entry
+
+    def get_agent_prompt(self, agent_id: str) -> Optional[Dict]:
+        """Return the registry entry for an agent's prompt file."""
+        metadata = get_agent_metadata(agent_id)
+        if not metadata or not metadata["prompt_file"]:
+            return None
+        return self.get_entry(metadata["prompt_file"])
+
+    def get_version(self, agent_id: str) -> Optional[str]:
+        """Short, stable prompt version (hash prefix) for reports."""
+        entry = self.get_agent_prompt(agent_id)
+        if not entry:
+            return None
+        return entry["sha256"][:PROMPT_VERSION_LENGTH]
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_registry: Optional[PromptRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Return the process-wide prompt registry, loading prompts on first use."""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = PromptRegistry()
+        return _shared_registry
@@ -0,0 +1,338 @@
+"""
+Rate Limiter: Token-bucket admission control for the Claude API.
+Enforces RPM_LIMIT, ITPM_LIMIT and OTPM_LIMIT across every agent call in the process.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from config import (
+    RPM_LIMIT,
+    ITPM_LIMIT,
+    OTPM_LIMIT,
+    OUTPUT_TOKENS_ESTIMATE,
+)
+
+# Response header prefix used by the Claude API to report rate-limit state
+HEADER_PREFIX = "anthropic-ratelimit-"
+
+# Maps limiter bucket names to the header names the API uses for them
+HEADER_BUCKETS = {
+    "requests": "requests",
+    "input_tokens": "input-tokens",
+    "output_tokens": "output-tokens",
+}
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+
+class TokenBucket:
+    """
+    A bucket holding one minute of budget that refills continuously.
+
+    Not thread-safe on its own; RateLimiter serializes access.
+    """
+
+    def __init__(self, name: str, limit_per_minute: float):
+        self.name = name
+        self.capacity = float(limit_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens added back per second."""
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        """Add the budget earned since the last update."""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Seconds until `amount` can be consumed (0.0 if available now).
+
+        Requests larger than the whole bucket are clamped to its capacity so
+        they are admitted once the bucket is full rather than never.
+        """
+        self.refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float) -> None:
+        """Remove budget. May go negative when settling an underestimate."""
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return unused budget, never above capacity."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """
+        Reconcile with the server's view of this bucket.
+
+        The server is authoritative: adopt its limit, and never believe we
+        have more headroom than it reports.
+        """
+        if limit is not None and limit > 0 and limit != self.capacity:
+            self.capacity = float(limit)
+            self.tokens = min(self.tokens, self.capacity)
+        if remaining is not None and remaining < self.tokens:
+            self.tokens = float(remaining)
+
+
+# ============================================================================
+# RATE LIMITER
+# ============================================================================
+
+
+class RateLimiter:
+    """
+    Three-bucket limiter for requests, input tokens and output tokens.
+
+    A call is admitted only when all three buckets have budget. Input tokens
+    are reserved from an estimate and output tokens from a running average of
+    observed usage; settle() corrects both once the real usage is known.
+
+    A limiter can be given a share of the limits (e.g. 1/N in each of N
+    queue worker processes using the same key); server-reported limits are
+    scaled by the same share.
+    """
+
+    def __init__(
+        self,
+        rpm: float = RPM_LIMIT,
+        itpm: float = ITPM_LIMIT,
+        otpm: float = OTPM_LIMIT,
+        share: float = 1.0,
+    ):
+        self._lock = threading.Lock()
+        self.share = 1.0
+        self.buckets = {
+            "requests": TokenBucket("requests", rpm),
+            "input_tokens": TokenBucket("input_tokens", itpm),
+            "output_tokens": TokenBucket("output_tokens", otpm),
+        }
+        self.output_estimate = float(OUTPUT_TOKENS_ESTIMATE)
+        self.total_wait = 0.0
+        self.paused_until = 0.0
+        if share != 1.0:
+            self.set_share(share)
+
+    def set_share(self, share: float) -> None:
+        """
+        Limit this limiter to a fraction of the full budgets.
+
+        Args:
+            share: Fraction of RPM / ITPM / OTPM this process may use (0-1]
+        """
+        with self._lock:
+            for bucket in self.buckets.values():
+                bucket.capacity = bucket.capacity / self.share * share
+                bucket.tokens = min(bucket.tokens, bucket.capacity)
+            self.share = share
+
+    def pause_until(self, deadline: float) -> None:
+        """
+        Hold back all admissions until a monotonic deadline.
+
+        Used when the API signals global pressure (429 / 529), so every
+        caller backs off together instead of only the one that failed.
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, deadline)
+
+    def try_reserve(
+        self, input_tokens: int, output_tokens: int, not_before: Optional[float] = None
+    ) -> float:
+        """
+        Atomically reserve budget in all buckets, or report how long to wait.
+
+        Args:
+            input_tokens: Estimated input tokens for the request
+            output_tokens: Output tokens to reserve for the request
+            not_before: Monotonic time before which this call must not start
+
+        Returns:
+            0.0 if the reservation was made, otherwise seconds to wait
+        """
+        amounts = {
+            "requests": 1,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        }
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self.paused_until - now,
+                (not_before - now) if not_before is not None else 0.0,
+                *(
+                    self.buckets[name].wait_time(amount, now)
+                    for name, amount in amounts.items()
+                ),
+            )
+            if wait > 0:
+                return wait
+            for name, amount in amounts.items():
+                self.buckets[name].consume(amount)
+            return 0.0
+
+    def reserve_output_tokens(self) -> int:
+        """Output tokens to reserve for a call whose usage is not known yet."""
+        return int(self.output_estimate)
+
+    async def acquire(
+        self, input_tokens: int, output_tokens: int, not_before: Optional[float] = None
+    ) -> float:
+        """
+        Wait (without blocking the event loop) until the call fits the budget.
+
+        Args:
+            input_tokens: Estimated input tokens for the request
+            output_tokens: Output tokens to reserve for the request
+            not_before: Monotonic time before which this call must not start
+                (a scheduled retry)
+
+        Returns:
+            Seconds spent waiting for admission
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_reserve(input_tokens, output_tokens, not_before)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self.total_wait += waited
+        return waited
+
+    def acquire_blocking(
+        self, input_tokens: int, output_tokens: int, not_before: Optional[float] = None
+    ) -> float:
+        """Synchronous counterpart of acquire() for threaded callers."""
+        waited = 0.0
+        while True:
+            wait = self.try_reserve(input_tokens, output_tokens, not_before)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        self.total_wait += waited
+        return waited
+
+    def settle(
+        self,
+        input_reserved: int,
+        input_actual: Optional[int],
+        output_reserved: int,
+        output_actual: Optional[int],
+    ) -> None:
+        """
+        Correct a reservation with the usage reported by the API.
+
+        Args:
+            input_reserved: Input tokens reserved at admission
+            input_actual: Input tokens billed (None if unknown)
+            output_reserved: Output tokens reserved at admission
+            output_actual: Output tokens generated (None if unknown)
+        """
+        with self._lock:
+            for name, reserved, actual in (
+                ("input_tokens", input_reserved, input_actual),
+                ("output_tokens", output_reserved, output_actual),
+            ):
+                if actual is None:
+                    continue
+                bucket = self.buckets[name]
+                bucket.refill(time.monotonic())
+                if actual < reserved:
+                    bucket.refund(reserved - actual)
+                elif actual > reserved:
+                    bucket.consume(actual - reserved)
+
+            if output_actual is not None:
+                # Exponential moving average of observed output usage
+                self.output_estimate = 0.8 * self.output_estimate + 0.2 * output_actual
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Update bucket state from anthropic-ratelimit-* response headers.
+
+        Args:
+            headers: Response headers (from a success or an error response)
+        """
+        if not headers:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            for name, header_name in HEADER_BUCKETS.items():
+                limit = _parse_header_number(headers, f"{HEADER_PREFIX}{header_name}-limit")
+                remaining = _parse_header_number(
+                    headers, f"{HEADER_PREFIX}{header_name}-remaining"
+                )
+                bucket = self.buckets[name]
+                bucket.refill(now)
+                bucket.sync(limit * self.share if limit is not None else None, remaining)
+
+    def headroom(self) -> float:
+        """
+        Fraction of budget left in the emptiest bucket (0.0 while paused).
+
+        Used by the key pool to send each call to the least loaded key.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.paused_until > now:
+                return 0.0
+            for bucket in self.buckets.values():
+                bucket.refill(now)
+            return max(
+                0.0, min(bucket.tokens / bucket.capacity for bucket in self.buckets.values())
+            )
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current budget per bucket (for logging and reports)."""
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets.values():
+                bucket.refill(now)
+            return {name: round(bucket.tokens, 1) for name, bucket in self.buckets.items()}
+
+
+def _parse_header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Read a numeric header value, or None if absent or malformed."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by all agents and files."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
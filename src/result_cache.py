@@ -0,0 +1,278 @@
+"""
+Result Cache: Content-addressed on-disk cache of Layer 2 agent results.
+Keyed by draft hash, prompt hash and generation settings, stored in SQLite.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import (
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_MAX_BYTES,
+    RESULT_CACHE_MAX_AGE_DAYS,
+)
+
+# Cache modes (selected per run from the CLI)
+CACHE_MODE_USE = "use"  # Read hits, write misses
+CACHE_MODE_REFRESH = "refresh"  # Ignore hits, overwrite with fresh results
+CACHE_MODE_OFF = "off"  # Neither read nor write
+
+CACHE_MODES = (CACHE_MODE_USE, CACHE_MODE_REFRESH, CACHE_MODE_OFF)
+
+# Outcome of a cache lookup, recorded on the result as "cache" (results that
+# were never looked up, e.g. with --no-cache or --refresh, carry no marker)
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+
+# Per-call accounting fields: they describe the call that paid for a result,
+# so they are never stored (a cache hit costs nothing and took no API time)
+PER_CALL_FIELDS = (
+    "usage",
+    "cached",
+    "stop_reason",
+    "latency_s",
+    "queue_wait_s",
+    "retries",
+    "reissued",
+    "cost_usd",
+    "time_to_score_s",
+    "repairs",
+    "hedged",
+    "hedge_won",
+    "escalated_from",
+    "flag_locations",
+    "api_key",
+    "group_call",
+    "cache",
+)
+
+
+def sha256_text(text: str) -> str:
+    """Hex sha256 of a UTF-8 string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    content: str,
+    prompt_hash: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    layout: str = "standard",
+) -> str:
+    """
+    Build the content-addressed key for one agent call.
+
+    Args:
+        content: Draft content sent to the agent
+        prompt_hash: sha256 of the agent's prompt file (from the prompt registry)
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Output token limit
+        layout: Request layout, since it changes what the model sees
+
+    Returns:
+        Hex sha256 cache key
+    """
+    material = json.dumps(
+        {
+            "content": sha256_text(content),
+            "prompt": prompt_hash,
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "layout": layout,
+        },
+        sort_keys=True,
+    )
+    return sha256_text(material)
+
+
+# ============================================================================
+# SQLITE CACHE
+# ============================================================================
+
+
+class ResultCache:
+    """
+    Persistent cache of successful agent results.
+
+    Entries older than max_age_days are dropped, and the least recently
+    used entries are evicted once the stored results exceed max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: Path = RESULT_CACHE_PATH,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        max_age_days: float = RESULT_CACHE_MAX_AGE_DAYS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS agent_results (
+                cache_key TEXT PRIMARY KEY,
+                agent_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                result_json TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_agent_results_accessed "
+            "ON agent_results (last_accessed)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    def get(self, cache_key: str) -> Optional[Dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            cache_key: Key from make_cache_key
+
+        Returns:
+            The cached result dict (marked "cached": True and "cache": "hit"),
+            or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result_json, created_at FROM agent_results WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+
+            if row is None or now - row[1] > self.max_age_seconds:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE agent_results SET last_accessed = ? WHERE cache_key = ?",
+                (now, cache_key),
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        result = json.loads(row[0])
+        result["cached"] = True
+        result["cache"] = CACHE_HIT
+        return result
+
+    def put(self, cache_key: str, agent_id: str, model: str, result: Dict) -> None:
+        """
+        Store a successful result. Failed results are never cached.
+
+        Args:
+            cache_key: Key from make_cache_key
+            agent_id: Agent identifier
+            model: Model that produced the result
+            result: Parsed agent result
+        """
+        if not result.get("success"):
+            return
+
+        stored = {k: v for k, v in result.items() if k not in PER_CALL_FIELDS}
+        payload = json.dumps(stored, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO agent_results
+                    (cache_key, agent_id, model, result_json, size_bytes, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (cache_key, agent_id, model, payload, len(payload.encode("utf-8")), now, now),
+            )
+            self._conn.commit()
+            self.writes += 1
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Apply age- and size-based eviction.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            cutoff = time.time() - self.max_age_seconds
+            removed += self._conn.execute(
+                "DELETE FROM agent_results WHERE created_at < ?", (cutoff,)
+            ).rowcount
+
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM agent_results"
+            ).fetchone()[0]
+
+            if total > self.max_bytes:
+                # Drop least recently used entries until under the size cap
+                rows = self._conn.execute(
+                    "SELECT cache_key, size_bytes FROM agent_results ORDER BY last_accessed ASC"
+                ).fetchall()
+                for cache_key, size_bytes in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute(
+                        "DELETE FROM agent_results WHERE cache_key = ?", (cache_key,)
+                    )
+                    total -= size_bytes
+                    removed += 1
+
+            self._conn.commit()
+
+        self.evictions += removed
+        return removed
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process plus current cache size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM agent_results"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_cache: Optional[ResultCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, opening it on first use."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache()
+        return _shared_cache
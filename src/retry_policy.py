@@ -0,0 +1,157 @@
+"""
+Retry Policy: Error classification and backoff scheduling for Claude API calls.
+Decides whether and when a failed call is retried; the rate limiter does the waiting.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+import anthropic
+
+from config import MAX_RETRIES, RETRY_DELAY, RETRY_MAX_DELAY
+
+# ============================================================================
+# ERROR CLASSIFICATION
+# ============================================================================
+
+ERROR_RATE_LIMIT = "rate_limit"  # 429
+ERROR_OVERLOADED = "overloaded"  # 529
+ERROR_SERVER = "server_error"  # Other 5xx
+ERROR_TIMEOUT = "timeout"  # Client-side timeout or 408
+ERROR_CONNECTION = "connection"  # Network failure before a response
+ERROR_CLIENT = "client_error"  # Non-retryable 4xx (bad request, auth, ...)
+
+RETRYABLE_ERRORS = {
+    ERROR_RATE_LIMIT,
+    ERROR_OVERLOADED,
+    ERROR_SERVER,
+    ERROR_TIMEOUT,
+    ERROR_CONNECTION,
+}
+
+# Errors that signal API-wide pressure: every caller should back off, not just this one
+GLOBAL_BACKOFF_ERRORS = {ERROR_RATE_LIMIT, ERROR_OVERLOADED}
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Map an exception from the Anthropic SDK to an error class.
+
+    Args:
+        error: Exception raised by a messages.create / messages.stream call
+
+    Returns:
+        One of the ERROR_* constants
+    """
+    # APITimeoutError subclasses APIConnectionError, so check it first
+    if isinstance(error, anthropic.APITimeoutError):
+        return ERROR_TIMEOUT
+    if isinstance(error, anthropic.APIConnectionError):
+        return ERROR_CONNECTION
+
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return ERROR_CLIENT
+    if status == 429:
+        return ERROR_RATE_LIMIT
+    if status == 529:
+        return ERROR_OVERLOADED
+    if status >= 500:
+        return ERROR_SERVER
+    if status == 408:
+        return ERROR_TIMEOUT
+    return ERROR_CLIENT
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the server's requested delay from retry-after-ms / retry-after headers.
+
+    Args:
+        error: Exception raised by the SDK (may carry an HTTP response)
+
+    Returns:
+        Delay in seconds, or None if the server did not ask for one
+    """
+    response = getattr(error, "response", None)
+    headers: Optional[Mapping[str, str]] = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ============================================================================
+# BACKOFF SCHEDULING
+# ============================================================================
+
+
+class RetryPolicy:
+    """
+    Decorrelated-jitter backoff that honours retry-after.
+
+    Each delay is drawn uniformly from [base_delay, 3 * previous_delay] and
+    capped at max_delay, so concurrent workers that fail together spread
+    their retries out instead of retrying in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = MAX_RETRIES,
+        base_delay: float = RETRY_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def next_delay(
+        self,
+        error_class: str,
+        attempt: int,
+        previous_delay: float,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether to retry and how long to wait first.
+
+        Args:
+            error_class: Result of classify_error
+            attempt: Number of retries already made for this call
+            previous_delay: Delay used before the previous retry (0 for the first)
+            retry_after: Server-requested delay, if any
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if error_class not in RETRYABLE_ERRORS or attempt >= self.max_retries:
+            return None
+
+        upper = max(self.base_delay, previous_delay * 3)
+        delay = min(self.max_delay, random.uniform(self.base_delay, upper))
+
+        if retry_after is not None:
+            # Never retry earlier than the server asked us to
+            delay = max(delay, retry_after)
+
+        return delay
@@ -4,16 +4,32 @@ Combines Layer 1 (Regex) and Layer 2 (LLM) results into final report.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from config import (
+    MODEL_NAME,
     SUB_PARAMETERS,
     WEIGHTS_PARAMETERS,
     GATE_1_THRESHOLD,
     GATE_2_TONE_MINIMUM,
     SCORE_SCALE,
+    PROMPT_CACHE_LAYOUT,
+    LAYER_2_MODE_FULL,
+    LAYER_2_MODE_GROUPED,
+    LAYER_2_MODE_TRIAGE,
+    LAYER_2_MODE_CASCADE,
+    CASCADE_ALWAYS_ESCALATE,
     get_parameter_agents,
 )
+from result_cache import CACHE_HIT
+
+# Gate inputs: Gate 2 reads this parameter's score, Gate 3 these agents' scores
+GATE_2_PARAMETER = "P1_Challenger_Tone"
+GATE_3_AGENTS = ("2B_Contextual", "2C_Persona")
+
+# Scores assumed for agents that have not answered yet when bounding the verdict
+PENDING_SCORE_MIN = 1
+PENDING_SCORE_MAX = 4
 
 
 # ============================================================================
@@ -153,7 +169,7 @@ def evaluate_gates(
         gate_1_pass = None
 
     # Gate 2: Tone minimum (Boredom Veto)
-    tone_score = parameter_scores.get("P1_Challenger_Tone", {}).get("parameter_score")
+    tone_score = parameter_scores.get(GATE_2_PARAMETER, {}).get("parameter_score")
     if GATE_2_TONE_MINIMUM is not None and tone_score is not None:
         gate_2_pass = tone_score >= GATE_2_TONE_MINIMUM
     else:
@@ -222,6 +238,9 @@ def generate_report(
     content_id: str,
     layer_1_flags: List[Dict],
     layer_2_results: Dict[str, Dict],
+    layer_2_skipped: bool = False,
+    segments: Optional[Dict] = None,
+    normalization: Optional[Dict] = None,
 ) -> Dict:
     """
     Generate the complete JSON report combining all analysis results.
@@ -230,37 +249,38 @@ def generate_report(
         content_id: Identifier for the content (e.g., filename)
         layer_1_flags: Violation flags from regex checks
         layer_2_results: Results from all LLM agents
+        layer_2_skipped: Layer 2 was not run because Layer 1 already vetoed
+            the draft (fast-fail); the report carries no overall score
+        segments: Segment hashes, per-agent segment dependencies and reused
+            agents (recorded so the next analysis of an edited draft can
+            reuse results whose segments did not change)
+        normalization: normalizer.normalization_summary() of the draft the
+            agents were sent (None when it was sent as-is)
 
     Returns:
         Complete report dictionary (ready for JSON serialization)
     """
-    # Combine Layer 1 results with Layer 2 results
-    # Layer 1 contributes to 2A_Mechanical
-    all_results = dict(layer_2_results)  # Copy Layer 2 results
-
-    # Add Layer 1 as 2A_Mechanical result
-    all_results["2A_Mechanical"] = {
-        "agent_id": "2A_Mechanical",
-        "success": True,
-        "score": 4 if len(layer_1_flags) == 0 else 1,  # Perfect or fail
-        "feedback": (
-            "No mechanical violations found."
-            if len(layer_1_flags) == 0
-            else f"Found {len(layer_1_flags)} mechanical violation(s)."
-        ),
-        "flags": layer_1_flags,
-    }
-
-    # Calculate parameter-level scores
-    parameter_scores = {}
-    for param_id in WEIGHTS_PARAMETERS.keys():
-        parameter_scores[param_id] = calculate_parameter_score(param_id, all_results)
-
-    # Calculate overall score
-    overall_score = calculate_overall_score(parameter_scores)
-
-    # Evaluate 3-Gate system
-    gates_result = evaluate_gates(overall_score, parameter_scores, layer_1_flags)
+    parameter_scores, overall_score, gates_result = score_results(layer_1_flags, layer_2_results)
+
+    # Triage runs skip agents once the verdict is decided: gates come from
+    # the bounds over those agents' possible scores, not from a partial average
+    skipped = [agent_id for agent_id, result in layer_2_results.items() if result.get("skipped")]
+    triage = None
+    if layer_2_skipped:
+        overall_score = None
+    if skipped:
+        completed = {
+            agent_id: result
+            for agent_id, result in layer_2_results.items()
+            if not result.get("skipped")
+        }
+        bounds = compute_verdict_bounds(layer_1_flags, completed, skipped)
+        gates_result = bounds["gates"]
+        triage = {
+            "skipped": skipped,
+            "overall_score_bounds": bounds["overall_score_bounds"],
+            "tone_score_bounds": bounds["tone_score_bounds"],
+        }
 
     # Build parameter breakdown for report
     parameters_report = {}
@@ -283,6 +303,9 @@ def generate_report(
             # Only include flags if they exist and are non-empty
             if sub_data["flags"]:
                 sub_params_report[agent_id]["flags"] = sub_data["flags"]
+            flag_locations = layer_2_results.get(agent_id, {}).get("flag_locations")
+            if flag_locations:
+                sub_params_report[agent_id]["flag_locations"] = flag_locations
 
         parameters_report[param_id] = {
             "parameter_score": param_data["parameter_score"],
@@ -291,14 +314,38 @@ def generate_report(
             "sub_parameters": sub_params_report,
         }
 
+    cascade = summarize_cascade(layer_2_results)
+
     # Build complete report
     report = {
         "metadata": {
             "content_id": content_id,
             "timestamp": datetime.now().isoformat(),
-            "model_used": "claude-sonnet-4-5-20250929",
+            "model_used": MODEL_NAME,
             "threshold_gate_1": GATE_1_THRESHOLD,
             "threshold_gate_2_tone": GATE_2_TONE_MINIMUM,
+            "layer_2_mode": (
+                None
+                if layer_2_skipped
+                else LAYER_2_MODE_TRIAGE
+                if skipped
+                else LAYER_2_MODE_CASCADE
+                if cascade
+                else LAYER_2_MODE_GROUPED
+                if any(result.get("grouped") for result in layer_2_results.values())
+                else LAYER_2_MODE_FULL
+            ),
+            "prompt_cache": summarize_prompt_cache(layer_2_results),
+            "result_cache": summarize_result_cache(layer_2_results),
+            "accounting": summarize_accounting(layer_2_results),
+            "json_repair": summarize_json_repair(layer_2_results),
+            "hedging": summarize_hedging(layer_2_results),
+            "cascade": cascade,
+            "prompt_versions": {
+                agent_id: result["prompt_version"]
+                for agent_id, result in layer_2_results.items()
+                if result.get("prompt_version")
+            },
         },
         "results": {
             "overall_score": round(overall_score, 2) if overall_score is not None else None,
@@ -313,10 +360,218 @@ def generate_report(
         },
         "parameters": parameters_report,
     }
+    if layer_2_skipped:
+        report["metadata"]["layer_2_skipped"] = {
+            "reason": "layer_1_critical",
+            "critical_violations": gates_result["critical_violations_count"],
+        }
+    elif triage:
+        report["metadata"]["triage"] = triage
+    if segments:
+        report["metadata"]["segments"] = segments
+    resumed = sorted(agent_id for agent_id, result in layer_2_results.items() if result.get("resumed"))
+    if resumed:
+        report["metadata"]["resumed_from_journal"] = resumed
+    if normalization:
+        report["metadata"]["normalization"] = {
+            **normalization,
+            "estimated_tokens_saved": normalization["estimated_tokens_saved_per_call"]
+            * report["metadata"]["accounting"]["document"]["api_calls"],
+        }
 
     return report
 
 
+# ============================================================================
+# VERDICT BOUNDS (TRIAGE MODE)
+# ============================================================================
+
+
+def score_results(
+    layer_1_flags: List[Dict], layer_2_results: Dict[str, Dict]
+) -> Tuple[Dict[str, Dict], Optional[float], Dict]:
+    """
+    Run the two-level aggregation and the gates over a set of agent results.
+
+    Args:
+        layer_1_flags: Violation flags from regex checks
+        layer_2_results: Results from the LLM agents, by agent_id
+
+    Returns:
+        Tuple of (parameter scores, overall score, gates result)
+    """
+    # Combine Layer 1 results with Layer 2 results
+    # Layer 1 contributes to 2A_Mechanical
+    all_results = dict(layer_2_results)  # Copy Layer 2 results
+
+    # Add Layer 1 as 2A_Mechanical result
+    all_results["2A_Mechanical"] = {
+        "agent_id": "2A_Mechanical",
+        "success": True,
+        "score": 4 if len(layer_1_flags) == 0 else 1,  # Perfect or fail
+        "feedback": (
+            "No mechanical violations found."
+            if len(layer_1_flags) == 0
+            else f"Found {len(layer_1_flags)} mechanical violation(s)."
+        ),
+        "flags": layer_1_flags,
+    }
+
+    # Calculate parameter-level scores
+    parameter_scores = {}
+    for param_id in WEIGHTS_PARAMETERS.keys():
+        parameter_scores[param_id] = calculate_parameter_score(param_id, all_results)
+
+    # Calculate overall score
+    overall_score = calculate_overall_score(parameter_scores)
+
+    # Evaluate 3-Gate system
+    gates_result = evaluate_gates(overall_score, parameter_scores, layer_1_flags)
+
+    return parameter_scores, overall_score, gates_result
+
+
+def compute_verdict_bounds(
+    layer_1_flags: List[Dict],
+    completed_results: Dict[str, Dict],
+    pending_agents: Iterable[str],
+) -> Dict:
+    """
+    Bound the final verdict while some agents have not answered.
+
+    Every score feeds the overall score, the tone score and Gate 3
+    monotonically, so filling the pending agents with PENDING_SCORE_MIN
+    gives the worst possible outcome and PENDING_SCORE_MAX the best.
+    publish_ready is decided once the worst case is publish-ready or the
+    best case is not. Pending agents are assumed to succeed (a failed
+    agent is left out of the averages, which can move them either way).
+
+    Args:
+        layer_1_flags: Violation flags from regex checks
+        completed_results: Results of the agents that have finished
+        pending_agents: Agents still running, queued or skipped
+
+    Returns:
+        Dictionary with decided, overall_score_bounds, tone_score_bounds
+        and gates (an evaluate_gates-shaped result; each gate is None while
+        it is still open, and publish_ready is None until decided)
+    """
+    pending = list(pending_agents)
+
+    def filled(score: int) -> Dict[str, Dict]:
+        results = dict(completed_results)
+        for agent_id in pending:
+            results[agent_id] = {
+                "agent_id": agent_id,
+                "success": True,
+                "score": score,
+                "feedback": "",
+                "flags": [],
+            }
+        return results
+
+    worst_params, worst_overall, worst = score_results(layer_1_flags, filled(PENDING_SCORE_MIN))
+    best_params, best_overall, best = score_results(layer_1_flags, filled(PENDING_SCORE_MAX))
+
+    def gate(name: str) -> Optional[bool]:
+        if worst[name] is True:
+            return True
+        if best[name] is False:
+            return False
+        return None
+
+    if worst["publish_ready"] is True:
+        decided, publish_ready, status = True, True, worst["status"]
+    elif best["publish_ready"] is False:
+        decided, publish_ready, status = True, False, best["status"]
+    else:
+        decided, publish_ready, status = False, None, "Undecided"
+
+    def rounded(value: Optional[float]) -> Optional[float]:
+        return round(value, 2) if value is not None else None
+
+    return {
+        "decided": decided,
+        "overall_score_bounds": [rounded(worst_overall), rounded(best_overall)],
+        "tone_score_bounds": [
+            rounded(worst_params[GATE_2_PARAMETER]["parameter_score"]),
+            rounded(best_params[GATE_2_PARAMETER]["parameter_score"]),
+        ],
+        "gates": {
+            "gate_1_overall_threshold_met": gate("gate_1_overall_threshold_met"),
+            "gate_2_tone_veto_passed": gate("gate_2_tone_veto_passed"),
+            "gate_3_brand_veto_passed": gate("gate_3_brand_veto_passed"),
+            "publish_ready": publish_ready,
+            "status": status,
+            # Violations already found (pending agents counted as passing)
+            "critical_violations_count": best["critical_violations_count"],
+        },
+    }
+
+
+def triage_order(agent_ids: List[str]) -> List[str]:
+    """
+    Order agents for triage: gate-critical agents first (the Gate 2 tone
+    agents and the Gate 3 brand agents), then by weight in the overall score.
+    """
+    tone_agents = set(get_parameter_agents(GATE_2_PARAMETER))
+
+    def key(agent_id: str) -> Tuple[int, float]:
+        metadata = SUB_PARAMETERS[agent_id]
+        gate_critical = agent_id in tone_agents or agent_id in GATE_3_AGENTS
+        weight = metadata["weight"] * WEIGHTS_PARAMETERS[metadata["parameter"]]
+        return (0 if gate_critical else 1, -weight)
+
+    return sorted(agent_ids, key=key)
+
+
+# ============================================================================
+# MODEL CASCADE
+# ============================================================================
+
+
+def cascade_escalations(
+    layer_1_flags: List[Dict], layer_2_results: Dict[str, Dict], margin: float
+) -> Dict[str, str]:
+    """
+    Decide which cheap-model results must be re-scored by the primary model.
+
+    Args:
+        layer_1_flags: Violation flags from regex checks
+        layer_2_results: First-tier (cheap model) results, by agent_id
+        margin: Distance from a gate threshold within which the verdict is in doubt
+
+    Returns:
+        Dictionary mapping agent_id to the reason it is escalated
+    """
+    parameter_scores, overall_score, _ = score_results(layer_1_flags, layer_2_results)
+    tone_score = parameter_scores[GATE_2_PARAMETER]["parameter_score"]
+
+    near_gate_1 = (
+        GATE_1_THRESHOLD is not None
+        and overall_score is not None
+        and abs(overall_score - GATE_1_THRESHOLD) <= margin
+    )
+    near_gate_2 = (
+        GATE_2_TONE_MINIMUM is not None
+        and tone_score is not None
+        and abs(tone_score - GATE_2_TONE_MINIMUM) <= margin
+    )
+    tone_agents = set(get_parameter_agents(GATE_2_PARAMETER))
+
+    escalations = {}
+    for agent_id, result in layer_2_results.items():
+        if agent_id in CASCADE_ALWAYS_ESCALATE:
+            escalations[agent_id] = "gate_3_veto_agent"
+        elif not result.get("success"):
+            escalations[agent_id] = "failed"
+        elif near_gate_1:
+            escalations[agent_id] = "near_gate_1"
+        elif near_gate_2 and agent_id in tone_agents:
+            escalations[agent_id] = "near_gate_2"
+    return escalations
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -329,6 +584,215 @@ def format_score_label(score: Optional[int]) -> str:
     return SCORE_SCALE.get(score, {}).get("label", "Unknown")
 
 
+def call_records(results: Iterable[Dict]) -> List[Dict]:
+    """
+    The accounting record of every API call behind a set of agent results.
+
+    A single-agent result carries its own call stats. The agents of a
+    grouped call share one "group_call" record (with "group" and
+    "agent_ids"), which is returned once.
+
+    Args:
+        results: Agent results
+
+    Returns:
+        Results and group call records, each call exactly once
+    """
+    records = []
+    seen_groups = set()
+    for result in results:
+        group_call = result.get("group_call")
+        if group_call is None:
+            records.append(result)
+        elif id(group_call) not in seen_groups:
+            seen_groups.add(id(group_call))
+            records.append(group_call)
+    return records
+
+
+def summarize_prompt_cache(layer_2_results: Dict[str, Dict]) -> Dict:
+    """Total prompt-cache token counters across all agent results."""
+    creation = 0
+    read = 0
+    for result in call_records(layer_2_results.values()):
+        usage = result.get("usage") or {}
+        creation += usage.get("cache_creation_input_tokens", 0)
+        read += usage.get("cache_read_input_tokens", 0)
+    return {
+        "layout_enabled": PROMPT_CACHE_LAYOUT,
+        "cache_creation_input_tokens": creation,
+        "cache_read_input_tokens": read,
+    }
+
+
+def summarize_result_cache(layer_2_results: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Hits and misses of the result cache lookups made for this run.
+
+    Only results marked by a lookup count: reused, resumed and skipped
+    results, and calls made with --no-cache or --refresh, are neither.
+    """
+    lookups = [
+        result["cache"]
+        for result in layer_2_results.values()
+        if result.get("cache") and not result.get("resumed")
+    ]
+    hits = lookups.count(CACHE_HIT)
+    return {"hits": hits, "misses": len(lookups) - hits}
+
+
+def summarize_json_repair(layer_2_results: Dict[str, Dict]) -> Dict:
+    """Agents whose malformed JSON was repaired instead of failing (and re-called)."""
+    agents = {
+        agent_id: result["repairs"]
+        for agent_id, result in layer_2_results.items()
+        if result.get("repairs")
+    }
+    return {"repaired": len(agents), "agents": agents}
+
+
+def summarize_hedging(layer_2_results: Dict[str, Dict]) -> Dict:
+    """Agents whose call was hedged, and which of the two requests answered first."""
+    agents = {
+        agent_id: "hedge" if result.get("hedge_won") else "primary"
+        for agent_id, result in layer_2_results.items()
+        if result.get("hedged")
+    }
+    return {"hedged": len(agents), "agents": agents}
+
+
+def summarize_cascade(layer_2_results: Dict[str, Dict]) -> Optional[Dict]:
+    """
+    Model that produced each agent's score in a cascade run, and why agents
+    were escalated to the primary model (None for single-model runs).
+    """
+    models = {
+        agent_id: result.get("model")
+        for agent_id, result in layer_2_results.items()
+        if result.get("model")
+    }
+    escalated = {
+        agent_id: result["escalated_from"]["reason"]
+        for agent_id, result in layer_2_results.items()
+        if result.get("escalated_from")
+    }
+    # Fake backend responses name "fake:<model>"
+    if not escalated and all(model.rpartition(":")[2] == MODEL_NAME for model in models.values()):
+        return None
+    return {"models": models, "escalated": escalated}
+
+
+# Token counters summed by summarize_accounting
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+def _empty_accounting() -> Dict:
+    """Zeroed accounting totals."""
+    totals = {field: 0 for field in USAGE_FIELDS}
+    totals.update(
+        {"cost_usd": 0.0, "api_calls": 0, "retries": 0, "latency_s": 0.0, "max_latency_s": 0.0}
+    )
+    return totals
+
+
+def _add_accounting(totals: Dict, result: Dict) -> None:
+    """Add one agent result's call accounting to running totals."""
+    usage = result.get("usage") or {}
+    for field in USAGE_FIELDS:
+        totals[field] += usage.get(field, 0)
+    totals["cost_usd"] += result.get("cost_usd") or 0.0
+    totals["retries"] += result.get("retries", 0)
+    if "latency_s" in result:
+        totals["api_calls"] += 1
+        totals["latency_s"] += result["latency_s"]
+        totals["max_latency_s"] = max(totals["max_latency_s"], result["latency_s"])
+    if result.get("escalated_from"):
+        # The cheap-model call that was replaced was paid for too
+        _add_accounting(totals, result["escalated_from"])
+
+
+def summarize_accounting(layer_2_results: Dict[str, Dict]) -> Dict:
+    """
+    Roll per-agent token, cost, latency and retry counters up per parameter
+    and per document.
+
+    Cached results carry no call accounting and therefore count as zero cost.
+    latency_s is the summed wall-clock time of the calls (they overlap when
+    run concurrently); max_latency_s is the slowest single call. A grouped
+    call is accounted once, to its parameter and under "groups"; its agents'
+    rows name the group instead of carrying a share of it.
+
+    Args:
+        layer_2_results: Results from all LLM agents
+
+    Returns:
+        Dict with "document", "parameters" and "agents" sections, plus a
+        "groups" section for grouped calls and a "keys" section when the
+        calls were spread over several API keys
+    """
+    document = _empty_accounting()
+    parameters = {param_id: _empty_accounting() for param_id in WEIGHTS_PARAMETERS}
+    keys: Dict[str, Dict] = {}
+    groups: Dict[str, Dict] = {}
+    agents = {}
+
+    for call in call_records(layer_2_results.values()):
+        if "agent_ids" in call:
+            param_id = call["group"]
+            groups[param_id] = _empty_accounting()
+            groups[param_id]["agents"] = call["agent_ids"]
+            _add_accounting(groups[param_id], call)
+        else:
+            param_id = SUB_PARAMETERS.get(call.get("agent_id"), {}).get("parameter")
+        _add_accounting(document, call)
+        if param_id in parameters:
+            _add_accounting(parameters[param_id], call)
+        if call.get("api_key"):
+            _add_accounting(keys.setdefault(call["api_key"], _empty_accounting()), call)
+
+    for agent_id, result in layer_2_results.items():
+        if result.get("group_call"):
+            agents[agent_id] = {
+                "model": result.get("model") or result["group_call"].get("model"),
+                "cached": False,
+                "group": result["group_call"]["group"],
+            }
+            continue
+
+        usage = result.get("usage") or {}
+        agents[agent_id] = {
+            "model": result.get("model"),
+            "cached": bool(result.get("cached")),
+            **{field: usage.get(field, 0) for field in USAGE_FIELDS},
+            "stop_reason": result.get("stop_reason"),
+            "cost_usd": result.get("cost_usd") or 0.0,
+            "latency_s": result.get("latency_s"),
+            "queue_wait_s": result.get("queue_wait_s"),
+            "retries": result.get("retries", 0),
+            "reissued": bool(result.get("reissued")),
+        }
+        if result.get("escalated_from"):
+            agents[agent_id]["escalated_from"] = result["escalated_from"]["model"]
+        if result.get("api_key"):
+            agents[agent_id]["api_key"] = result["api_key"]
+
+    for totals in [document, *parameters.values(), *keys.values(), *groups.values()]:
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        totals["latency_s"] = round(totals["latency_s"], 3)
+
+    accounting = {"document": document, "parameters": parameters, "agents": agents}
+    if groups:
+        accounting["groups"] = groups
+    if keys:
+        accounting["keys"] = keys
+    return accounting
+
+
 def count_violations_by_severity(flags: List[Dict]) -> Dict[str, int]:
     """Count violations by severity level."""
     counts = {"Critical": 0, "High": 0, "Medium": 0, "Low": 0}
@@ -0,0 +1,363 @@
+"""
+Segmenter: Splits a markdown draft into headline, intro, H2 sections and structure.
+Segment hashes let re-analysis of an edited draft reuse results of agents whose segments did not change;
+per-agent input views send narrow agents only the part of the draft they judge.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from config import (
+    CHARS_PER_TOKEN,
+    SEGMENT_HEADLINE,
+    SEGMENT_INTRO,
+    SEGMENT_SECTIONS,
+    SEGMENT_STRUCTURE,
+    INPUT_VIEW_FULL,
+    INPUT_VIEW_HEADLINE_INTRO,
+    INPUT_VIEW_OUTLINE,
+    INPUT_VIEW_FIRST_N_TOKENS,
+    INPUT_VIEW_TOKENS,
+    get_agent_input_view,
+)
+
+# Length of the segment hashes recorded in reports
+SEGMENT_HASH_LENGTH = 16
+
+# Paragraph size 3B_Scannability treats as a "wall of text". The structure
+# segment only records whether a paragraph crosses it, so rewording a
+# paragraph does not invalidate the scannability score.
+WALL_OF_TEXT_WORDS = 80
+WALL_OF_TEXT_SENTENCES = 5
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_SENTENCE_END = re.compile(r"[.!?](?:\s|$)")
+
+# Block kinds produced by _blocks()
+BLOCK_HEADING = "heading"
+BLOCK_PARAGRAPH = "paragraph"
+BLOCK_LIST_ITEM = "list_item"
+BLOCK_TABLE = "table"
+BLOCK_QUOTE = "quote"
+BLOCK_CODE = "code"
+
+# First line of each partial view, so the agent knows what it is looking at
+VIEW_NOTES = {
+    INPUT_VIEW_HEADLINE_INTRO: "[Excerpt: the headline and introduction only. The body of the draft is omitted.]",
+    INPUT_VIEW_OUTLINE: (
+        "[Outline only: headings are verbatim; every other block is summarized by its "
+        "kind and size, and marked bold if it contains **bold** text.]"
+    ),
+    INPUT_VIEW_FIRST_N_TOKENS: "[Excerpt: the first ~{tokens} tokens of the draft. The rest is omitted.]",
+}
+
+# Documents whose views are kept (one per document in flight is enough)
+VIEW_CACHE_SIZE = 8
+
+
+def _hash(text: str) -> str:
+    """Short hash of a segment's text, ignoring trailing whitespace per line."""
+    normalized = "\n".join(line.rstrip() for line in text.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:SEGMENT_HASH_LENGTH]
+
+
+def _heading_level(line: str, in_fence: bool) -> int:
+    """Markdown heading level of a line (0 if it is not a heading)."""
+    if in_fence:
+        return 0
+    match = _HEADING.match(line)
+    return len(match.group(1)) if match else 0
+
+
+def _blocks(content: str) -> List[Tuple[str, str]]:
+    """
+    Split a draft into (kind, text) blocks in document order.
+
+    Paragraphs are blank-line separated runs of text; consecutive table or
+    quote lines form one block; unmarked lines right after a list item
+    continue it. Code fences become a single code block.
+    """
+    blocks: List[Tuple[str, List[str]]] = []
+    in_fence = False
+
+    def add(kind: str, line: str, merge: bool) -> None:
+        if merge and blocks and blocks[-1][0] == kind:
+            blocks[-1][1].append(line)
+        else:
+            blocks.append((kind, [line]))
+
+    previous_blank = True
+    for line in content.splitlines():
+        stripped = line.strip()
+        if _FENCE.match(line):
+            if not in_fence:
+                blocks.append((BLOCK_CODE, []))
+            in_fence = not in_fence
+            previous_blank = False
+            continue
+        if in_fence:
+            blocks[-1][1].append(line)
+            continue
+        if not stripped:
+            previous_blank = True
+            continue
+
+        if _HEADING.match(stripped):
+            add(BLOCK_HEADING, stripped, False)
+        elif _LIST_ITEM.match(line):
+            add(BLOCK_LIST_ITEM, stripped, False)
+        elif stripped.startswith("|"):
+            add(BLOCK_TABLE, stripped, not previous_blank)
+        elif stripped.startswith(">"):
+            add(BLOCK_QUOTE, stripped.lstrip("> "), not previous_blank)
+        elif not previous_blank and blocks and blocks[-1][0] in (BLOCK_PARAGRAPH, BLOCK_LIST_ITEM):
+            # Continuation line of a paragraph or list item
+            blocks[-1][1].append(stripped)
+        else:
+            add(BLOCK_PARAGRAPH, stripped, False)
+        previous_blank = False
+
+    return [(kind, "\n".join(lines)) for kind, lines in blocks]
+
+
+def _is_wall_of_text(text: str) -> bool:
+    """True for a paragraph 3B_Scannability would call a wall of text."""
+    return (
+        len(text.split()) > WALL_OF_TEXT_WORDS
+        or len(_SENTENCE_END.findall(text)) > WALL_OF_TEXT_SENTENCES
+    )
+
+
+def outline(content: str) -> str:
+    """
+    Structural outline of a draft, hashed as the structure segment.
+
+    Headings are kept verbatim; every other block is reduced to its kind,
+    whether it carries bold text and (for paragraphs) whether it is a wall
+    of text, so rewording inside a block does not change the outline.
+
+    Args:
+        content: Draft content
+
+    Returns:
+        Outline text, one entry per block
+    """
+    entries = []
+    for kind, text in _blocks(content):
+        if kind == BLOCK_HEADING:
+            entries.append(text)
+            continue
+        entry = kind
+        if kind == BLOCK_PARAGRAPH and _is_wall_of_text(text):
+            entry += " long"
+        if "**" in text:
+            entry += " bold"
+        entries.append(entry)
+    return "\n".join(entries)
+
+
+def segment_markdown(content: str) -> Dict:
+    """
+    Split a draft into its segments.
+
+    The headline is the first H1 when the draft opens with one, otherwise
+    its first non-blank line (plain-text drafts). The intro runs from the
+    headline to the first H2; each H2 starts a section that runs to the
+    next H2. Headings inside code fences are ignored.
+
+    Args:
+        content: Draft content
+
+    Returns:
+        Dict with "headline" and "intro" (str), "sections" (list of
+        {"heading", "text"}) and "structure" (outline text)
+    """
+    lines = content.splitlines()
+    headline = ""
+    start = 0
+    for i, line in enumerate(lines):
+        if line.strip():
+            if _heading_level(line, False) in (0, 1):
+                headline = line.strip()
+                start = i + 1
+            break
+
+    intro: List[str] = []
+    sections: List[Dict] = []
+    in_fence = False
+    for line in lines[start:]:
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        if _heading_level(line, in_fence) == 2:
+            sections.append({"heading": line.strip(), "lines": [line]})
+        elif sections:
+            sections[-1]["lines"].append(line)
+        else:
+            intro.append(line)
+
+    return {
+        "headline": headline,
+        "intro": "\n".join(intro).strip(),
+        "sections": [
+            {"heading": section["heading"], "text": "\n".join(section["lines"]).strip()}
+            for section in sections
+        ],
+        "structure": outline(content),
+    }
+
+
+def segment_hashes(segments: Dict) -> Dict:
+    """
+    Hashes of a segmented draft, as recorded in the report.
+
+    Args:
+        segments: Output of segment_markdown()
+
+    Returns:
+        Dict with "hashes" (one per SEGMENT_* name; the sections hash covers
+        every section in order) and "sections" (heading and hash per section).
+        A draft without an intro hashes its sections as the intro, since
+        headline_intro agents are then sent the opening of the body.
+    """
+    sections = [
+        {"heading": section["heading"], "hash": _hash(section["text"])}
+        for section in segments["sections"]
+    ]
+    intro = segments["intro"] or "\n\n".join(section["text"] for section in segments["sections"])
+    return {
+        "hashes": {
+            SEGMENT_HEADLINE: _hash(segments["headline"]),
+            SEGMENT_INTRO: _hash(intro),
+            SEGMENT_SECTIONS: _hash("\n".join(section["hash"] for section in sections)),
+            SEGMENT_STRUCTURE: _hash(segments["structure"]),
+        },
+        "sections": sections,
+    }
+
+
+def changed_segments(previous: Dict[str, str], current: Dict[str, str]) -> List[str]:
+    """
+    Segment names whose hash differs between two reports.
+
+    Args:
+        previous: "hashes" recorded in the previous report
+        current: "hashes" of the draft being analyzed
+
+    Returns:
+        Changed segment names (a segment missing from either side counts as changed)
+    """
+    return [name for name, value in current.items() if previous.get(name) != value]
+
+
+# ============================================================================
+# PER-AGENT INPUT VIEWS
+# ============================================================================
+
+
+def _describe_block(kind: str, text: str) -> str:
+    """One outline_only line for a block that is not a heading."""
+    if kind == BLOCK_TABLE:
+        detail = f"{len(text.splitlines())} rows"
+    elif kind == BLOCK_CODE:
+        detail = f"{len(text.splitlines())} lines"
+    else:
+        detail = f"{len(text.split())} words"
+        if kind == BLOCK_PARAGRAPH:
+            sentences = max(1, len(_SENTENCE_END.findall(text)))
+            detail += f", {sentences} sentence{'s' if sentences != 1 else ''}"
+    if "**" in text:
+        detail += ", bold"
+    label = kind.replace("_", " ")
+    return f"- [{label}: {detail}]" if kind == BLOCK_LIST_ITEM else f"[{label}: {detail}]"
+
+
+def outline_view(content: str) -> str:
+    """
+    Outline of a draft for agents that judge hierarchy and scannability.
+
+    Args:
+        content: Draft content
+
+    Returns:
+        Headings verbatim and one size summary per other block
+    """
+    return "\n".join(
+        text if kind == BLOCK_HEADING else _describe_block(kind, text)
+        for kind, text in _blocks(content)
+    )
+
+
+def first_tokens(content: str, tokens: int = INPUT_VIEW_TOKENS) -> str:
+    """
+    Opening of a draft up to roughly `tokens` tokens, cut at a line break
+    (or failing that a word break) so no sentence fragment is left dangling.
+
+    Args:
+        content: Draft content
+        tokens: Approximate token budget (CHARS_PER_TOKEN characters each)
+
+    Returns:
+        The opening of the draft (the whole draft if it fits)
+    """
+    limit = int(tokens * CHARS_PER_TOKEN)
+    if len(content) <= limit:
+        return content
+    cut = content.rfind("\n", 0, limit)
+    if cut < limit // 2:
+        cut = content.rfind(" ", 0, limit)
+    return content[: cut if cut > 0 else limit].rstrip()
+
+
+@lru_cache(maxsize=VIEW_CACHE_SIZE)
+def input_views(content: str) -> Dict[str, str]:
+    """
+    Every input view of a draft, built once per document and shared by all
+    of its agent calls (and their retries).
+
+    A draft whose headline runs straight into an H2 has no intro; its
+    headline_intro view is then the first_n_tokens view, so the agents
+    judging the lead still see one.
+
+    Args:
+        content: Draft content
+
+    Returns:
+        Dict mapping INPUT_VIEW_* name to the text sent to the agent
+    """
+    segments = segment_markdown(content)
+    headline_intro = "\n\n".join(
+        part for part in (segments["headline"], segments["intro"]) if part
+    )
+    views = {
+        INPUT_VIEW_FULL: content,
+        INPUT_VIEW_HEADLINE_INTRO: headline_intro,
+        INPUT_VIEW_OUTLINE: outline_view(content),
+        INPUT_VIEW_FIRST_N_TOKENS: first_tokens(content),
+    }
+    for name, note in VIEW_NOTES.items():
+        if views[name] != content:
+            views[name] = f"{note.format(tokens=INPUT_VIEW_TOKENS)}\n\n{views[name]}"
+    if not segments["intro"]:
+        views[INPUT_VIEW_HEADLINE_INTRO] = views[INPUT_VIEW_FIRST_N_TOKENS]
+    return views
+
+
+def agent_input(agent_id: str, content: str) -> str:
+    """
+    Text an agent is asked to score: its configured input view of the draft.
+
+    Args:
+        agent_id: Agent identifier
+        content: Full draft content
+
+    Returns:
+        The view text (the full draft for agents with the "full" view)
+    """
+    view = get_agent_input_view(agent_id)
+    if view == INPUT_VIEW_FULL:
+        return content
+    return input_views(content)[view]
@@ -0,0 +1,182 @@
+"""
+Token Counter: Pre-flight input-token counts for agent requests.
+Calibrates a cheap character-based estimate against the usage the API reports.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import (
+    CHARS_PER_TOKEN,
+    ITPM_LIMIT,
+    TOKEN_CALIBRATION_PATH,
+)
+
+# Token counting methods (TOKEN_COUNT_METHOD in config.py)
+TOKEN_COUNT_ESTIMATE = "estimate"  # Local estimator with a learned calibration factor
+TOKEN_COUNT_API = "api"  # messages.count_tokens endpoint (exact, one extra call per agent)
+
+TOKEN_COUNT_METHODS = (TOKEN_COUNT_ESTIMATE, TOKEN_COUNT_API)
+
+# Weight given to each new observation in the calibration factor
+CALIBRATION_SMOOTHING = 0.2
+
+# Exact counts remembered per request (avoids recounting on retry / resume)
+EXACT_COUNT_CACHE_SIZE = 512
+
+
+class DocumentTooLargeError(ValueError):
+    """Raised when a single agent's input can never fit the ITPM budget."""
+
+    def __init__(self, agent_id: str, input_tokens: int, limit: int = ITPM_LIMIT):
+        self.agent_id = agent_id
+        self.input_tokens = input_tokens
+        self.limit = limit
+        super().__init__(
+            f"Document too large: {agent_id} needs ~{input_tokens} input tokens, "
+            f"more than the {limit} input tokens per minute allowed (ITPM_LIMIT). "
+            f"Shorten or split the draft before analyzing it."
+        )
+
+
+def request_chars(request: Dict) -> int:
+    """Characters of prompt material (system + messages) in a request."""
+    chars = len(json.dumps(request.get("system", ""), ensure_ascii=False))
+    for message in request.get("messages", []):
+        chars += len(json.dumps(message.get("content", ""), ensure_ascii=False))
+    return chars
+
+
+def _request_key(request: Dict) -> str:
+    """Stable key for the token-relevant part of a request."""
+    material = json.dumps(
+        {
+            "model": request.get("model"),
+            "system": request.get("system", ""),
+            "messages": request.get("messages", []),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TokenCounter:
+    """
+    Input-token counter for rate-limit reservations and pre-flight checks.
+
+    count() is chars / CHARS_PER_TOKEN scaled by a calibration factor.
+    The factor is an exponential moving average of actual / raw estimate,
+    learned from every response's usage and persisted between runs, so the
+    estimate converges on the real tokenizer for our prompts without an
+    extra API call. Exact counts (from count_tokens) take precedence.
+    """
+
+    def __init__(self, path: Optional[Path] = TOKEN_CALIBRATION_PATH):
+        """
+        Args:
+            path: JSON file the calibration is persisted to (None: in memory only)
+        """
+        self.path = Path(path) if path is not None else None
+        self.factor = 1.0
+        self.samples = 0
+        self._exact: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read the persisted calibration factor, if any."""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.factor = float(data.get("factor", 1.0))
+            self.samples = int(data.get("samples", 0))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _save(self) -> None:
+        """Persist the calibration factor (best effort)."""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"factor": self.factor, "samples": self.samples}, f)
+        except OSError:
+            pass
+
+    def raw_estimate(self, request: Dict) -> float:
+        """Uncalibrated character-based estimate."""
+        return request_chars(request) / CHARS_PER_TOKEN
+
+    def count(self, request: Dict) -> int:
+        """
+        Best available input-token count for a request.
+
+        Args:
+            request: messages.create keyword arguments
+
+        Returns:
+            The exact count if one was recorded, otherwise the calibrated estimate
+        """
+        key = _request_key(request)
+        with self._lock:
+            exact = self._exact.get(key)
+            if exact is not None:
+                self._exact.move_to_end(key)
+                return exact
+            factor = self.factor
+        return int(self.raw_estimate(request) * factor) + 1
+
+    def record_exact(self, request: Dict, input_tokens: int) -> None:
+        """Remember an exact count (e.g. from count_tokens) and calibrate on it."""
+        with self._lock:
+            self._exact[_request_key(request)] = input_tokens
+            while len(self._exact) > EXACT_COUNT_CACHE_SIZE:
+                self._exact.popitem(last=False)
+        self.observe(request, input_tokens)
+
+    def observe(self, request: Dict, actual_tokens: Optional[int]) -> None:
+        """
+        Update the calibration factor from a request's true input size.
+
+        Args:
+            request: The request that was sent
+            actual_tokens: Total prompt tokens billed (input + cache write + cache read)
+        """
+        raw = self.raw_estimate(request)
+        if not actual_tokens or raw <= 0:
+            return
+        ratio = actual_tokens / raw
+        with self._lock:
+            if self.samples == 0:
+                self.factor = ratio
+            else:
+                self.factor = (
+                    1 - CALIBRATION_SMOOTHING
+                ) * self.factor + CALIBRATION_SMOOTHING * ratio
+            self.samples += 1
+            self._save()
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_counter: Optional[TokenCounter] = None
+_shared_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Return the process-wide token counter, loading its calibration on first use."""
+    global _shared_counter
+    with _shared_counter_lock:
+        if _shared_counter is None:
+            _shared_counter = TokenCounter()
+        return _shared_counter
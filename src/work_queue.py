@@ -0,0 +1,439 @@
+"""
+Work Queue: Durable SQLite job queue for batch scoring across worker processes.
+Holds one job per (document, agent) with leases, visibility timeouts and retries, and hands finished documents to a reducer.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config import (
+    WORK_QUEUE_PATH,
+    WORK_QUEUE_VISIBILITY_TIMEOUT,
+    WORK_QUEUE_MAX_ATTEMPTS,
+    WORK_QUEUE_RETRY_DELAY,
+)
+
+# Job states
+JOB_QUEUED = "queued"  # Waiting for a worker (once available_at has passed)
+JOB_LEASED = "leased"  # Claimed by a worker until lease_expires
+JOB_DONE = "done"  # Agent result stored
+JOB_FAILED = "failed"  # Out of attempts; the failed result is stored
+
+# Document states
+DOC_PENDING = "pending"  # Agents still running
+DOC_REDUCING = "reducing"  # A worker is writing the report (leased like a job)
+DOC_DONE = "done"  # Report written
+DOC_FAILED = "failed"  # The report could not be generated
+
+
+def worker_id() -> str:
+    """Lease owner name of this process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue shared by every worker process on the machine.
+
+    The database runs in WAL mode so readers never block the writer, and
+    every claim is a BEGIN IMMEDIATE transaction so two workers cannot lease
+    the same job. A leased job is hidden from other workers until its lease
+    expires (WORK_QUEUE_VISIBILITY_TIMEOUT, renewed while the job runs), so
+    the jobs of a crashed worker are picked up again. Completions are fenced
+    by lease owner: a worker whose lease was taken over cannot overwrite the
+    new owner's outcome.
+    """
+
+    def __init__(self, path: Path = WORK_QUEUE_PATH):
+        """
+        Args:
+            path: SQLite file of the queue
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_id TEXT NOT NULL,
+                subfolder TEXT,
+                content_hash TEXT NOT NULL,
+                content TEXT NOT NULL,
+                agent_content TEXT NOT NULL,
+                context_json TEXT NOT NULL,
+                cache_mode TEXT NOT NULL,
+                hedge INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                report_path TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                doc_id INTEGER NOT NULL REFERENCES documents (doc_id),
+                agent_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                result_json TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (doc_id, agent_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at);
+            CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (status);
+            """
+        )
+
+    def _transaction(self):
+        """Write transaction that takes the database lock up front."""
+        return _Transaction(self._conn)
+
+    def add_document(
+        self,
+        content_id: str,
+        subfolder: Optional[str],
+        content_hash: str,
+        content: str,
+        agent_content: str,
+        context: Dict,
+        agent_ids: Iterable[str],
+        cache_mode: str,
+        hedge: bool,
+    ) -> Optional[int]:
+        """
+        Queue a document with one job per agent.
+
+        Args:
+            content_id: Identifier for the content (report filename)
+            subfolder: Reports subfolder (e.g. "golden_set")
+            content_hash: sha256 of the source draft
+            content: Source draft (Layer 1 and flag locations)
+            agent_content: Draft the agents are sent (normalized or source)
+            context: JSON-serializable layer_1_flags, segments and normalization
+            agent_ids: Agents to run
+            cache_mode: Result cache mode for the agent calls
+            hedge: Hedge slow agent calls
+
+        Returns:
+            The document ID, or None if the same draft is already queued
+            under this content ID
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            duplicate = self._conn.execute(
+                "SELECT doc_id FROM documents WHERE content_id = ? AND subfolder IS ? "
+                "AND content_hash = ? AND status IN (?, ?)",
+                (content_id, subfolder, content_hash, DOC_PENDING, DOC_REDUCING),
+            ).fetchone()
+            if duplicate:
+                return None
+
+            doc_id = self._conn.execute(
+                "INSERT INTO documents (content_id, subfolder, content_hash, content, "
+                "agent_content, context_json, cache_mode, hedge, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    content_id,
+                    subfolder,
+                    content_hash,
+                    content,
+                    agent_content,
+                    json.dumps(context, ensure_ascii=False),
+                    cache_mode,
+                    int(hedge),
+                    DOC_PENDING,
+                    now,
+                    now,
+                ),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO jobs (doc_id, agent_id, status, available_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(doc_id, agent_id, JOB_QUEUED, now, now) for agent_id in agent_ids],
+            )
+            return doc_id
+
+    def claim(self, owner: str, limit: int) -> Optional[Dict]:
+        """
+        Lease up to `limit` available jobs of the oldest document that has any.
+
+        A job is available when it is queued and its retry delay has passed,
+        or when its lease has expired. Expired jobs that are out of attempts
+        are failed instead of being offered again, so a draft that keeps
+        crashing workers cannot stall the queue.
+
+        Args:
+            owner: Lease owner (worker_id())
+            limit: Maximum jobs to lease
+
+        Returns:
+            Dict with the document's doc_id, content_id, agent_content,
+            context, cache_mode, hedge and "jobs" (job_id, agent_id,
+            attempts), or None if no job is available
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            expired = self._conn.execute(
+                "SELECT job_id, agent_id, attempts FROM jobs "
+                "WHERE status = ? AND lease_expires <= ? AND attempts >= ?",
+                (JOB_LEASED, now, WORK_QUEUE_MAX_ATTEMPTS),
+            ).fetchall()
+            for row in expired:
+                error = f"Lease expired on each of {row['attempts']} attempts (worker crashed or stalled)"
+                self._finish_job(row["job_id"], JOB_FAILED, _failed_result(row["agent_id"], error), now)
+
+            available = "(status = ? AND available_at <= ?) OR (status = ? AND lease_expires <= ?)"
+            params = (JOB_QUEUED, now, JOB_LEASED, now)
+            first = self._conn.execute(
+                f"SELECT doc_id FROM jobs WHERE {available} ORDER BY doc_id, job_id LIMIT 1",
+                params,
+            ).fetchone()
+            if first is None:
+                return None
+
+            jobs = self._conn.execute(
+                f"SELECT job_id, agent_id, attempts FROM jobs WHERE doc_id = ? AND ({available}) "
+                "ORDER BY job_id LIMIT ?",
+                (first["doc_id"], *params, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                [
+                    (JOB_LEASED, owner, now + WORK_QUEUE_VISIBILITY_TIMEOUT, now, row["job_id"])
+                    for row in jobs
+                ],
+            )
+            document = self._conn.execute(
+                "SELECT doc_id, content_id, agent_content, context_json, cache_mode, hedge "
+                "FROM documents WHERE doc_id = ?",
+                (first["doc_id"],),
+            ).fetchone()
+
+        return {
+            "doc_id": document["doc_id"],
+            "content_id": document["content_id"],
+            "agent_content": document["agent_content"],
+            "context": json.loads(document["context_json"]),
+            "cache_mode": document["cache_mode"],
+            "hedge": bool(document["hedge"]),
+            "jobs": [
+                {"job_id": row["job_id"], "agent_id": row["agent_id"], "attempts": row["attempts"] + 1}
+                for row in jobs
+            ],
+        }
+
+    def renew(self, job_ids: List[int], owner: str) -> None:
+        """Extend the leases this owner still holds (the worker's heartbeat)."""
+        now = time.time()
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND lease_owner = ?",
+                [
+                    (now + WORK_QUEUE_VISIBILITY_TIMEOUT, now, job_id, JOB_LEASED, owner)
+                    for job_id in job_ids
+                ],
+            )
+
+    def complete(self, job_id: int, owner: str, result: Dict) -> bool:
+        """
+        Store a successful agent result.
+
+        Returns:
+            False if the lease had been taken over (the result is dropped)
+        """
+        with self._lock, self._transaction():
+            if not self._holds(job_id, owner):
+                return False
+            self._finish_job(job_id, JOB_DONE, result, time.time())
+            return True
+
+    def fail(
+        self,
+        job_id: int,
+        owner: str,
+        result: Dict,
+        count_attempt: bool = True,
+        retry_in: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Record a failed attempt: re-queue the job, or fail it for good once
+        it has used WORK_QUEUE_MAX_ATTEMPTS attempts.
+
+        Args:
+            job_id: Job identifier
+            owner: Lease owner
+            result: The failed agent result (stored if the failure is final)
+            count_attempt: False for attempts that never reached the API
+                (refused by the open circuit breaker)
+            retry_in: Seconds before the job is offered again (default:
+                WORK_QUEUE_RETRY_DELAY, doubling per attempt)
+
+        Returns:
+            The job's new state, or None if the lease had been taken over
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts FROM jobs WHERE job_id = ? AND status = ? AND lease_owner = ?",
+                (job_id, JOB_LEASED, owner),
+            ).fetchone()
+            if row is None:
+                return None
+            attempts = row["attempts"] - (0 if count_attempt else 1)
+            if attempts >= WORK_QUEUE_MAX_ATTEMPTS:
+                self._finish_job(job_id, JOB_FAILED, result, now)
+                return JOB_FAILED
+
+            if retry_in is None:
+                retry_in = WORK_QUEUE_RETRY_DELAY * 2 ** max(0, attempts - 1)
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, available_at = ?, lease_owner = NULL, "
+                "lease_expires = NULL, error = ?, updated_at = ? WHERE job_id = ?",
+                (JOB_QUEUED, attempts, now + retry_in, result.get("error"), now, job_id),
+            )
+            return JOB_QUEUED
+
+    def _holds(self, job_id: int, owner: str) -> bool:
+        """True if the owner still holds the job's lease (caller holds the lock)."""
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM jobs WHERE job_id = ? AND status = ? AND lease_owner = ?",
+                (job_id, JOB_LEASED, owner),
+            ).fetchone()
+            is not None
+        )
+
+    def _finish_job(self, job_id: int, status: str, result: Dict, now: float) -> None:
+        """Store a job's final result (caller holds the lock, in a transaction)."""
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, result_json = ?, error = ?, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE job_id = ?",
+            (status, json.dumps(result, ensure_ascii=False), result.get("error"), now, job_id),
+        )
+
+    def claim_reduction(self, owner: str) -> Optional[Dict]:
+        """
+        Lease a document whose jobs are all done or failed, for its report.
+
+        Returns:
+            Dict with the document's doc_id, content_id, subfolder, content,
+            context and "results" (agent_id -> result), or None
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            document = self._conn.execute(
+                "SELECT doc_id, content_id, subfolder, content, context_json FROM documents d "
+                "WHERE (status = ? OR (status = ? AND lease_expires <= ?)) "
+                "AND NOT EXISTS (SELECT 1 FROM jobs j WHERE j.doc_id = d.doc_id AND j.status IN (?, ?)) "
+                "ORDER BY doc_id LIMIT 1",
+                (DOC_PENDING, DOC_REDUCING, now, JOB_QUEUED, JOB_LEASED),
+            ).fetchone()
+            if document is None:
+                return None
+            self._conn.execute(
+                "UPDATE documents SET status = ?, lease_owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE doc_id = ?",
+                (DOC_REDUCING, owner, now + WORK_QUEUE_VISIBILITY_TIMEOUT, now, document["doc_id"]),
+            )
+            rows = self._conn.execute(
+                "SELECT agent_id, result_json FROM jobs WHERE doc_id = ?", (document["doc_id"],)
+            ).fetchall()
+
+        return {
+            "doc_id": document["doc_id"],
+            "content_id": document["content_id"],
+            "subfolder": document["subfolder"],
+            "content": document["content"],
+            "context": json.loads(document["context_json"]),
+            "results": {row["agent_id"]: json.loads(row["result_json"]) for row in rows},
+        }
+
+    def finish_reduction(
+        self, doc_id: int, owner: str, report_path: Optional[str], error: Optional[str] = None
+    ) -> None:
+        """Mark a leased document done (report written) or failed."""
+        with self._lock, self._transaction():
+            self._conn.execute(
+                "UPDATE documents SET status = ?, report_path = ?, error = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE doc_id = ? AND lease_owner = ?",
+                (DOC_FAILED if error else DOC_DONE, report_path, error, time.time(), doc_id, owner),
+            )
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Jobs and documents per state."""
+        with self._lock:
+            return {
+                table: dict(
+                    self._conn.execute(f"SELECT status, COUNT(*) FROM {table} GROUP BY status").fetchall()
+                )
+                for table in ("jobs", "documents")
+            }
+
+    def has_work(self) -> bool:
+        """True while any job or report is outstanding (even if not yet available)."""
+        counts = self.counts()
+        return bool(
+            counts["jobs"].get(JOB_QUEUED)
+            or counts["jobs"].get(JOB_LEASED)
+            or counts["documents"].get(DOC_PENDING)
+            or counts["documents"].get(DOC_REDUCING)
+        )
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error) on an autocommit connection."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _failed_result(agent_id: str, error: str) -> Dict:
+    """Agent result recorded for a job that failed for good."""
+    return {"agent_id": agent_id, "success": False, "error": error}
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_shared_queue: Optional[WorkQueue] = None
+_shared_queue_lock = threading.Lock()
+
+
+def get_work_queue() -> WorkQueue:
+    """Return this process's connection to the work queue, opening it on first use."""
+    global _shared_queue
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = WorkQueue()
+        return _shared_queue